@@ -16,6 +16,12 @@ from config import get_settings
 from models.user import User  # noqa
 from models.portfolio import Portfolio  # noqa
 from models.page_view import PageView  # noqa
+from models.page_view_daily import PageViewDaily  # noqa
+from models.resume_job import ResumeJob  # noqa
+from models.portfolio_search import PortfolioSearch  # noqa
+from models.portfolio_skill import PortfolioSkill  # noqa
+from models.portfolio_version import PortfolioVersion  # noqa
+from models.portfolio_role_version import PortfolioRoleVersion  # noqa
 
 settings = get_settings()
 
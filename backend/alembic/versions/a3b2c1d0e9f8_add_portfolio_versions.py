@@ -0,0 +1,215 @@
+"""add_portfolio_versions
+
+Revision ID: a3b2c1d0e9f8
+Revises: f2a1b0c9d8e7
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+import copy
+import json
+import uuid
+import zlib
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'a3b2c1d0e9f8'
+down_revision = 'f2a1b0c9d8e7'
+branch_labels = None
+depends_on = None
+
+
+portfolios = sa.table(
+    'portfolios',
+    sa.column('id', sa.String()),
+    sa.column('version_history', sa.Text()),
+)
+portfolio_versions = sa.table(
+    'portfolio_versions',
+    sa.column('id', sa.String()),
+    sa.column('portfolio_id', sa.String()),
+    sa.column('seq', sa.Integer()),
+    sa.column('is_snapshot', sa.Boolean()),
+    sa.column('payload', sa.LargeBinary()),
+    sa.column('created_at', sa.DateTime(timezone=True)),
+)
+
+
+# Frozen copy of the version codec as of this revision (services/portfolio_versions.py
+# and utils/json_patch.py), so later app changes can't alter what this migration
+# writes or reads. Settings defaults are frozen too.
+RETENTION = 10
+SNAPSHOT_EVERY = 5
+
+
+def _encode(value) -> bytes:
+    return zlib.compress(json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 6)
+
+
+def _decode(payload: bytes):
+    return json.loads(zlib.decompress(payload))
+
+
+def _escape(token) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _same(a, b) -> bool:
+    return type(a) is type(b) and a == b
+
+
+def _make_patch(source, target, path: str = "") -> list:
+    if _same(source, target):
+        return []
+    if isinstance(source, dict) and isinstance(target, dict):
+        ops = [{"op": "remove", "path": f"{path}/{_escape(key)}"} for key in source if key not in target]
+        for key, value in target.items():
+            child = f"{path}/{_escape(key)}"
+            if key in source:
+                ops.extend(_make_patch(source[key], value, child))
+            else:
+                ops.append({"op": "add", "path": child, "value": value})
+        return ops
+    if isinstance(source, list) and isinstance(target, list):
+        prefix = 0
+        while prefix < min(len(source), len(target)) and _same(source[prefix], target[prefix]):
+            prefix += 1
+        suffix = 0
+        while suffix < min(len(source), len(target)) - prefix and _same(source[-1 - suffix], target[-1 - suffix]):
+            suffix += 1
+        old = source[prefix:len(source) - suffix]
+        new = target[prefix:len(target) - suffix]
+        ops = []
+        for index in range(min(len(old), len(new))):
+            ops.extend(_make_patch(old[index], new[index], f"{path}/{prefix + index}"))
+        for index in range(len(old) - 1, len(new) - 1, -1):
+            ops.append({"op": "remove", "path": f"{path}/{prefix + index}"})
+        for index in range(len(old), len(new)):
+            ops.append({"op": "add", "path": f"{path}/{prefix + index}", "value": new[index]})
+        return ops
+    return [{"op": "replace", "path": path, "value": target}]
+
+
+def _apply_patch(document, ops: list):
+    document = copy.deepcopy(document)
+    for op_ in ops:
+        kind, path = op_["op"], op_["path"]
+        if path == "":
+            document = copy.deepcopy(op_["value"])
+            continue
+        *parents, last = [t.replace("~1", "/").replace("~0", "~") for t in path.split("/")[1:]]
+        container = document
+        for token in parents:
+            container = container[int(token) if isinstance(container, list) else token]
+        if isinstance(container, list):
+            index = len(container) if last == "-" else int(last)
+            if kind == "add":
+                container.insert(index, copy.deepcopy(op_["value"]))
+            elif kind == "remove":
+                del container[index]
+            else:
+                container[index] = copy.deepcopy(op_["value"])
+        elif kind == "remove":
+            del container[last]
+        else:
+            container[last] = copy.deepcopy(op_["value"])
+    return document
+
+
+def _encode_version(previous, document, chain_length: int):
+    ops = _make_patch(previous, document) if previous is not None else None
+    if ops == []:
+        return None
+    full = _encode(document)
+    if ops is None or chain_length >= SNAPSHOT_EVERY:
+        return True, full
+    delta = _encode(ops)
+    return (True, full) if len(delta) >= len(full) else (False, delta)
+
+
+def _saved_at(value) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return datetime.now(timezone.utc)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'portfolio_versions',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('portfolio_id', sa.String(), nullable=False),
+        sa.Column('seq', sa.Integer(), nullable=False),
+        sa.Column('is_snapshot', sa.Boolean(), nullable=False),
+        sa.Column('payload', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['portfolio_id'], ['portfolios.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_portfolio_versions_portfolio_seq', 'portfolio_versions', ['portfolio_id', 'seq'], unique=True)
+
+    # Move the version_history arrays over, oldest first, as snapshot + delta chains.
+    conn = op.get_bind()
+    for portfolio_id, raw in conn.execute(sa.select(portfolios.c.id, portfolios.c.version_history)).all():
+        try:
+            history = json.loads(raw or "[]")
+        except ValueError:
+            continue
+        rows, previous, chain_length = [], None, 0
+        for entry in history[-RETENTION:]:
+            document = entry.get("parsed_data") if isinstance(entry, dict) else None
+            if document is None:
+                continue
+            encoded = _encode_version(previous, document, chain_length)
+            if encoded is None:
+                continue
+            is_snapshot, payload = encoded
+            chain_length = 1 if is_snapshot else chain_length + 1
+            previous = document
+            rows.append({
+                'id': str(uuid.uuid4()),
+                'portfolio_id': portfolio_id,
+                'seq': len(rows) + 1,
+                'is_snapshot': is_snapshot,
+                'payload': payload,
+                'created_at': _saved_at(entry.get("saved_at")),
+            })
+        if rows:
+            conn.execute(portfolio_versions.insert(), rows)
+
+    with op.batch_alter_table('portfolios', schema=None) as batch_op:
+        batch_op.drop_column('version_history')
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('portfolios', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version_history', sa.Text(), nullable=False, server_default=sa.text("'[]'")))
+
+    conn = op.get_bind()
+    histories: dict[str, list] = {}
+    documents: dict[str, object] = {}
+    result = conn.execute(
+        sa.select(
+            portfolio_versions.c.portfolio_id,
+            portfolio_versions.c.is_snapshot,
+            portfolio_versions.c.payload,
+            portfolio_versions.c.created_at,
+        ).order_by(portfolio_versions.c.portfolio_id, portfolio_versions.c.seq)
+    )
+    for portfolio_id, is_snapshot, payload, created_at in result:
+        value = _decode(payload)
+        document = value if is_snapshot else _apply_patch(documents[portfolio_id], value)
+        documents[portfolio_id] = document
+        histories.setdefault(portfolio_id, []).append({
+            "parsed_data": document,
+            "saved_at": created_at.isoformat() if isinstance(created_at, datetime) else created_at,
+        })
+    for portfolio_id, history in histories.items():
+        conn.execute(
+            portfolios.update().where(portfolios.c.id == portfolio_id).values(version_history=json.dumps(history))
+        )
+
+    op.drop_index('ix_portfolio_versions_portfolio_seq', table_name='portfolio_versions')
+    op.drop_table('portfolio_versions')
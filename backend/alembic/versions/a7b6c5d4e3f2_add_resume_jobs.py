@@ -0,0 +1,47 @@
+"""add_resume_jobs
+
+Revision ID: a7b6c5d4e3f2
+Revises: f6a5e4d3c2b0
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'a7b6c5d4e3f2'
+down_revision = 'f6a5e4d3c2b0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'resume_jobs',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('stage', sa.String(), nullable=False),
+        sa.Column('filename', sa.String(), nullable=False),
+        sa.Column('tone', sa.String(), nullable=True),
+        sa.Column('mode', sa.String(), nullable=True),
+        sa.Column('payload', sa.LargeBinary(), nullable=True),
+        sa.Column('result', sa.Text(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    with op.batch_alter_table('resume_jobs', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_resume_jobs_user_id'), ['user_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_resume_jobs_status'), ['status'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('resume_jobs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_resume_jobs_status'))
+        batch_op.drop_index(batch_op.f('ix_resume_jobs_user_id'))
+    op.drop_table('resume_jobs')
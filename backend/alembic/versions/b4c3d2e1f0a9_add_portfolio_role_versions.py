@@ -0,0 +1,103 @@
+"""add_portfolio_role_versions
+
+Revision ID: b4c3d2e1f0a9
+Revises: a3b2c1d0e9f8
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+import json
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'b4c3d2e1f0a9'
+down_revision = 'a3b2c1d0e9f8'
+branch_labels = None
+depends_on = None
+
+
+portfolios = sa.table(
+    'portfolios',
+    sa.column('id', sa.String()),
+    sa.column('role_versions', sa.Text()),
+)
+portfolio_role_versions = sa.table(
+    'portfolio_role_versions',
+    sa.column('portfolio_id', sa.String()),
+    sa.column('role', sa.String()),
+    sa.column('title', sa.String()),
+    sa.column('skill_count', sa.Integer()),
+    sa.column('experience_count', sa.Integer()),
+    sa.column('data', sa.Text()),
+    sa.column('created_at', sa.DateTime(timezone=True)),
+    sa.column('updated_at', sa.DateTime(timezone=True)),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'portfolio_role_versions',
+        sa.Column('portfolio_id', sa.String(), nullable=False),
+        sa.Column('role', sa.String(), nullable=False),
+        sa.Column('title', sa.String(), nullable=True),
+        sa.Column('skill_count', sa.Integer(), nullable=True),
+        sa.Column('experience_count', sa.Integer(), nullable=True),
+        sa.Column('data', sa.Text(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['portfolio_id'], ['portfolios.id']),
+        sa.PrimaryKeyConstraint('portfolio_id', 'role'),
+    )
+
+    # One row per entry of the role_versions JSON dict.
+    conn = op.get_bind()
+    now = datetime.now(timezone.utc)
+    result = conn.execute(
+        sa.select(portfolios.c.id, portfolios.c.role_versions).where(portfolios.c.role_versions.isnot(None))
+    ).all()
+    for portfolio_id, raw in result:
+        try:
+            versions = json.loads(raw or "{}")
+        except ValueError:
+            continue
+        rows = [
+            {
+                'portfolio_id': portfolio_id,
+                'role': role,
+                'title': data.get("title"),
+                'skill_count': len(data.get("skills") or []),
+                'experience_count': len(data.get("experience") or []),
+                'data': json.dumps(data),
+                'created_at': now,
+                'updated_at': now,
+            }
+            for role, data in versions.items()
+            if isinstance(data, dict)
+        ]
+        if rows:
+            conn.execute(portfolio_role_versions.insert(), rows)
+
+    with op.batch_alter_table('portfolios', schema=None) as batch_op:
+        batch_op.drop_column('role_versions')
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('portfolios', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('role_versions', sa.Text(), nullable=True))
+
+    conn = op.get_bind()
+    versions: dict[str, dict] = {}
+    result = conn.execute(
+        sa.select(portfolio_role_versions.c.portfolio_id, portfolio_role_versions.c.role, portfolio_role_versions.c.data)
+        .order_by(portfolio_role_versions.c.created_at)
+    ).all()
+    for portfolio_id, role, data in result:
+        versions.setdefault(portfolio_id, {})[role] = json.loads(data)
+    for portfolio_id, roles in versions.items():
+        conn.execute(
+            portfolios.update().where(portfolios.c.id == portfolio_id).values(role_versions=json.dumps(roles))
+        )
+
+    op.drop_table('portfolio_role_versions')
@@ -0,0 +1,36 @@
+"""add_page_view_daily
+
+Revision ID: b8c7d6e5f4a3
+Revises: a7b6c5d4e3f2
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'b8c7d6e5f4a3'
+down_revision = 'a7b6c5d4e3f2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'page_view_daily',
+        sa.Column('portfolio_id', sa.String(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('segment', sa.String(), nullable=False),
+        sa.Column('device', sa.String(), nullable=False),
+        sa.Column('referrer_source', sa.String(), nullable=False),
+        sa.Column('intent_bucket', sa.String(), nullable=False),
+        sa.Column('views', sa.Integer(), nullable=False),
+        sa.Column('intent_sum', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['portfolio_id'], ['portfolios.id']),
+        sa.PrimaryKeyConstraint('portfolio_id', 'day', 'segment', 'device', 'referrer_source', 'intent_bucket'),
+    )
+    # Existing page_views are rolled up by `python backfill_analytics.py`.
+
+
+def downgrade() -> None:
+    op.drop_table('page_view_daily')
@@ -0,0 +1,77 @@
+"""portfolio_content_jsonb
+
+Revision ID: c5d4e3f2a1b0
+Revises: b4c3d2e1f0a9
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = 'c5d4e3f2a1b0'
+down_revision = 'b4c3d2e1f0a9'
+branch_labels = None
+depends_on = None
+
+
+# Returns NULL where a plain cast would abort the whole ALTER. Lives in
+# pg_temp, so nothing outlives the migration's connection; unlike
+# pg_input_is_valid it works before Postgres 16.
+SAFE_JSONB = """
+CREATE FUNCTION pg_temp.safe_jsonb(value text) RETURNS jsonb AS $$
+BEGIN
+    RETURN value::jsonb;
+EXCEPTION WHEN others THEN
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE
+"""
+
+
+def upgrade() -> None:
+    # Rows the JSON type can't load become '{}' (parsed_data) or NULL
+    # (career_graph) before the type changes. SQLAlchemy's JSON type is
+    # stored as text on SQLite, so the columns keep their type there.
+    if op.get_bind().dialect.name != 'postgresql':
+        op.execute("UPDATE portfolios SET parsed_data = '{}' WHERE parsed_data IS NULL OR NOT json_valid(parsed_data)")
+        op.execute("UPDATE portfolios SET career_graph = NULL WHERE NOT json_valid(career_graph)")
+        return
+    op.execute(SAFE_JSONB)
+    op.execute("UPDATE portfolios SET parsed_data = '{}' WHERE parsed_data IS NULL OR pg_temp.safe_jsonb(parsed_data) IS NULL")
+    op.execute("UPDATE portfolios SET career_graph = NULL WHERE career_graph IS NOT NULL AND pg_temp.safe_jsonb(career_graph) IS NULL")
+    op.execute("DROP FUNCTION pg_temp.safe_jsonb(text)")
+    op.alter_column(
+        'portfolios', 'parsed_data',
+        type_=postgresql.JSONB(),
+        existing_type=sa.Text(),
+        existing_nullable=False,
+        postgresql_using='parsed_data::jsonb',
+    )
+    op.alter_column(
+        'portfolios', 'career_graph',
+        type_=postgresql.JSONB(),
+        existing_type=sa.Text(),
+        existing_nullable=True,
+        postgresql_using='career_graph::jsonb',
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.alter_column(
+        'portfolios', 'career_graph',
+        type_=sa.Text(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=True,
+        postgresql_using='career_graph::text',
+    )
+    op.alter_column(
+        'portfolios', 'parsed_data',
+        type_=sa.Text(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=False,
+        postgresql_using='parsed_data::text',
+    )
@@ -0,0 +1,32 @@
+"""add_page_view_enrichment
+
+Revision ID: c9d8e7f6a5b4
+Revises: b8c7d6e5f4a3
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'c9d8e7f6a5b4'
+down_revision = 'b8c7d6e5f4a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('page_views', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('device_class', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('referrer_source', sa.String(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_page_views_device_class'), ['device_class'], unique=False)
+        batch_op.create_index(batch_op.f('ix_page_views_referrer_source'), ['referrer_source'], unique=False)
+    # Existing rows are filled by `python backfill_analytics.py`.
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('page_views', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_page_views_referrer_source'))
+        batch_op.drop_index(batch_op.f('ix_page_views_device_class'))
+        batch_op.drop_column('referrer_source')
+        batch_op.drop_column('device_class')
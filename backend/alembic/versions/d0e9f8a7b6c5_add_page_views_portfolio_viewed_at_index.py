@@ -0,0 +1,24 @@
+"""add_page_views_portfolio_viewed_at_index
+
+Revision ID: d0e9f8a7b6c5
+Revises: c9d8e7f6a5b4
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+
+
+revision = 'd0e9f8a7b6c5'
+down_revision = 'c9d8e7f6a5b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('page_views', schema=None) as batch_op:
+        batch_op.create_index('ix_page_views_portfolio_id_viewed_at', ['portfolio_id', 'viewed_at'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('page_views', schema=None) as batch_op:
+        batch_op.drop_index('ix_page_views_portfolio_id_viewed_at')
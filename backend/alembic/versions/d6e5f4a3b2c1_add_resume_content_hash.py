@@ -0,0 +1,28 @@
+"""add_resume_content_hash
+
+Revision ID: d6e5f4a3b2c1
+Revises: c5d4e3f2a1b0
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'd6e5f4a3b2c1'
+down_revision = 'c5d4e3f2a1b0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing portfolios keep NULL: their next upload runs the full pipeline once.
+    with op.batch_alter_table('portfolios', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('resume_sha256', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('resume_tone', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('portfolios', schema=None) as batch_op:
+        batch_op.drop_column('resume_tone')
+        batch_op.drop_column('resume_sha256')
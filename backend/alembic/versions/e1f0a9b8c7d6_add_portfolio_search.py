@@ -0,0 +1,43 @@
+"""add_portfolio_search
+
+Revision ID: e1f0a9b8c7d6
+Revises: d0e9f8a7b6c5
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from models.portfolio_search import POSTGRES_SEARCH_DDL, SQLITE_SEARCH_DDL
+
+
+revision = 'e1f0a9b8c7d6'
+down_revision = 'd0e9f8a7b6c5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'portfolio_search',
+        sa.Column('portfolio_id', sa.String(), nullable=False),
+        sa.Column('searchable', sa.Boolean(), nullable=False),
+        sa.Column('document', sa.Text(), nullable=False),
+        sa.Column('card', sa.Text(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['portfolio_id'], ['portfolios.id']),
+        sa.PrimaryKeyConstraint('portfolio_id'),
+    )
+    op.create_index('ix_portfolio_search_searchable_updated_at', 'portfolio_search', ['searchable', 'updated_at'], unique=False)
+
+    dialect = op.get_bind().dialect.name
+    for statement in POSTGRES_SEARCH_DDL if dialect == 'postgresql' else SQLITE_SEARCH_DDL if dialect == 'sqlite' else []:
+        op.execute(statement)
+    # Existing portfolios are indexed by `python reindex_search.py` (bootstrap_db runs it once).
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute('DROP TABLE IF EXISTS portfolio_search_fts')
+    op.drop_index('ix_portfolio_search_searchable_updated_at', table_name='portfolio_search')
+    op.drop_table('portfolio_search')
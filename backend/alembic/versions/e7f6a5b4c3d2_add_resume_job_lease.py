@@ -0,0 +1,28 @@
+"""add_resume_job_lease
+
+Revision ID: e7f6a5b4c3d2
+Revises: d6e5f4a3b2c1
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'e7f6a5b4c3d2'
+down_revision = 'd6e5f4a3b2c1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Jobs already running have no heartbeat; the sweep falls back to started_at for them.
+    with op.batch_alter_table('resume_jobs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('claimed_by', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('resume_jobs', schema=None) as batch_op:
+        batch_op.drop_column('heartbeat_at')
+        batch_op.drop_column('claimed_by')
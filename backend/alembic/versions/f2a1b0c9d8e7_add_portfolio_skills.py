@@ -0,0 +1,34 @@
+"""add_portfolio_skills
+
+Revision ID: f2a1b0c9d8e7
+Revises: e1f0a9b8c7d6
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'f2a1b0c9d8e7'
+down_revision = 'e1f0a9b8c7d6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'portfolio_skills',
+        sa.Column('portfolio_id', sa.String(), nullable=False),
+        sa.Column('facet', sa.String(), nullable=False),
+        sa.Column('value', sa.String(), nullable=False),
+        sa.Column('label', sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(['portfolio_id'], ['portfolios.id']),
+        sa.PrimaryKeyConstraint('portfolio_id', 'facet', 'value'),
+    )
+    op.create_index('ix_portfolio_skills_facet_value', 'portfolio_skills', ['facet', 'value', 'portfolio_id'], unique=False)
+    # Existing portfolios are indexed by `python reindex_search.py` (bootstrap_db runs it once).
+
+
+def downgrade() -> None:
+    op.drop_index('ix_portfolio_skills_facet_value', table_name='portfolio_skills')
+    op.drop_table('portfolio_skills')
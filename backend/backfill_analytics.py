@@ -0,0 +1,63 @@
+"""Backfill page-view enrichment columns and rebuild the page_view_daily rollup.
+
+Run once after the add_page_view_daily / add_page_view_enrichment migrations,
+and any time the rollup needs to be recomputed (e.g. after changing how
+visitors are classified).
+
+Examples:
+    python backfill_analytics.py
+    python backfill_analytics.py --slug my-portfolio
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import select
+
+from database import AsyncSessionLocal
+from models.portfolio import Portfolio
+from models.user import User  # noqa: F401  (registers the Portfolio.user relationship)
+from services.analytics_service import backfill_view_columns, rebuild_rollup
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rebuild the daily page-view rollup.")
+    parser.add_argument(
+        "--slug",
+        action="append",
+        default=[],
+        help="Only rebuild a specific portfolio slug. Repeat the flag to target multiple slugs.",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=5000,
+        help="Raw page views processed per batch.",
+    )
+    return parser.parse_args()
+
+
+async def main() -> int:
+    args = parse_args()
+    async with AsyncSessionLocal() as session:
+        enriched = await backfill_view_columns(session, batch_size=args.batch_size)
+        print(f"Filled device/referrer columns on {enriched} page view(s).")
+
+        if not args.slug:
+            total = await rebuild_rollup(session, batch_size=args.batch_size)
+            print(f"Rolled up {total} page view(s) for all portfolios.")
+            return 0
+
+        result = await session.execute(select(Portfolio.id, Portfolio.slug).where(Portfolio.slug.in_(args.slug)))
+        rows = result.all()
+        if not rows:
+            print("No matching portfolios found.")
+            return 1
+        for portfolio_id, slug in rows:
+            total = await rebuild_rollup(session, portfolio_id, batch_size=args.batch_size)
+            print(f"{slug}: rolled up {total} page view(s).")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
@@ -0,0 +1,138 @@
+"""Benchmark the stdlib json module against utils.json_codec on a large portfolio.
+
+Times the JSON work one request does with a portfolio document: rendering the
+response body, decoding a cached payload or JSON column, and the deep copy
+taken before merging auto-update items. No database is needed.
+
+Examples:
+    python benchmark_json.py
+    python benchmark_json.py --experience 80 --projects 120 --repeat 200
+"""
+
+import argparse
+import copy
+import json
+import random
+import statistics
+import string
+import time
+from datetime import datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from utils.json_codec import FastJSONResponse, clone, dumpb, loads
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark JSON encoding of portfolio documents.")
+    parser.add_argument("--experience", type=int, default=40, help="Experience entries in the synthetic resume.")
+    parser.add_argument("--projects", type=int, default=60)
+    parser.add_argument("--skills", type=int, default=150)
+    parser.add_argument("--repeat", type=int, default=100, help="Timed runs per variant (median reported).")
+    return parser.parse_args()
+
+
+def words(rng: random.Random, count: int) -> str:
+    return " ".join(
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))) for _ in range(count)
+    )
+
+
+def build_portfolio(experience: int, projects: int, skills: int) -> dict:
+    rng = random.Random(42)
+    parsed_data = {
+        "name": "Ada Lovelace",
+        "title": "Principal Engineer",
+        "summary": words(rng, 120),
+        "skills": [words(rng, 2) for _ in range(skills)],
+        "experience": [
+            {
+                "company": words(rng, 2),
+                "role": words(rng, 3),
+                "duration": "2019 - 2024",
+                "bullets": [words(rng, 25) for _ in range(6)],
+                "achievements": [words(rng, 15) for _ in range(3)],
+            }
+            for _ in range(experience)
+        ],
+        "projects": [
+            {
+                "name": words(rng, 3),
+                "description": words(rng, 60),
+                "tech_stack": [words(rng, 1) for _ in range(8)],
+                "link": f"https://github.com/ada/{words(rng, 1)}",
+            }
+            for _ in range(projects)
+        ],
+        "education": [{"degree": words(rng, 4), "institution": words(rng, 3), "year": "2012"}],
+        "certifications": [words(rng, 5) for _ in range(20)],
+    }
+    return {
+        "id": "00000000-0000-0000-0000-000000000001",
+        "slug": "ada-lovelace",
+        "theme": "modern",
+        "is_published": True,
+        "view_count": 1234,
+        "parsed_data": parsed_data,
+        "career_graph": {"nodes": [{"id": i, "label": words(rng, 3)} for i in range(60)], "edges": []},
+        "created_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
+        "updated_at": datetime.now(timezone.utc),
+    }
+
+
+def timed(fn, repeat: int) -> float:
+    fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main() -> int:
+    args = parse_args()
+    portfolio = build_portfolio(args.experience, args.projects, args.skills)
+    # FastAPI runs jsonable_encoder before the response class renders in both cases.
+    content = jsonable_encoder(portfolio)
+    body = dumpb(content)
+    parsed_data = content["parsed_data"]
+
+    cases = [
+        (
+            "render response body",
+            lambda: JSONResponse(content).body,
+            lambda: FastJSONResponse(content).body,
+        ),
+        (
+            "encode cache payload",
+            lambda: json.dumps(portfolio, default=str).encode(),
+            lambda: dumpb(portfolio),
+        ),
+        (
+            "decode payload",
+            lambda: json.loads(body),
+            lambda: loads(body),
+        ),
+        (
+            "deep copy parsed_data",
+            lambda: copy.deepcopy(parsed_data),
+            lambda: clone(parsed_data),
+        ),
+    ]
+
+    print(f"Portfolio document: {len(body) / 1024:.0f} KiB (median of {args.repeat} runs)")
+    print(f"  {'':24}{'stdlib':>10}{'orjson':>10}{'speedup':>10}")
+    total_saved = 0.0
+    for label, stdlib_fn, orjson_fn in cases:
+        stdlib_ms = timed(stdlib_fn, args.repeat)
+        orjson_ms = timed(orjson_fn, args.repeat)
+        total_saved += stdlib_ms - orjson_ms
+        print(f"  {label:24}{stdlib_ms:8.2f}ms{orjson_ms:8.2f}ms{stdlib_ms / orjson_ms:9.1f}x")
+    print(f"CPU saved per request touching every step: {total_saved:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -25,9 +25,7 @@ async def _ensure_model_columns():
     # Expected columns per table: column_name -> (type_sql, nullable, default)
     expected: dict[str, dict[str, tuple[str, bool, str | None]]] = {
         "portfolios": {
-            "version_history": ("TEXT", False, "'[]'"),
             "career_graph": ("TEXT", True, None),
-            "role_versions": ("TEXT", True, None),
             "active_role": ("VARCHAR", True, None),
             "visible_to_recruiters": ("BOOLEAN", False, "true"),
             "connected_sources": ("TEXT", True, None),
@@ -37,6 +35,8 @@ async def _ensure_model_columns():
             "ip_address": ("VARCHAR", True, None),
             "visitor_type": ("VARCHAR", True, None),
             "intent_score": ("INTEGER", True, None),
+            "device_class": ("VARCHAR", True, None),
+            "referrer_source": ("VARCHAR", True, None),
         },
     }
 
@@ -60,6 +60,38 @@ async def _ensure_model_columns():
                     await conn.execute(sa_text(sql.strip()))
 
 
+async def _ensure_analytics_rollup():
+    """Populate page_view_daily the first time it exists alongside historical page views."""
+    from database import AsyncSessionLocal
+    from models import audit_log, page_view, page_view_daily, portfolio, portfolio_search, portfolio_role_version, portfolio_skill, portfolio_version, resume_job, user  # noqa: F401
+    from services.analytics_service import backfill_view_columns, rebuild_rollup
+
+    async with engine.begin() as conn:
+        has_rollup = (await conn.execute(sa_text("SELECT 1 FROM page_view_daily LIMIT 1"))).first()
+        has_views = (await conn.execute(sa_text("SELECT 1 FROM page_views LIMIT 1"))).first()
+    if has_views and not has_rollup:
+        async with AsyncSessionLocal() as session:
+            await backfill_view_columns(session)
+            total = await rebuild_rollup(session)
+        print(f"Backfilled analytics rollup from {total} page view(s).")
+
+
+async def _ensure_search_index():
+    """Index existing portfolios the first time the search tables exist alongside them."""
+    from database import AsyncSessionLocal
+    from models import audit_log, page_view, page_view_daily, portfolio, portfolio_search, portfolio_role_version, portfolio_skill, portfolio_version, resume_job, user  # noqa: F401
+    from services.search_index import reindex_all
+
+    async with engine.begin() as conn:
+        has_search = (await conn.execute(sa_text("SELECT 1 FROM portfolio_search LIMIT 1"))).first()
+        has_skills = (await conn.execute(sa_text("SELECT 1 FROM portfolio_skills LIMIT 1"))).first()
+        has_portfolios = (await conn.execute(sa_text("SELECT 1 FROM portfolios LIMIT 1"))).first()
+    if has_portfolios and not (has_search and has_skills):
+        async with AsyncSessionLocal() as session:
+            total = await reindex_all(session)
+        print(f"Indexed {total} portfolio(s) for recruiter search.")
+
+
 async def _bootstrap() -> None:
     tables = await _existing_tables()
     app_tables = {"users", "portfolios", "page_views", "audit_logs"}
@@ -76,6 +108,8 @@ async def _bootstrap() -> None:
 
     await asyncio.to_thread(command.upgrade, alembic_config, "head")
     await _ensure_model_columns()
+    await _ensure_analytics_rollup()
+    await _ensure_search_index()
 
 
 def bootstrap_database() -> None:
@@ -20,6 +20,11 @@ class Settings(BaseSettings):
     # Optional: Redis URL for shared rate limiting across processes/instances.
     # Example: redis://localhost:6379/0
     redis_url: str = ""
+    # Per-route rate limit overrides, "route=limit/window_seconds,...". Route names
+    # and defaults are in utils/rate_limit.RATE_LIMITS.
+    rate_limits: str = ""
+    # Keys tracked by the in-memory limiter (used without Redis or when it is down).
+    rate_limit_memory_max_keys: int = 100000
     # Email settings (for Phase 3)
     mail_username: str = ""
     mail_password: str = ""
@@ -30,7 +35,79 @@ class Settings(BaseSettings):
     rustfs_access_key: str = ""
     rustfs_secret_key: str = ""
     rustfs_bucket_name: str = "user-resumes"
+    # One shared client: connection pool size (also the number of storage worker
+    # threads), timeouts, and total attempts per call including retries.
+    rustfs_max_connections: int = 10
+    rustfs_connect_timeout_seconds: float = 5.0
+    rustfs_read_timeout_seconds: float = 30.0
+    rustfs_max_attempts: int = 3
 
+    # Groq / LLM client pool (shared across all AI services)
+    groq_max_connections: int = 20
+    groq_max_keepalive_connections: int = 10
+    groq_keepalive_expiry_seconds: float = 30.0
+    groq_timeout_seconds: float = 60.0
+    groq_max_retries: int = 2
+    # Max in-flight completions per model. Override per model with a
+    # comma-separated list, e.g. "llama-3.3-70b-versatile=4,llama-3.1-8b-instant=16"
+    groq_default_model_concurrency: int = 8
+    groq_model_concurrency: str = ""
+
+    # LLM response cache (memory LRU -> Redis via redis_url -> disk)
+    cache_ttl_seconds: int = 86400 * 7
+    cache_memory_max_entries: int = 512
+    cache_memory_max_bytes: int = 32 * 1024 * 1024
+    # Set to 0 to disable the disk tier.
+    cache_disk_max_bytes: int = 256 * 1024 * 1024
+
+    # Resume text extraction (PDF/DOCX) runs in a separate process pool.
+    # Set extraction_pool_size to 0 to extract in a thread instead.
+    extraction_pool_size: int = 2
+    extraction_timeout_seconds: float = 20.0
+    extraction_worker_memory_mb: int = 1024
+
+    # bcrypt runs in its own thread pool. Calls beyond workers + max_pending are
+    # answered with 429 instead of queueing.
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 32
+
+    # Background resume processing (POST /resume/upload returns a job id)
+    resume_job_workers: int = 2
+    resume_job_poll_interval_seconds: float = 1.0
+    # A running job renews its lease every heartbeat; jobs whose last heartbeat is
+    # older than stale_after (e.g. the process died) are re-queued.
+    resume_job_heartbeat_seconds: float = 30.0
+    resume_job_stale_after_seconds: int = 120
+    resume_job_max_attempts: int = 2
+    resume_job_retention_hours: int = 24
+
+    # Public page views are buffered in memory and written in batches
+    view_buffer_flush_seconds: float = 5.0
+    view_buffer_max_pending: int = 500
+    # Hard cap on buffered views (e.g. while the DB is down); extra views are dropped.
+    view_buffer_max_backlog: int = 20000
+
+    # Serialized public portfolio payloads (per process). Writes invalidate every
+    # worker via Redis pub/sub when redis_url is set; the TTL bounds staleness otherwise.
+    public_cache_max_entries: int = 2000
+    public_cache_ttl_seconds: float = 60.0
+
+    # Ranked recruiter searches page through a snapshot of the matching ids (the
+    # first search_snapshot_max_results), kept in memory and Redis (via redis_url).
+    search_snapshot_ttl_seconds: int = 900
+    search_snapshot_max_results: int = 1000
+    search_snapshot_max_entries: int = 500
+
+    # Resume upload history (portfolio_versions): how many versions to keep per
+    # portfolio, and how often a full copy is stored instead of a JSON-patch delta.
+    portfolio_version_retention: int = 10
+    portfolio_version_snapshot_every: int = 5
+
+    # Authenticated-user rows cached by get_current_user (memory, plus Redis when
+    # redis_url is set). Local writes invalidate immediately; the TTL bounds how
+    # long another instance's memory tier can serve a stale row.
+    user_cache_max_entries: int = 10000
+    user_cache_ttl_seconds: float = 30.0
 
 
     class Config:
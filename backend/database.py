@@ -1,6 +1,7 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from config import get_settings
+from utils import json_codec
 
 settings = get_settings()
 
@@ -45,6 +46,9 @@ engine = create_async_engine(
     db_url,
     echo=False,
     connect_args=connect_args,
+    # JSON/JSONB columns (Portfolio.parsed_data, career_graph) go through orjson.
+    json_serializer=json_codec.dumps,
+    json_deserializer=json_codec.loads,
     **pool_kwargs,
 )
 
@@ -69,5 +73,5 @@ async def get_db():
 
 async def init_db():
     async with engine.begin() as conn:
-        from models import audit_log, page_view, portfolio, user  # noqa: F401
+        from models import audit_log, page_view, page_view_daily, portfolio, portfolio_search, portfolio_role_version, portfolio_skill, portfolio_version, resume_job, user  # noqa: F401
         await conn.run_sync(Base.metadata.create_all)
@@ -14,6 +14,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from config import get_settings
 from database import get_db, init_db
+from services.extraction_pool import extraction_pool
+from services.password_hasher import password_hasher
+from services.public_cache import public_portfolio_cache
+from services.resume_jobs import resume_job_worker
+from services.rustfs_service import rustfs_service
+from services.view_buffer import view_buffer
+from services.llm_client import close_llm_client, init_llm_client
+from utils.json_codec import FastJSONResponse
+from utils.uploads import FORM_OVERHEAD_BYTES, UploadSizeLimitMiddleware
 from routers import achievements, admin, analytics_v2, auth, auto_update, branding, content, dynamic_portfolio, interview, jobs, optimizer, portfolio, recruiter, resume, video
 
 settings = get_settings()
@@ -37,6 +46,21 @@ async def lifespan(app: FastAPI):
         # Ensure initial admin exists
         from create_admin import make_admin
         await make_admin()
+
+        # Shared keep-alive pool for every AI service
+        init_llm_client()
+
+        # Object storage bucket check (uploads retry it if RustFS is down now)
+        await rustfs_service.ensure_bucket()
+
+        # Background resume processing
+        await resume_job_worker.start()
+
+        # Batched page-view writes for public portfolio hits
+        await view_buffer.start()
+
+        # Cross-worker invalidation of cached public portfolio pages
+        await public_portfolio_cache.start()
         
     except Exception:
         app.state.db_ready = False
@@ -49,6 +73,13 @@ async def lifespan(app: FastAPI):
         yield
     finally:
         app.state.db_ready = False
+        await resume_job_worker.stop()
+        await view_buffer.stop()
+        await public_portfolio_cache.stop()
+        await close_llm_client()
+        extraction_pool.shutdown()
+        rustfs_service.shutdown()
+        password_hasher.shutdown()
         logger.info("Shutting down.")
 
 
@@ -57,6 +88,7 @@ app = FastAPI(
     description="Upload your resume, get an AI-generated portfolio website.",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 app.state.db_ready = False
 
@@ -84,13 +116,18 @@ if not allowed_origins and not settings.is_production:
 
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    limits={"/api/resume/upload": resume.MAX_FILE_SIZE + FORM_OVERHEAD_BYTES},
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["Set-Cookie"],
+    expose_headers=["Set-Cookie", "Retry-After", "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset"],
 )
 
 def _is_unsafe_method(method: str) -> bool:
@@ -191,6 +228,8 @@ async def add_process_time_header(request: Request, call_next):
         process_time = time.time() - start_time
         response.headers["X-Process-Time"] = str(process_time)
         response.headers["X-Request-ID"] = request_id
+        # Set by utils.rate_limit on rate-limited routes.
+        response.headers.update(getattr(request.state, "rate_limit_headers", None) or {})
         
         response.headers["X-Content-Type-Options"] = "nosniff"
         response.headers["X-Frame-Options"] = "DENY"
@@ -217,6 +256,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     return JSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail},
+        headers=exc.headers,
     )
 
 api_router = APIRouter(prefix="/api")
@@ -1,12 +1,14 @@
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import Float, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Float, Index, Integer, String, DateTime, ForeignKey, Text
 from sqlalchemy.orm import Mapped, mapped_column
 from database import Base
 
 
 class PageView(Base):
     __tablename__ = "page_views"
+    # Every analytics query filters on portfolio_id plus a viewed_at range.
+    __table_args__ = (Index("ix_page_views_portfolio_id_viewed_at", "portfolio_id", "viewed_at"),)
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     portfolio_id: Mapped[str] = mapped_column(String, ForeignKey("portfolios.id"), nullable=False, index=True)
@@ -16,3 +18,5 @@ class PageView(Base):
     ip_address: Mapped[str] = mapped_column(String, nullable=True, index=True)
     visitor_type: Mapped[str] = mapped_column(String, nullable=True, default="unknown", index=True)
     intent_score: Mapped[int] = mapped_column(Integer, nullable=True, default=0)
+    device_class: Mapped[str] = mapped_column(String, nullable=True, index=True)  # mobile, desktop
+    referrer_source: Mapped[str] = mapped_column(String, nullable=True, index=True)  # clean_referrer() label
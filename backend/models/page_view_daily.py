@@ -0,0 +1,19 @@
+from datetime import date
+from sqlalchemy import Date, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from database import Base
+
+
+class PageViewDaily(Base):
+    """Per-day page-view counts, pre-aggregated for the analytics dashboards."""
+
+    __tablename__ = "page_view_daily"
+
+    portfolio_id: Mapped[str] = mapped_column(String, ForeignKey("portfolios.id"), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)  # UTC
+    segment: Mapped[str] = mapped_column(String, primary_key=True)  # classify_visitor segment
+    device: Mapped[str] = mapped_column(String, primary_key=True)  # mobile, desktop
+    referrer_source: Mapped[str] = mapped_column(String, primary_key=True)  # clean_referrer() label
+    intent_bucket: Mapped[str] = mapped_column(String, primary_key=True)  # high, medium, low, none
+    views: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    intent_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
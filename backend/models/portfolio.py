@@ -1,18 +1,29 @@
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import String, DateTime, Boolean, Text, ForeignKey, Integer
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import JSON, String, DateTime, Boolean, Text, ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship, undefer_group
 from database import Base
 
+# JSONB on Postgres (indexable, field-level operators); JSON text elsewhere.
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
 
 class Portfolio(Base):
+    """A user's portfolio.
+
+    The large JSON columns are deferred and raise if read without being
+    loaded: handlers opt in per query with `.options(*LOAD_CONTENT)` or
+    `undefer(Portfolio.<column>)` for exactly the columns they touch.
+    """
+
     __tablename__ = "portfolios"
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id: Mapped[str] = mapped_column(String, ForeignKey("users.id"), nullable=False, index=True)
     slug: Mapped[str] = mapped_column(String, unique=True, index=True, nullable=False)
     custom_domain: Mapped[str] = mapped_column(String, unique=True, index=True, nullable=True)
-    parsed_data: Mapped[str] = mapped_column(Text, nullable=False, default="{}")  # JSON string
+    parsed_data: Mapped[dict] = mapped_column(JSONDocument, nullable=False, default=dict, deferred=True, deferred_group="content", deferred_raiseload=True)
     theme: Mapped[str] = mapped_column(String, default="minimal")
     template_id: Mapped[str] = mapped_column(String, default="standard")
     mode: Mapped[str] = mapped_column(String, default="light")
@@ -23,18 +34,21 @@ class Portfolio(Base):
     moderation_reason: Mapped[str] = mapped_column(String, nullable=True)
     resume_filename: Mapped[str] = mapped_column(String, nullable=True)
     resume_object_key: Mapped[str] = mapped_column(String, nullable=True)
+    resume_sha256: Mapped[str] = mapped_column(String(64), nullable=True)  # of the uploaded file's bytes
+    resume_tone: Mapped[str] = mapped_column(String, nullable=True)  # tone the stored parse was generated with
     view_count: Mapped[int] = mapped_column(Integer, default=0)
     hidden_sections: Mapped[str] = mapped_column(String, default="")  # comma-separated section names
-    version_history: Mapped[str] = mapped_column(Text, default="[]")  # JSON array of {"parsed_data": {...}, "saved_at": "ISO timestamp"}
-    career_graph: Mapped[str] = mapped_column(Text, nullable=True)  # JSON string — AI Career Knowledge Graph
-    role_versions: Mapped[str] = mapped_column(Text, nullable=True)  # JSON dict of role -> tailored data
+    career_graph: Mapped[dict] = mapped_column(JSONDocument, nullable=True, deferred=True, deferred_group="content", deferred_raiseload=True)  # AI Career Knowledge Graph
     active_role: Mapped[str] = mapped_column(String, nullable=True)  # currently active role version
     visible_to_recruiters: Mapped[bool] = mapped_column(Boolean, default=True)
-    connected_sources: Mapped[str] = mapped_column(Text, nullable=True)
-    video_scripts: Mapped[str] = mapped_column(Text, nullable=True)
+    connected_sources: Mapped[str] = mapped_column(Text, nullable=True, deferred=True, deferred_raiseload=True)
+    video_scripts: Mapped[str] = mapped_column(Text, nullable=True, deferred=True, deferred_raiseload=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
     
     # Relationships
     user = relationship("User", back_populates="portfolio", uselist=False)
 
+
+# parsed_data + career_graph: what PortfolioOut and most AI features read.
+LOAD_CONTENT = (undefer_group("content"),)
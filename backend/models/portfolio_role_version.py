@@ -0,0 +1,24 @@
+from datetime import datetime, timezone
+from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from database import Base
+
+
+class PortfolioRoleVersion(Base):
+    """A role-tailored copy of a portfolio's content, one row per (portfolio, role).
+
+    The title and counts are copied out of `data` so listings never read it;
+    `data` is deferred and raises unless a query opts in. The active role is
+    `Portfolio.active_role`.
+    """
+
+    __tablename__ = "portfolio_role_versions"
+
+    portfolio_id: Mapped[str] = mapped_column(String, ForeignKey("portfolios.id"), primary_key=True)
+    role: Mapped[str] = mapped_column(String, primary_key=True)
+    title: Mapped[str] = mapped_column(String, nullable=True)
+    skill_count: Mapped[int] = mapped_column(Integer, default=0)
+    experience_count: Mapped[int] = mapped_column(Integer, default=0)
+    data: Mapped[str] = mapped_column(Text, nullable=False, deferred=True, deferred_raiseload=True)  # JSON string
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
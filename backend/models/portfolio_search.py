@@ -0,0 +1,44 @@
+from datetime import datetime
+from sqlalchemy import Boolean, DateTime, DDL, ForeignKey, Index, String, Text, event
+from sqlalchemy.orm import Mapped, mapped_column
+from database import Base
+
+
+class PortfolioSearch(Base):
+    """Denormalized recruiter-search row, one per portfolio (see services.search_index).
+
+    Full-text matching is dialect specific and lives outside the ORM mapping:
+    - PostgreSQL: a generated `document_tsv` tsvector column with a GIN index.
+    - SQLite: the `portfolio_search_fts` FTS5 table, kept in sync by services.search_index.
+    """
+
+    __tablename__ = "portfolio_search"
+    __table_args__ = (Index("ix_portfolio_search_searchable_updated_at", "searchable", "updated_at"),)
+
+    portfolio_id: Mapped[str] = mapped_column(String, ForeignKey("portfolios.id"), primary_key=True)
+    searchable: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)  # published and visible to recruiters
+    document: Mapped[str] = mapped_column(Text, nullable=False, default="")  # normalized search text
+    card: Mapped[str] = mapped_column(Text, nullable=False, default="{}")  # JSON profile card served in results
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+# Shared with the add_portfolio_search migration so create_all and Alembic build the same schema.
+POSTGRES_SEARCH_DDL = [
+    "ALTER TABLE portfolio_search ADD COLUMN document_tsv tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('simple', document)) STORED",
+    "CREATE INDEX ix_portfolio_search_document_tsv ON portfolio_search USING GIN (document_tsv)",
+]
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS portfolio_search_fts "
+    "USING fts5(portfolio_id UNINDEXED, document, tokenize='unicode61')",
+]
+
+for _statement in POSTGRES_SEARCH_DDL:
+    event.listen(PortfolioSearch.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(PortfolioSearch.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(
+    PortfolioSearch.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS portfolio_search_fts").execute_if(dialect="sqlite"),
+)
@@ -0,0 +1,19 @@
+from sqlalchemy import ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+from database import Base
+
+
+class PortfolioSkill(Base):
+    """Inverted index of canonical skills, industries and career level per portfolio.
+
+    Maintained by services.search_index alongside portfolio_search; recruiter
+    filters and facet counts are answered from (facet, value) lookups here.
+    """
+
+    __tablename__ = "portfolio_skills"
+    __table_args__ = (Index("ix_portfolio_skills_facet_value", "facet", "value", "portfolio_id"),)
+
+    portfolio_id: Mapped[str] = mapped_column(String, ForeignKey("portfolios.id"), primary_key=True)
+    facet: Mapped[str] = mapped_column(String, primary_key=True)  # skill, industry, career_level
+    value: Mapped[str] = mapped_column(String, primary_key=True)  # canonical lowercase form
+    label: Mapped[str] = mapped_column(String, nullable=False)  # display form as written on the resume
@@ -0,0 +1,24 @@
+import uuid
+from datetime import datetime, timezone
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+from database import Base
+
+
+class PortfolioVersion(Base):
+    """A saved copy of a portfolio's parsed_data, taken before each resume upload.
+
+    `payload` is zlib-compressed JSON: the whole document when `is_snapshot`,
+    otherwise a JSON Patch (RFC 6902) from the previous version. Versions are
+    written and pruned by services.portfolio_versions only.
+    """
+
+    __tablename__ = "portfolio_versions"
+    __table_args__ = (Index("ix_portfolio_versions_portfolio_seq", "portfolio_id", "seq", unique=True),)
+
+    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    portfolio_id: Mapped[str] = mapped_column(String, ForeignKey("portfolios.id"), nullable=False)
+    seq: Mapped[int] = mapped_column(Integer, nullable=False)  # 1, 2, 3... per portfolio; never reused
+    is_snapshot: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    payload: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
@@ -0,0 +1,27 @@
+import uuid
+from datetime import datetime, timezone
+from sqlalchemy import String, DateTime, Integer, Text, LargeBinary, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+from database import Base
+
+
+class ResumeJob(Base):
+    __tablename__ = "resume_jobs"
+
+    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    user_id: Mapped[str] = mapped_column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    status: Mapped[str] = mapped_column(String, nullable=False, default="queued", index=True)  # queued, running, succeeded, failed
+    stage: Mapped[str] = mapped_column(String, nullable=False, default="queued")  # queued, extracting, analyzing, saving, done
+    filename: Mapped[str] = mapped_column(String, nullable=False)
+    tone: Mapped[str] = mapped_column(String, default="professional")
+    mode: Mapped[str] = mapped_column(String, default="replace")
+    payload: Mapped[bytes] = mapped_column(LargeBinary, nullable=True, deferred=True)  # raw upload, cleared once processed
+    result: Mapped[str] = mapped_column(Text, nullable=True)  # JSON upload response
+    error: Mapped[str] = mapped_column(Text, nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    claimed_by: Mapped[str] = mapped_column(String, nullable=True)  # worker holding the lease while running
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
+    heartbeat_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)  # lease renewed while running
+    finished_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,38 @@
+"""Rebuild the recruiter search index (portfolio_search) from the portfolios table.
+
+Run once after the add_portfolio_search migration, and any time the indexed
+document format changes in services/search_index.py.
+
+Examples:
+    python reindex_search.py
+    python reindex_search.py --batch-size 200
+"""
+
+import argparse
+import asyncio
+
+from database import AsyncSessionLocal
+from services.search_index import reindex_all
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rebuild the recruiter search index.")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="Portfolios indexed per transaction.",
+    )
+    return parser.parse_args()
+
+
+async def main() -> int:
+    args = parse_args()
+    async with AsyncSessionLocal() as session:
+        total = await reindex_all(session, batch_size=args.batch_size)
+    print(f"Indexed {total} portfolio(s) for recruiter search.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(main()))
@@ -1,4 +1,3 @@
-import json
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
@@ -6,7 +5,7 @@ from pydantic import BaseModel
 
 from database import get_db
 from models.user import User
-from models.portfolio import Portfolio
+from models.portfolio import LOAD_CONTENT, Portfolio
 from services.achievement_service import discover_achievements
 from services.portfolio_service import update_portfolio
 from utils.auth import get_current_user
@@ -26,13 +25,13 @@ async def discover(
     current_user: User = Depends(get_current_user),
 ):
     """Analyze resume entries and suggest metric-enriched rewrites."""
-    result = await db.execute(select(Portfolio).where(Portfolio.user_id == current_user.id))
+    result = await db.execute(select(Portfolio).options(*LOAD_CONTENT).where(Portfolio.user_id == current_user.id))
     portfolio = result.scalar_one_or_none()
     if not portfolio:
         raise HTTPException(status_code=404, detail="No portfolio found")
 
-    parsed_data = json.loads(portfolio.parsed_data) if portfolio.parsed_data else {}
-    career_graph = json.loads(portfolio.career_graph) if portfolio.career_graph else {}
+    parsed_data = portfolio.parsed_data or {}
+    career_graph = portfolio.career_graph or {}
 
     suggestions = await discover_achievements(parsed_data, career_graph)
     return {"suggestions": suggestions}
@@ -45,12 +44,12 @@ async def apply_suggestion(
     current_user: User = Depends(get_current_user),
 ):
     """Apply a single achievement suggestion to the portfolio."""
-    result = await db.execute(select(Portfolio).where(Portfolio.user_id == current_user.id))
+    result = await db.execute(select(Portfolio).options(*LOAD_CONTENT).where(Portfolio.user_id == current_user.id))
     portfolio = result.scalar_one_or_none()
     if not portfolio:
         raise HTTPException(status_code=404, detail="No portfolio found")
 
-    parsed_data = json.loads(portfolio.parsed_data) if portfolio.parsed_data else {}
+    parsed_data = portfolio.parsed_data or {}
 
     if req.type == "experience":
         experiences = parsed_data.get("experience", [])
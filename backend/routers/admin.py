@@ -1,18 +1,28 @@
-import json
 from datetime import datetime, timedelta, timezone
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select, func, or_, delete, desc
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 from database import get_db
 from models.user import User
 from models.portfolio import Portfolio
 from models.page_view import PageView
+from models.page_view_daily import PageViewDaily
 from models.audit_log import AuditLog
 from services.groq_service import check_health as check_groq_health, analyze_portfolio_spam
 import shutil
 import psutil
+from services.cache import llm_cache
+from services.extraction_pool import extraction_metrics
+from services.password_hasher import password_hash_metrics
+from services.public_cache import public_portfolio_cache
+from services.dynamic_portfolio_service import delete_role_versions
+from services.portfolio_versions import delete_versions
+from services.search_index import index_portfolio, remove_from_index
 from services.rustfs_service import rustfs_service
+from services.user_cache import user_cache
 from utils.auth import get_admin_user
+from utils.pagination import after_key, decode_cursor, encode_cursor, split_page
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -83,52 +93,68 @@ async def get_stats(
 @router.get("/users")
 async def list_users(
     search: str = Query("", description="Search by name or email"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
     db: AsyncSession = Depends(get_db),
     _: User = Depends(get_admin_user),
 ):
-    query = select(User).order_by(User.created_at.desc())
+    """Newest users first, keyset paginated on (created_at, id)."""
+    keys = (User.created_at, User.id)
+    query = select(
+        User.id,
+        User.name,
+        User.email,
+        User.auth_provider,
+        User.is_active,
+        User.is_admin,
+        User.is_verified,
+        User.avatar_url,
+        User.created_at,
+    )
     if search.strip():
         pattern = f"%{search.strip()}%"
         query = query.where(or_(User.name.ilike(pattern), User.email.ilike(pattern)))
+    after = decode_cursor(cursor, len(keys))
+    if after is not None:
+        query = query.where(after_key(keys, after))
 
-    result = await db.execute(query)
-    users = result.scalars().all()
-    return [
-        {
-            "id": u.id,
-            "name": u.name,
-            "email": u.email,
-            "auth_provider": u.auth_provider,
-            "is_active": u.is_active,
-            "is_admin": u.is_admin,
-            "is_verified": u.is_verified,
-            "avatar_url": u.avatar_url,
-            "created_at": u.created_at,
-        }
-        for u in users
-    ]
+    result = await db.execute(query.order_by(*(key.desc() for key in keys)).limit(limit + 1))
+    users, next_key = split_page(result.all(), limit, lambda u: (u.created_at, u.id))
+    return {
+        "users": [dict(u._mapping) for u in users],
+        "next_cursor": encode_cursor(next_key),
+    }
 
 
 @router.get("/portfolios")
 async def list_portfolios(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
     db: AsyncSession = Depends(get_db),
     _: User = Depends(get_admin_user),
 ):
-    result = await db.execute(select(Portfolio).order_by(Portfolio.created_at.desc()))
-    portfolios = result.scalars().all()
-    return [
-        {
-            "id": p.id,
-            "user_id": p.user_id,
-            "slug": p.slug,
-            "theme": p.theme,
-            "primary_color": p.primary_color,
-            "is_published": p.is_published,
-            "view_count": p.view_count or 0,
-            "created_at": p.created_at,
-        }
-        for p in portfolios
-    ]
+    """Newest portfolios first, keyset paginated on (created_at, id). Only list columns are loaded."""
+    keys = (Portfolio.created_at, Portfolio.id)
+    query = select(
+        Portfolio.id,
+        Portfolio.user_id,
+        Portfolio.slug,
+        Portfolio.theme,
+        Portfolio.primary_color,
+        Portfolio.is_published,
+        func.coalesce(Portfolio.view_count, 0).label("view_count"),
+        Portfolio.created_at,
+    )
+    after = decode_cursor(cursor, len(keys))
+    if after is not None:
+        query = query.where(after_key(keys, after))
+
+    result = await db.execute(query.order_by(*(key.desc() for key in keys)).limit(limit + 1))
+    portfolios, next_key = split_page(result.all(), limit, lambda p: (p.created_at, p.id))
+    return {
+        "portfolios": [dict(p._mapping) for p in portfolios],
+        "next_cursor": encode_cursor(next_key),
+    }
 
 
 @router.patch("/users/{user_id}/verify")
@@ -144,6 +170,7 @@ async def verify_user(
         raise HTTPException(status_code=404, detail="User not found")
     user.is_verified = True
     await db.commit()
+    await user_cache.invalidate(user_id)
     await log_admin_action(db, _.id, "VERIFY_USER", user_id, "user", f"Verified user {user.email}")
     return {"message": f"User {user.email} verified."}
 
@@ -165,6 +192,7 @@ async def toggle_user_admin(
     
     user.is_admin = not user.is_admin
     await db.commit()
+    await user_cache.invalidate(user_id)
     await log_admin_action(
         db, 
         admin.id, 
@@ -189,6 +217,7 @@ async def toggle_user_active(
         raise HTTPException(status_code=404, detail="User not found")
     user.is_active = not user.is_active
     await db.commit()
+    await user_cache.invalidate(user_id)
     await log_admin_action(
         db, 
         _.id, 
@@ -230,12 +259,18 @@ async def delete_user_admin(
 
     if portfolio_ids:
         await db.execute(delete(PageView).where(PageView.portfolio_id.in_(portfolio_ids)))
+        await db.execute(delete(PageViewDaily).where(PageViewDaily.portfolio_id.in_(portfolio_ids)))
+        await remove_from_index(db, portfolio_ids)
+        await delete_versions(db, portfolio_ids)
+        await delete_role_versions(db, portfolio_ids)
 
     # Delete portfolios
     await db.execute(delete(Portfolio).where(Portfolio.user_id == user_id))
     
     await db.delete(user)
     await db.commit()
+    public_portfolio_cache.invalidate_user(user_id)
+    await user_cache.invalidate(user_id)
     await log_admin_action(db, _.id, "DELETE_USER", user_id, "user", f"Permanently deleted user {user.email}")
     return {"message": f"User {user.email} completely deleted."}
 
@@ -252,7 +287,9 @@ async def unpublish_portfolio(
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio not found")
     portfolio.is_published = False
+    await index_portfolio(db, portfolio)
     await db.commit()
+    public_portfolio_cache.invalidate(portfolio_id)
     await log_admin_action(db, _.id, "UNPUBLISH_PORTFOLIO", portfolio_id, "portfolio", f"Force unpublished portfolio: {portfolio.slug}")
     return {"message": f"Portfolio '{portfolio.slug}' unpublished."}
 
@@ -277,8 +314,13 @@ async def delete_portfolio_admin(
                 detail="Could not delete the portfolio's stored resume file.",
             )
     await db.execute(delete(PageView).where(PageView.portfolio_id == portfolio_id))
+    await db.execute(delete(PageViewDaily).where(PageViewDaily.portfolio_id == portfolio_id))
+    await remove_from_index(db, [portfolio_id])
+    await delete_versions(db, [portfolio_id])
+    await delete_role_versions(db, [portfolio_id])
     await db.delete(portfolio)
     await db.commit()
+    public_portfolio_cache.invalidate(portfolio_id)
     await log_admin_action(db, _.id, "DELETE_PORTFOLIO", portfolio_id, "portfolio", f"Permanently deleted portfolio: {portfolio.slug}")
     return {"message": f"Portfolio '{portfolio.slug}' deleted."}
 
@@ -290,13 +332,13 @@ async def analyze_portfolio_for_spam_action(
     admin: User = Depends(get_admin_user),
 ):
     """Trigger AI analysis to check if a portfolio is spam."""
-    result = await db.execute(select(Portfolio).where(Portfolio.id == portfolio_id))
+    result = await db.execute(select(Portfolio).options(undefer(Portfolio.parsed_data)).where(Portfolio.id == portfolio_id))
     portfolio = result.scalar_one_or_none()
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio not found")
     
     # Use the stored parsed payload instead of non-existent ORM fields.
-    parsed_data = json.loads(portfolio.parsed_data) if portfolio.parsed_data else {}
+    parsed_data = portfolio.parsed_data or {}
     analysis_data = {
         "slug": portfolio.slug,
         "name": parsed_data.get("name", ""),
@@ -411,5 +453,10 @@ async def get_system_health(
         "resources": {
             "disk": disk_usage,
             "memory": memory_usage
-        }
+        },
+        "llm_cache": llm_cache.stats(),
+        "public_portfolio_cache": public_portfolio_cache.stats(),
+        "user_cache": user_cache.stats(),
+        "extraction": extraction_metrics.snapshot(),
+        "password_hashing": password_hash_metrics.snapshot(),
     }
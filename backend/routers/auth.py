@@ -19,7 +19,12 @@ from schemas.user import (
     UserLogin,
     UserOut,
 )
+from services.public_cache import public_portfolio_cache
+from services.dynamic_portfolio_service import delete_role_versions
+from services.portfolio_versions import delete_versions
+from services.search_index import index_user_portfolios, remove_from_index
 from services.rustfs_service import rustfs_service
+from services.user_cache import user_cache
 from utils.auth import (
     create_access_token,
     create_refresh_token,
@@ -27,7 +32,8 @@ from utils.auth import (
     get_current_user,
     get_optional_user,
     hash_password,
-    verify_password,
+    hash_password_async,
+    verify_password_async,
 )
 
 def set_auth_cookies(response: Response, access_token: str, refresh_token: str, request: Request, settings):
@@ -68,11 +74,6 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 DUMMY_PASSWORD_HASH = hash_password("dummy-password-for-timing-safety")
 
 
-def _rate_key(request: Request, action: str, identity: str = "") -> str:
-    ip = request.client.host if request.client else "unknown"
-    return f"{action}:{ip}:{identity}".lower()
-
-
 async def _delete_resume_objects_or_raise(db: AsyncSession, user_id: str, email: str) -> None:
     from models.portfolio import Portfolio
 
@@ -93,12 +94,7 @@ async def register(
     request: Request,
     db: AsyncSession = Depends(get_db),
 ):
-    await rate_limiter.enforce(
-        key=_rate_key(request, "auth_register", user_data.email),
-        limit=5,
-        window_seconds=60,
-        message="Too many registration attempts. Please wait a minute.",
-    )
+    await rate_limiter.enforce(request, "auth_register", user_data.email)
 
     result = await db.execute(select(User).where(User.email == user_data.email))
     existing = result.scalar_one_or_none()
@@ -108,7 +104,7 @@ async def register(
     user = User(
         name=user_data.name,
         email=user_data.email,
-        hashed_password=hash_password(user_data.password),
+        hashed_password=await hash_password_async(user_data.password),
         is_verified=False,
     )
     db.add(user)
@@ -136,12 +132,7 @@ async def google_auth(
     response: Response,
     db: AsyncSession = Depends(get_db),
 ):
-    await rate_limiter.enforce(
-        key=_rate_key(request, "auth_google"),
-        limit=20,
-        window_seconds=60,
-        message="Too many Google sign-in attempts. Please try again shortly.",
-    )
+    await rate_limiter.enforce(request, "auth_google")
 
     settings = get_settings()
     if not settings.google_client_id:
@@ -205,8 +196,11 @@ async def google_auth(
                 )
             if avatar_url and not user.avatar_url:
                 user.avatar_url = avatar_url
+                await index_user_portfolios(db, user)
                 await db.commit()
                 await db.refresh(user)
+                public_portfolio_cache.invalidate_user(user.id)
+                await user_cache.invalidate(user.id)
         else:
             user = User(
                 name=name,
@@ -247,19 +241,14 @@ async def login(
     response: Response,
     db: AsyncSession = Depends(get_db),
 ):
-    await rate_limiter.enforce(
-        key=_rate_key(request, "auth_login", credentials.email),
-        limit=10,
-        window_seconds=60,
-        message="Too many login attempts. Please wait a minute.",
-    )
+    await rate_limiter.enforce(request, "auth_login", credentials.email)
 
     result = await db.execute(select(User).where(User.email == credentials.email))
     user = result.scalar_one_or_none()
 
     # Always run verify_password (even for a nonexistent user, against a dummy hash)
     # so response time doesn't leak whether an email is registered.
-    password_ok = verify_password(
+    password_ok = await verify_password_async(
         credentials.password,
         (user.hashed_password if user else None) or DUMMY_PASSWORD_HASH,
     )
@@ -355,8 +344,11 @@ async def update_profile(
         current_user.name = data.name.strip()
     if data.avatar_url is not None:
         current_user.avatar_url = data.avatar_url
+    await index_user_portfolios(db, current_user)
     await db.commit()
     await db.refresh(current_user)
+    public_portfolio_cache.invalidate_user(current_user.id)
+    await user_cache.invalidate(current_user.id)
     return current_user
 
 
@@ -366,12 +358,13 @@ async def change_password(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    await db.refresh(current_user, ["hashed_password"])
     if current_user.auth_provider == "google" and not current_user.hashed_password:
         raise HTTPException(status_code=400, detail="Google users cannot change password here. Use Google Account settings.")
-    if not verify_password(data.current_password, current_user.hashed_password or ""):
+    if not await verify_password_async(data.current_password, current_user.hashed_password or ""):
         raise HTTPException(status_code=401, detail="Current password is incorrect")
 
-    current_user.hashed_password = hash_password(data.new_password)
+    current_user.hashed_password = await hash_password_async(data.new_password)
     await db.commit()
     return {"message": "Password updated successfully!"}
 
@@ -382,6 +375,7 @@ async def delete_account(
     current_user: User = Depends(get_current_user),
 ):
     from models.page_view import PageView
+    from models.page_view_daily import PageViewDaily
     from models.portfolio import Portfolio
     from sqlalchemy import delete
 
@@ -392,10 +386,16 @@ async def delete_account(
 
     if portfolio_ids:
         await db.execute(delete(PageView).where(PageView.portfolio_id.in_(portfolio_ids)))
+        await db.execute(delete(PageViewDaily).where(PageViewDaily.portfolio_id.in_(portfolio_ids)))
+        await remove_from_index(db, portfolio_ids)
+        await delete_versions(db, portfolio_ids)
+        await delete_role_versions(db, portfolio_ids)
 
     await db.execute(delete(Portfolio).where(Portfolio.user_id == current_user.id))
     await db.delete(current_user)
     await db.commit()
+    public_portfolio_cache.invalidate_user(current_user.id)
+    await user_cache.invalidate(current_user.id)
 
     logger.info(f"Account deleted: {current_user.email} (id={current_user.id})")
     return {"message": "Account and all data deleted successfully."}
@@ -421,6 +421,7 @@ async def verify_email(token: str, db: AsyncSession = Depends(get_db)):
 
         user.is_verified = True
         await db.commit()
+        await user_cache.invalidate(user.id)
         return {"message": "Email verified successfully! You can now generate portfolios.", "already_verified": False}
     except HTTPException:
         raise
@@ -434,12 +435,7 @@ async def resend_verification(
     request: Request,
     db: AsyncSession = Depends(get_db),
 ):
-    await rate_limiter.enforce(
-        key=_rate_key(request, "auth_resend_verification", data.email),
-        limit=3,
-        window_seconds=300,
-        message="Too many verification email requests. Please try again in a few minutes.",
-    )
+    await rate_limiter.enforce(request, "auth_resend_verification", data.email)
 
     result = await db.execute(select(User).where(User.email == data.email))
     user = result.scalar_one_or_none()
@@ -466,12 +462,7 @@ async def forgot_password(
     request: Request,
     db: AsyncSession = Depends(get_db),
 ):
-    await rate_limiter.enforce(
-        key=_rate_key(request, "auth_forgot_password", data.email),
-        limit=5,
-        window_seconds=300,
-        message="Too many password reset requests. Please try again later.",
-    )
+    await rate_limiter.enforce(request, "auth_forgot_password", data.email)
 
     result = await db.execute(select(User).where(User.email == data.email))
     user = result.scalar_one_or_none()
@@ -496,12 +487,7 @@ async def reset_password(
     request: Request,
     db: AsyncSession = Depends(get_db),
 ):
-    await rate_limiter.enforce(
-        key=_rate_key(request, "auth_reset_password"),
-        limit=10,
-        window_seconds=300,
-        message="Too many password reset attempts. Please try again shortly.",
-    )
+    await rate_limiter.enforce(request, "auth_reset_password")
 
     from services.email_service import decode_token
 
@@ -519,7 +505,7 @@ async def reset_password(
         if user.auth_provider == "google" and not user.hashed_password:
             raise HTTPException(status_code=400, detail="Google users cannot reset password here.")
 
-        user.hashed_password = hash_password(data.new_password)
+        user.hashed_password = await hash_password_async(data.new_password)
         await db.commit()
         return {"message": "Password reset successfully! You can now log in with your new password."}
     except HTTPException:
@@ -1,15 +1,18 @@
-import json
 from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
 from database import get_db
 from models.user import User
-from models.portfolio import Portfolio
+from models.portfolio import LOAD_CONTENT, Portfolio
 from services.auto_update_service import fetch_github_repos, fetch_medium_posts, merge_into_parsed_data
+from services.public_cache import public_portfolio_cache
+from services.search_index import index_portfolio
 from utils.auth import get_current_user
+from utils.json_codec import dumps, loads
 
 router = APIRouter(prefix="/auto-update", tags=["Auto Updates"])
 
@@ -28,11 +31,11 @@ async def get_connected_sources(
     current_user: User = Depends(get_current_user),
 ):
     """Get currently connected external sources."""
-    result = await db.execute(select(Portfolio).where(Portfolio.user_id == current_user.id))
+    result = await db.execute(select(Portfolio).options(undefer(Portfolio.connected_sources)).where(Portfolio.user_id == current_user.id))
     portfolio = result.scalar_one_or_none()
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio not found")
-    sources = json.loads(portfolio.connected_sources) if portfolio.connected_sources else {}
+    sources = loads(portfolio.connected_sources) if portfolio.connected_sources else {}
     return {"sources": sources}
 
 
@@ -59,25 +62,27 @@ async def sync_github(
     current_user: User = Depends(get_current_user),
 ):
     """Fetch GitHub repos and merge into portfolio."""
-    result = await db.execute(select(Portfolio).where(Portfolio.user_id == current_user.id))
+    result = await db.execute(select(Portfolio).options(*LOAD_CONTENT, undefer(Portfolio.connected_sources)).where(Portfolio.user_id == current_user.id))
     portfolio = result.scalar_one_or_none()
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio not found")
 
-    parsed_data = json.loads(portfolio.parsed_data) if portfolio.parsed_data else {}
+    parsed_data = portfolio.parsed_data or {}
 
     repos = await fetch_github_repos(req.username)
     if not repos:
         raise HTTPException(status_code=404, detail=f"No public repos found for GitHub user '{req.username}'")
 
     merged = merge_into_parsed_data(parsed_data, repos=repos)
-    portfolio.parsed_data = json.dumps(merged)
+    portfolio.parsed_data = merged
 
-    sources = json.loads(portfolio.connected_sources) if portfolio.connected_sources else {}
+    sources = loads(portfolio.connected_sources) if portfolio.connected_sources else {}
     sources["github"] = {"username": req.username, "last_synced": str(datetime.now(timezone.utc)), "repo_count": len(repos)}
-    portfolio.connected_sources = json.dumps(sources)
+    portfolio.connected_sources = dumps(sources)
 
+    await index_portfolio(db, portfolio)
     await db.commit()
+    public_portfolio_cache.invalidate(portfolio.id)
 
     return {
         "imported": len(repos),
@@ -109,25 +114,27 @@ async def sync_medium(
     current_user: User = Depends(get_current_user),
 ):
     """Fetch Medium posts and merge into portfolio."""
-    result = await db.execute(select(Portfolio).where(Portfolio.user_id == current_user.id))
+    result = await db.execute(select(Portfolio).options(*LOAD_CONTENT, undefer(Portfolio.connected_sources)).where(Portfolio.user_id == current_user.id))
     portfolio = result.scalar_one_or_none()
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio not found")
 
-    parsed_data = json.loads(portfolio.parsed_data) if portfolio.parsed_data else {}
+    parsed_data = portfolio.parsed_data or {}
 
     posts = await fetch_medium_posts(req.username)
     if not posts:
         raise HTTPException(status_code=404, detail=f"No posts found for Medium user '{req.username}'")
 
     merged = merge_into_parsed_data(parsed_data, posts=posts)
-    portfolio.parsed_data = json.dumps(merged)
+    portfolio.parsed_data = merged
 
-    sources = json.loads(portfolio.connected_sources) if portfolio.connected_sources else {}
+    sources = loads(portfolio.connected_sources) if portfolio.connected_sources else {}
     sources["medium"] = {"username": req.username, "last_synced": str(datetime.now(timezone.utc)), "post_count": len(posts)}
-    portfolio.connected_sources = json.dumps(sources)
+    portfolio.connected_sources = dumps(sources)
 
+    await index_portfolio(db, portfolio)
     await db.commit()
+    public_portfolio_cache.invalidate(portfolio.id)
 
     return {
         "imported": len(posts),
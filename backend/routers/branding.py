@@ -1,4 +1,3 @@
-import json
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -7,7 +6,7 @@ from loguru import logger
 
 from database import get_db
 from models.user import User
-from models.portfolio import Portfolio
+from models.portfolio import LOAD_CONTENT, Portfolio
 from services.branding_service import generate_brand_asset, generate_all_brand_assets, BRANDING_PROMPTS
 from utils.auth import get_current_user
 
@@ -44,13 +43,13 @@ async def generate_single_asset(
     current_user: User = Depends(get_current_user),
 ):
     """Generate a single brand asset."""
-    result = await db.execute(select(Portfolio).where(Portfolio.user_id == current_user.id))
+    result = await db.execute(select(Portfolio).options(*LOAD_CONTENT).where(Portfolio.user_id == current_user.id))
     portfolio = result.scalar_one_or_none()
     if not portfolio:
         raise HTTPException(status_code=404, detail="No portfolio found. Upload a resume first.")
 
-    career_graph = json.loads(portfolio.career_graph) if portfolio.career_graph else {}
-    parsed_data = json.loads(portfolio.parsed_data) if portfolio.parsed_data else {}
+    career_graph = portfolio.career_graph or {}
+    parsed_data = portfolio.parsed_data or {}
 
     if req.asset_type not in BRANDING_PROMPTS:
         raise HTTPException(
@@ -73,13 +72,13 @@ async def generate_all_assets(
     current_user: User = Depends(get_current_user),
 ):
     """Generate all brand assets in parallel."""
-    result = await db.execute(select(Portfolio).where(Portfolio.user_id == current_user.id))
+    result = await db.execute(select(Portfolio).options(*LOAD_CONTENT).where(Portfolio.user_id == current_user.id))
     portfolio = result.scalar_one_or_none()
     if not portfolio:
         raise HTTPException(status_code=404, detail="No portfolio found. Upload a resume first.")
 
-    career_graph = json.loads(portfolio.career_graph) if portfolio.career_graph else {}
-    parsed_data = json.loads(portfolio.parsed_data) if portfolio.parsed_data else {}
+    career_graph = portfolio.career_graph or {}
+    parsed_data = portfolio.parsed_data or {}
 
     try:
         assets = await generate_all_brand_assets(career_graph, parsed_data, req.tone)
@@ -1,4 +1,3 @@
-import json
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -6,7 +5,7 @@ from sqlalchemy import select
 
 from database import get_db
 from models.user import User
-from models.portfolio import Portfolio
+from models.portfolio import LOAD_CONTENT, Portfolio
 from services.content_service import generate_content, regenerate_content, CONTENT_TYPES, TONE_OPTIONS
 from utils.auth import get_current_user
 
@@ -40,13 +39,13 @@ async def create_content(
     current_user: User = Depends(get_current_user),
 ):
     """Generate content from portfolio data."""
-    result = await db.execute(select(Portfolio).where(Portfolio.user_id == current_user.id))
+    result = await db.execute(select(Portfolio).options(*LOAD_CONTENT).where(Portfolio.user_id == current_user.id))
     portfolio = result.scalar_one_or_none()
     if not portfolio:
         raise HTTPException(status_code=404, detail="No portfolio found")
 
-    parsed_data = json.loads(portfolio.parsed_data) if portfolio.parsed_data else {}
-    career_graph = json.loads(portfolio.career_graph) if portfolio.career_graph else {}
+    parsed_data = portfolio.parsed_data or {}
+    career_graph = portfolio.career_graph or {}
 
     try:
         content = await generate_content(
@@ -72,13 +71,13 @@ async def regenerate_existing_content(
     current_user: User = Depends(get_current_user),
 ):
     """Regenerate content based on feedback."""
-    result = await db.execute(select(Portfolio).where(Portfolio.user_id == current_user.id))
+    result = await db.execute(select(Portfolio).options(*LOAD_CONTENT).where(Portfolio.user_id == current_user.id))
     portfolio = result.scalar_one_or_none()
     if not portfolio:
         raise HTTPException(status_code=404, detail="No portfolio found")
 
-    parsed_data = json.loads(portfolio.parsed_data) if portfolio.parsed_data else {}
-    career_graph = json.loads(portfolio.career_graph) if portfolio.career_graph else {}
+    parsed_data = portfolio.parsed_data or {}
+    career_graph = portfolio.career_graph or {}
 
     try:
         content = await regenerate_content(req.original_content, req.feedback, parsed_data, career_graph)
@@ -1,13 +1,18 @@
-import json
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database import get_db
 from models.user import User
-from models.portfolio import Portfolio
-from services.dynamic_portfolio_service import generate_role_version
+from models.portfolio import LOAD_CONTENT, Portfolio
+from services.dynamic_portfolio_service import (
+    generate_role_version,
+    get_role_version,
+    list_role_versions,
+    role_version_exists,
+    save_role_version,
+)
 from utils.auth import get_current_user
 
 router = APIRouter(prefix="/portfolio/dynamic", tags=["Dynamic Portfolios"])
@@ -43,26 +48,37 @@ async def get_role_versions(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """List all generated role versions for the user's portfolio."""
-    result = await db.execute(select(Portfolio).where(Portfolio.user_id == current_user.id))
-    portfolio = result.scalar_one_or_none()
+    """List the user's role versions (metadata only; fetch one with /versions/{role})."""
+    result = await db.execute(select(Portfolio.id, Portfolio.active_role).where(Portfolio.user_id == current_user.id))
+    portfolio = result.first()
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio not found")
 
-    versions = json.loads(portfolio.role_versions) if portfolio.role_versions else {}
+    versions = await list_role_versions(db, portfolio.id)
     return {
-        "versions": [
-            {
-                "role": role,
-                "data": data,
-                "is_active": portfolio.active_role == role,
-            }
-            for role, data in versions.items()
-        ],
+        "versions": [{**version, "is_active": portfolio.active_role == version["role"]} for version in versions],
         "active_role": portfolio.active_role,
     }
 
 
+@router.get("/versions/{role:path}")
+async def get_role_version_data(
+    role: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Full tailored data for one role version."""
+    result = await db.execute(select(Portfolio.id, Portfolio.active_role).where(Portfolio.user_id == current_user.id))
+    portfolio = result.first()
+    if not portfolio:
+        raise HTTPException(status_code=404, detail="Portfolio not found")
+
+    data = await get_role_version(db, portfolio.id, role)
+    if data is None:
+        raise HTTPException(status_code=404, detail=f"Version for role '{role}' not found.")
+    return {"role": role, "data": data, "is_active": portfolio.active_role == role}
+
+
 @router.post("/generate")
 async def create_role_version(
     req: GenerateRoleVersionRequest,
@@ -70,13 +86,13 @@ async def create_role_version(
     current_user: User = Depends(get_current_user),
 ):
     """Generate a role-specific version of the portfolio data."""
-    result = await db.execute(select(Portfolio).where(Portfolio.user_id == current_user.id))
+    result = await db.execute(select(Portfolio).options(*LOAD_CONTENT).where(Portfolio.user_id == current_user.id))
     portfolio = result.scalar_one_or_none()
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio not found")
 
-    parsed_data = json.loads(portfolio.parsed_data) if portfolio.parsed_data else {}
-    career_graph = json.loads(portfolio.career_graph) if portfolio.career_graph else {}
+    parsed_data = portfolio.parsed_data or {}
+    career_graph = portfolio.career_graph or {}
 
     if not parsed_data or not parsed_data.get("skills"):
         raise HTTPException(status_code=400, detail="Portfolio has no data. Upload a resume first.")
@@ -85,11 +101,8 @@ async def create_role_version(
     if not tailored:
         raise HTTPException(status_code=502, detail="Failed to generate role version")
 
-    versions = json.loads(portfolio.role_versions) if portfolio.role_versions else {}
-    versions[req.target_role] = tailored
-    portfolio.role_versions = json.dumps(versions)
+    await save_role_version(db, portfolio.id, req.target_role, tailored)
     await db.commit()
-    await db.refresh(portfolio)
 
     return {
         "role": req.target_role,
@@ -105,16 +118,15 @@ async def activate_role_version(
     current_user: User = Depends(get_current_user),
 ):
     """Set a role version as the active portfolio view."""
-    result = await db.execute(select(Portfolio).where(Portfolio.user_id == current_user.id))
-    portfolio = result.scalar_one_or_none()
-    if not portfolio:
+    result = await db.execute(select(Portfolio.id).where(Portfolio.user_id == current_user.id))
+    portfolio_id = result.scalar_one_or_none()
+    if not portfolio_id:
         raise HTTPException(status_code=404, detail="Portfolio not found")
 
-    versions = json.loads(portfolio.role_versions) if portfolio.role_versions else {}
-    if req.role not in versions:
+    if not await role_version_exists(db, portfolio_id, req.role):
         raise HTTPException(status_code=404, detail=f"Version for role '{req.role}' not found. Generate it first.")
 
-    portfolio.active_role = req.role
+    await db.execute(update(Portfolio).where(Portfolio.id == portfolio_id).values(active_role=req.role))
     await db.commit()
 
     return {"active_role": req.role, "message": f"Active role set to '{req.role}'."}
@@ -126,12 +138,11 @@ async def reset_to_original(
     current_user: User = Depends(get_current_user),
 ):
     """Reset to original portfolio data (no role tailoring)."""
-    result = await db.execute(select(Portfolio).where(Portfolio.user_id == current_user.id))
-    portfolio = result.scalar_one_or_none()
-    if not portfolio:
+    result = await db.execute(
+        update(Portfolio).where(Portfolio.user_id == current_user.id).values(active_role=None)
+    )
+    if not result.rowcount:
         raise HTTPException(status_code=404, detail="Portfolio not found")
-
-    portfolio.active_role = None
     await db.commit()
 
     return {"message": "Reset to original portfolio data."}
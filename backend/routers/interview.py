@@ -1,4 +1,3 @@
-import json
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -6,7 +5,7 @@ from sqlalchemy import select
 
 from database import get_db
 from models.user import User
-from models.portfolio import Portfolio
+from models.portfolio import LOAD_CONTENT, Portfolio
 from services.interview_service import generate_questions, evaluate_answer
 from utils.auth import get_current_user
 
@@ -30,13 +29,13 @@ async def get_interview_questions(
     current_user: User = Depends(get_current_user),
 ):
     """Generate interview questions based on portfolio data."""
-    result = await db.execute(select(Portfolio).where(Portfolio.user_id == current_user.id))
+    result = await db.execute(select(Portfolio).options(*LOAD_CONTENT).where(Portfolio.user_id == current_user.id))
     portfolio = result.scalar_one_or_none()
     if not portfolio:
         raise HTTPException(status_code=404, detail="No portfolio found")
 
-    parsed_data = json.loads(portfolio.parsed_data) if portfolio.parsed_data else {}
-    career_graph = json.loads(portfolio.career_graph) if portfolio.career_graph else {}
+    parsed_data = portfolio.parsed_data or {}
+    career_graph = portfolio.career_graph or {}
 
     try:
         questions = await generate_questions(parsed_data, career_graph, role_focus)
@@ -52,13 +51,13 @@ async def evaluate_interview_answer(
     current_user: User = Depends(get_current_user),
 ):
     """Evaluate an interview answer and return feedback."""
-    result = await db.execute(select(Portfolio).where(Portfolio.user_id == current_user.id))
+    result = await db.execute(select(Portfolio).options(*LOAD_CONTENT).where(Portfolio.user_id == current_user.id))
     portfolio = result.scalar_one_or_none()
     if not portfolio:
         raise HTTPException(status_code=404, detail="No portfolio found")
 
-    parsed_data = json.loads(portfolio.parsed_data) if portfolio.parsed_data else {}
-    career_graph = json.loads(portfolio.career_graph) if portfolio.career_graph else {}
+    parsed_data = portfolio.parsed_data or {}
+    career_graph = portfolio.career_graph or {}
 
     try:
         feedback = await evaluate_answer(req.question, req.answer, req.expected_topics, parsed_data, career_graph)
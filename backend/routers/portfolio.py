@@ -1,15 +1,12 @@
-import json
-from datetime import datetime, timedelta, timezone
 import re
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from sqlalchemy.orm import joinedload
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload, undefer
 
 from database import get_db
 from models.user import User
-from models.portfolio import Portfolio
-from models.page_view import PageView
+from models.portfolio import LOAD_CONTENT, Portfolio
 from pydantic import BaseModel
 from schemas.portfolio import PortfolioUpdate, PortfolioOut, RegenerateRequest, SlugUpdate
 
@@ -18,8 +15,12 @@ from schemas.portfolio import PortfolioUpdate, PortfolioOut, RegenerateRequest,
 class CopilotAskRequest(BaseModel):
     question: str
 from services.portfolio_service import update_portfolio
+from services.portfolio_versions import list_versions, load_version, record_version
 from services.groq_service import regenerate_field_with_groq, analyze_portfolio_spam
-from services.analytics_service import classify_visitor
+from services.analytics_service import classify_device, classify_visitor, get_basic_analytics, referrer_source
+from services.public_cache import CachedPortfolio, etag_matches, public_portfolio_cache
+from services.search_index import index_portfolio
+from services.view_buffer import view_buffer
 from services.copilot_service import answer_question
 from services.email_service import send_publish_notification_email
 from utils.auth import get_current_user
@@ -33,7 +34,7 @@ async def get_my_portfolio(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    result = await db.execute(select(Portfolio).where(Portfolio.user_id == current_user.id))
+    result = await db.execute(select(Portfolio).options(*LOAD_CONTENT).where(Portfolio.user_id == current_user.id))
     portfolio = result.scalar_one_or_none()
     if not portfolio:
         raise HTTPException(status_code=404, detail="No portfolio found. Please upload a resume first.")
@@ -49,7 +50,7 @@ async def update_my_portfolio(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    result = await db.execute(select(Portfolio).where(Portfolio.user_id == current_user.id))
+    result = await db.execute(select(Portfolio).options(*LOAD_CONTENT).where(Portfolio.user_id == current_user.id))
     portfolio = result.scalar_one_or_none()
     
     if not portfolio:
@@ -80,7 +81,7 @@ async def update_my_portfolio(
             if custom_domain and not re.match(r"^[a-z0-9]+([\-\.]{1}[a-z0-9]+)*\.[a-z]{2,63}$", custom_domain):
                 raise HTTPException(status_code=400, detail="Invalid custom domain format")
             existing_domain = await db.execute(
-                select(Portfolio).where(
+                select(Portfolio.id).where(
                     Portfolio.custom_domain == custom_domain,
                     Portfolio.user_id != current_user.id,
                 )
@@ -100,7 +101,7 @@ async def publish_portfolio(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    result = await db.execute(select(Portfolio).where(Portfolio.user_id == current_user.id))
+    result = await db.execute(select(Portfolio).options(*LOAD_CONTENT).where(Portfolio.user_id == current_user.id))
     portfolio = result.scalar_one_or_none()
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio not found")
@@ -111,7 +112,7 @@ async def publish_portfolio(
     analysis_data = {
         "slug": portfolio.slug,
         "name": portfolio.name if hasattr(portfolio, 'name') else "",
-        "parsed_data": json.loads(portfolio.parsed_data) if portfolio.parsed_data else {},
+        "parsed_data": portfolio.parsed_data or {},
     }
     
     analysis = await analyze_portfolio_spam(analysis_data)
@@ -156,7 +157,7 @@ async def unpublish_portfolio(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    result = await db.execute(select(Portfolio).where(Portfolio.user_id == current_user.id))
+    result = await db.execute(select(Portfolio).options(*LOAD_CONTENT).where(Portfolio.user_id == current_user.id))
     portfolio = result.scalar_one_or_none()
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio not found")
@@ -191,12 +192,7 @@ async def regenerate_field(
     current_user: User = Depends(get_current_user),
 ):
     """Use Groq AI to rewrite/improve a specific portfolio field."""
-    await rate_limiter.enforce(
-        key=f"portfolio_regenerate:{current_user.id}:{request.client.host if request.client else 'unknown'}",
-        limit=20,
-        window_seconds=300,
-        message="Too many AI regenerate requests. Please wait a few minutes.",
-    )
+    await rate_limiter.enforce(request, "portfolio_regenerate", current_user.id)
     allowed_fields = {"summary", "tagline", "bio", "project_description", "experience_description"}
     if req.field not in allowed_fields:
         raise HTTPException(status_code=400, detail=f"Field must be one of: {allowed_fields}")
@@ -217,56 +213,87 @@ async def _optional_admin_user(request: Request, db: AsyncSession = Depends(get_
     return None
 
 
-@router.get("/public/{slug}")
-async def get_public_portfolio(
-    slug: str,
-    request: Request,
-    db: AsyncSession = Depends(get_db),
-    admin_user: User | None = Depends(_optional_admin_user),
-):
-    query = select(Portfolio).options(joinedload(Portfolio.user)).where(Portfolio.slug == slug)
-    if not admin_user:
-        query = query.where(Portfolio.is_published == True)
-
-    result = await db.execute(query)
-    portfolio = result.scalar_one_or_none()
-    if not portfolio:
-        detail = "Portfolio not found" if admin_user else "Portfolio not found or not published"
-        raise HTTPException(status_code=404, detail=detail)
-
-    if not admin_user:
-        portfolio.view_count = (portfolio.view_count or 0) + 1
-
-        referrer = request.headers.get("referer", "direct")
-        user_agent = request.headers.get("user-agent", "")
-        forwarded = request.headers.get("x-forwarded-for", "")
-        ip_address = forwarded.split(",")[0].strip() if forwarded else request.client.host if request.client else None
-        visitor_type, intent_score = classify_visitor(user_agent, referrer)
-        page_view = PageView(
-            portfolio_id=portfolio.id,
-            referrer=referrer,
-            user_agent=user_agent,
-            ip_address=ip_address,
-            visitor_type=visitor_type,
-            intent_score=intent_score,
-        )
-        db.add(page_view)
+def _record_view(request: Request, portfolio_id: str) -> None:
+    """Queue a public page view; the view buffer writes it and bumps view_count in batches."""
+    referrer = request.headers.get("referer", "direct")
+    user_agent = request.headers.get("user-agent", "")
+    forwarded = request.headers.get("x-forwarded-for", "")
+    ip_address = forwarded.split(",")[0].strip() if forwarded else request.client.host if request.client else None
+    visitor_type, intent_score = classify_visitor(user_agent, referrer)
+    # Enrich once here so analytics can GROUP BY stored columns.
+    view_buffer.record(
+        portfolio_id=portfolio_id,
+        referrer=referrer,
+        user_agent=user_agent,
+        ip_address=ip_address,
+        visitor_type=visitor_type,
+        intent_score=intent_score,
+        device_class=classify_device(user_agent),
+        referrer_source=referrer_source(referrer),
+    )
 
-    await db.commit()
 
-    return {
+def _public_payload(portfolio: Portfolio, include_domain: bool = False) -> dict:
+    payload = {
         "id": portfolio.id,
         "user_id": portfolio.user_id,
         "slug": portfolio.slug,
+    }
+    if include_domain:
+        payload["custom_domain"] = portfolio.custom_domain
+    payload.update({
         "avatar_url": portfolio.user.avatar_url if portfolio.user else None,
-        "parsed_data": json.loads(portfolio.parsed_data),
+        "parsed_data": portfolio.parsed_data or {},
         "theme": portfolio.theme,
         "template_id": portfolio.template_id,
         "mode": portfolio.mode,
         "primary_color": portfolio.primary_color,
-        "view_count": portfolio.view_count,
+        "view_count": portfolio.view_count or 0,
         "hidden_sections": portfolio.hidden_sections or "",
-    }
+    })
+    return payload
+
+
+def _cached_public_response(request: Request, entry: CachedPortfolio) -> Response:
+    """Record the view and serve the cached payload, or a 304 if the client's copy is current."""
+    _record_view(request, entry.portfolio_id)
+    headers = {"ETag": entry.etag, "Cache-Control": "public, max-age=0, must-revalidate"}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    body = entry.render(entry.view_count + view_buffer.pending_for(entry.portfolio_id))
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/public/{slug}")
+async def get_public_portfolio(
+    slug: str,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    admin_user: User | None = Depends(_optional_admin_user),
+):
+    if admin_user:
+        # Admins may preview unpublished portfolios; never cached and never counted.
+        result = await db.execute(
+            select(Portfolio).options(joinedload(Portfolio.user), undefer(Portfolio.parsed_data)).where(Portfolio.slug == slug)
+        )
+        portfolio = result.scalar_one_or_none()
+        if not portfolio:
+            raise HTTPException(status_code=404, detail="Portfolio not found")
+        return _public_payload(portfolio)
+
+    entry = public_portfolio_cache.get("slug", slug)
+    if entry is None:
+        result = await db.execute(
+            select(Portfolio)
+            .options(joinedload(Portfolio.user), undefer(Portfolio.parsed_data))
+            .where(Portfolio.slug == slug, Portfolio.is_published == True)
+        )
+        portfolio = result.scalar_one_or_none()
+        if not portfolio:
+            raise HTTPException(status_code=404, detail="Portfolio not found or not published")
+        entry = public_portfolio_cache.put("slug", slug, _public_payload(portfolio))
+
+    return _cached_public_response(request, entry)
 
 
 @router.post("/public/{slug}/ask")
@@ -281,15 +308,15 @@ async def ask_portfolio_copilot(
 
     result = await db.execute(
         select(Portfolio)
-        .options(joinedload(Portfolio.user))
+        .options(joinedload(Portfolio.user), *LOAD_CONTENT)
         .where(Portfolio.slug == slug, Portfolio.is_published == True)
     )
     portfolio = result.scalar_one_or_none()
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio not found")
 
-    parsed_data = json.loads(portfolio.parsed_data) if portfolio.parsed_data else {}
-    career_graph = json.loads(portfolio.career_graph) if portfolio.career_graph else {}
+    parsed_data = portfolio.parsed_data or {}
+    career_graph = portfolio.career_graph or {}
 
     try:
         answer = await answer_question(req.question, parsed_data, career_graph)
@@ -300,48 +327,19 @@ async def ask_portfolio_copilot(
 
 @router.get("/domain/{domain}")
 async def get_portfolio_by_domain(domain: str, request: Request, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(Portfolio)
-        .options(joinedload(Portfolio.user))
-        .where(Portfolio.custom_domain == domain, Portfolio.is_published == True)
-    )
-    portfolio = result.scalar_one_or_none()
-    if not portfolio:
-        raise HTTPException(status_code=404, detail="Portfolio not found or not published on this domain")
-
-    portfolio.view_count = (portfolio.view_count or 0) + 1
-
-    # Track individual page view for analytics
-    referrer = request.headers.get("referer", "direct")
-    user_agent = request.headers.get("user-agent", "")
-    forwarded = request.headers.get("x-forwarded-for", "")
-    ip_address = forwarded.split(",")[0].strip() if forwarded else request.client.host if request.client else None
-    visitor_type, intent_score = classify_visitor(user_agent, referrer)
-    page_view = PageView(
-        portfolio_id=portfolio.id,
-        referrer=referrer,
-        user_agent=user_agent,
-        ip_address=ip_address,
-        visitor_type=visitor_type,
-        intent_score=intent_score,
-    )
-    db.add(page_view)
-    await db.commit()
+    entry = public_portfolio_cache.get("domain", domain)
+    if entry is None:
+        result = await db.execute(
+            select(Portfolio)
+            .options(joinedload(Portfolio.user), undefer(Portfolio.parsed_data))
+            .where(Portfolio.custom_domain == domain, Portfolio.is_published == True)
+        )
+        portfolio = result.scalar_one_or_none()
+        if not portfolio:
+            raise HTTPException(status_code=404, detail="Portfolio not found or not published on this domain")
+        entry = public_portfolio_cache.put("domain", domain, _public_payload(portfolio, include_domain=True))
 
-    return {
-        "id": portfolio.id,
-        "user_id": portfolio.user_id,
-        "slug": portfolio.slug,
-        "custom_domain": portfolio.custom_domain,
-        "avatar_url": portfolio.user.avatar_url if portfolio.user else None,
-        "parsed_data": json.loads(portfolio.parsed_data),
-        "theme": portfolio.theme,
-        "template_id": portfolio.template_id,
-        "mode": portfolio.mode,
-        "primary_color": portfolio.primary_color,
-        "view_count": portfolio.view_count,
-        "hidden_sections": portfolio.hidden_sections or "",
-    }
+    return _cached_public_response(request, entry)
 
 
 @router.get("/preview")
@@ -349,7 +347,7 @@ async def preview_portfolio(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    result = await db.execute(select(Portfolio).where(Portfolio.user_id == current_user.id))
+    result = await db.execute(select(Portfolio).options(undefer(Portfolio.parsed_data)).where(Portfolio.user_id == current_user.id))
     portfolio = result.scalar_one_or_none()
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio not found")
@@ -357,7 +355,7 @@ async def preview_portfolio(
     return {
         "id": portfolio.id,
         "slug": portfolio.slug,
-        "parsed_data": json.loads(portfolio.parsed_data),
+        "parsed_data": portfolio.parsed_data or {},
         "theme": portfolio.theme,
         "primary_color": portfolio.primary_color,
         "is_published": portfolio.is_published,
@@ -372,15 +370,12 @@ async def get_career_graph(
     current_user: User = Depends(get_current_user),
 ):
     """Return the AI Career Knowledge Graph for the current user's portfolio."""
-    result = await db.execute(select(Portfolio).where(Portfolio.user_id == current_user.id))
+    result = await db.execute(select(Portfolio).options(undefer(Portfolio.career_graph)).where(Portfolio.user_id == current_user.id))
     portfolio = result.scalar_one_or_none()
     if not portfolio or not portfolio.career_graph:
         raise HTTPException(status_code=404, detail="Career graph not found. Upload a resume first.")
 
-    try:
-        return json.loads(portfolio.career_graph)
-    except json.JSONDecodeError:
-        raise HTTPException(status_code=500, detail="Career graph data is corrupted.")
+    return portfolio.career_graph
 
 
 @router.get("/check-slug")
@@ -395,9 +390,9 @@ async def check_slug_availability(
         return {"available": False, "reason": "Use only lowercase letters, numbers, and hyphens (3-40 chars)"}
     
     # Check if taken by someone else
-    result = await db.execute(select(Portfolio).where(Portfolio.slug == slug))
-    existing = result.scalar_one_or_none()
-    if existing and existing.user_id != current_user.id:
+    result = await db.execute(select(Portfolio.user_id).where(Portfolio.slug == slug))
+    owner_id = result.scalar_one_or_none()
+    if owner_id and owner_id != current_user.id:
         return {"available": False, "reason": "This URL is already taken"}
     return {"available": True}
 
@@ -415,9 +410,9 @@ async def update_portfolio_slug(
         raise HTTPException(status_code=400, detail="Slug must be 3-40 chars: lowercase letters, numbers, hyphens only")
     
     # Check uniqueness
-    result = await db.execute(select(Portfolio).where(Portfolio.slug == slug))
-    existing = result.scalar_one_or_none()
-    if existing and existing.user_id != current_user.id:
+    result = await db.execute(select(Portfolio.user_id).where(Portfolio.slug == slug))
+    owner_id = result.scalar_one_or_none()
+    if owner_id and owner_id != current_user.id:
         raise HTTPException(status_code=409, detail="This URL is already taken. Please choose another.")
     
     # Update user's portfolio
@@ -427,11 +422,48 @@ async def update_portfolio_slug(
         raise HTTPException(status_code=404, detail="Portfolio not found")
     
     portfolio.slug = slug
+    await index_portfolio(db, portfolio)
     await db.commit()
     await db.refresh(portfolio)
+    public_portfolio_cache.invalidate(portfolio.id)
     return {"slug": portfolio.slug, "message": "Portfolio URL updated successfully!"}
 
 
+@router.get("/me/versions")
+async def list_my_versions(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Saved versions of the portfolio content (taken before each resume upload), newest first."""
+    result = await db.execute(select(Portfolio.id).where(Portfolio.user_id == current_user.id))
+    portfolio_id = result.scalar_one_or_none()
+    if not portfolio_id:
+        raise HTTPException(status_code=404, detail="Portfolio not found")
+    return {"versions": await list_versions(db, portfolio_id)}
+
+
+@router.post("/me/versions/{version}/restore", response_model=PortfolioOut)
+async def restore_my_version(
+    version: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Restore a saved version. The current content is saved as a new version first, so this can be undone."""
+    result = await db.execute(select(Portfolio).options(*LOAD_CONTENT).where(Portfolio.user_id == current_user.id))
+    portfolio = result.scalar_one_or_none()
+    if not portfolio:
+        raise HTTPException(status_code=404, detail="Portfolio not found")
+
+    parsed_data = await load_version(db, portfolio.id, version)
+    if parsed_data is None:
+        raise HTTPException(status_code=404, detail="Version not found")
+
+    await record_version(db, portfolio.id, portfolio.parsed_data or {})
+    portfolio = await update_portfolio(db, portfolio, {"parsed_data": parsed_data})
+    setattr(portfolio, 'avatar_url', current_user.avatar_url)
+    return portfolio
+
+
 @router.get("/me/analytics")
 async def get_portfolio_analytics(
     db: AsyncSession = Depends(get_db),
@@ -443,82 +475,10 @@ async def get_portfolio_analytics(
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio not found")
 
-    # --- 7-day view counts ---
-    seven_days_ago = datetime.now(timezone.utc) - timedelta(days=7) # Note: simplified for now, should use UTC
-    views_query = await db.execute(
-        select(
-            func.date(PageView.viewed_at).label("day"),
-            func.count(PageView.id).label("count")
-        )
-        .where(PageView.portfolio_id == portfolio.id, PageView.viewed_at >= seven_days_ago)
-        .group_by(func.date(PageView.viewed_at))
-        .order_by(func.date(PageView.viewed_at))
-    )
-    daily_views = [{"date": str(row.day), "views": row.count} for row in views_query]
-
-    # Fill missing days with 0
-    all_days = []
-    for i in range(7):
-        day = (datetime.now(timezone.utc) - timedelta(days=6-i)).strftime("%Y-%m-%d")
-        found = next((d for d in daily_views if d["date"] == day), None)
-        all_days.append({"date": day, "views": found["views"] if found else 0})
-
-    # --- Total views ---
-    total_views = await db.execute(
-        select(func.count(PageView.id)).where(PageView.portfolio_id == portfolio.id)
-    )
-    total = total_views.scalar() or 0
-
-    # --- Referrer breakdown ---
-    ref_query = await db.execute(
-        select(PageView.referrer, func.count(PageView.id).label("count"))
-        .where(PageView.portfolio_id == portfolio.id, PageView.viewed_at >= seven_days_ago)
-        .group_by(PageView.referrer)
-        .order_by(func.count(PageView.id).desc())
-        .limit(10)
-    )
-    referrers = []
-    for row in ref_query:
-        ref = row.referrer or "direct"
-        # Clean up referrer to domain
-        if "linkedin" in ref.lower():
-            ref = "LinkedIn"
-        elif "twitter" in ref.lower() or "x.com" in ref.lower():
-            ref = "Twitter/X"
-        elif "github" in ref.lower():
-            ref = "GitHub"
-        elif "google" in ref.lower():
-            ref = "Google"
-        elif ref == "direct" or not ref:
-            ref = "Direct"
-        else:
-            try:
-                from urllib.parse import urlparse
-                ref = urlparse(ref).netloc or "Other"
-            except Exception:
-                ref = "Other"
-        referrers.append({"source": ref, "count": row.count})
-
-    # --- Device breakdown (basic mobile vs desktop from user-agent) ---
-    ua_query = await db.execute(
-        select(PageView.user_agent)
-        .where(PageView.portfolio_id == portfolio.id, PageView.viewed_at >= seven_days_ago)
-    )
-    mobile = 0
-    desktop = 0
-    for row in ua_query:
-        ua = (row.user_agent or "").lower()
-        if any(kw in ua for kw in ["mobile", "android", "iphone", "ipad"]):
-            mobile += 1
-        else:
-            desktop += 1
-
+    analytics = await get_basic_analytics(portfolio.id, db)
     return {
-        "total_views": total,
+        **analytics,
         "view_count": portfolio.view_count or 0,
-        "daily_views": all_days,
-        "referrers": referrers,
-        "devices": {"mobile": mobile, "desktop": desktop},
         "slug": portfolio.slug,
         "is_published": portfolio.is_published,
     }
@@ -6,28 +6,54 @@ from database import get_db
 from models.user import User
 from models.portfolio import Portfolio
 from services.recruiter_service import search_talent
+from services.search_index import index_portfolio
 from utils.auth import get_current_user
+from utils.pagination import decode_cursor, encode_cursor
 
 router = APIRouter(prefix="/recruiter", tags=["Recruiter Mode"])
 
 
+def _split(value: str) -> list[str]:
+    return [part.strip() for part in value.split(",") if part.strip()] if value else []
+
+
 @router.get("/search")
 async def search_talent_endpoint(
     query: str = Query("", description="Free-text search across profiles"),
     skills: str = Query("", description="Comma-separated skills filter"),
+    skills_mode: str = Query("all", pattern="^(all|any)$", description="Require all listed skills or any of them"),
     role: str = Query("", description="Job role filter"),
+    industry: str = Query("", description="Comma-separated industries (any)"),
+    career_level: str = Query("", description="Comma-separated career levels (any)"),
     limit: int = Query(20, ge=1, le=50),
-    offset: int = Query(0, ge=0),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
     db: AsyncSession = Depends(get_db),
 ):
-    """Search published portfolios visible to recruiters. Public endpoint."""
-    skill_list = [s.strip() for s in skills.split(",") if s.strip()] if skills else []
-    profiles, total = await search_talent(db, query, skill_list, role, limit, offset)
+    """Search published portfolios visible to recruiters. Public endpoint.
+
+    Keyset paginated: follow `next_cursor` until it is null. `total` and
+    `facets` are only returned on the first page.
+    """
+    try:
+        profiles, next_key, total, facets = await search_talent(
+            db,
+            query,
+            _split(skills),
+            role,
+            limit,
+            decode_cursor(cursor, 2),
+            skills_mode=skills_mode,
+            industries=_split(industry),
+            career_levels=_split(career_level),
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     return {
         "profiles": profiles,
         "total": total,
         "limit": limit,
-        "offset": offset,
+        "next_cursor": encode_cursor(next_key),
+        "facets": facets,
     }
 
 
@@ -37,11 +63,11 @@ async def get_recruiter_visibility(
     current_user: User = Depends(get_current_user),
 ):
     """Check if current user's portfolio is visible to recruiters."""
-    result = await db.execute(select(Portfolio).where(Portfolio.user_id == current_user.id))
-    portfolio = result.scalar_one_or_none()
-    if not portfolio:
+    result = await db.execute(select(Portfolio.visible_to_recruiters).where(Portfolio.user_id == current_user.id))
+    visible = result.one_or_none()
+    if visible is None:
         raise HTTPException(status_code=404, detail="Portfolio not found")
-    return {"visible_to_recruiters": portfolio.visible_to_recruiters}
+    return {"visible_to_recruiters": visible[0]}
 
 
 @router.post("/visibility")
@@ -55,6 +81,7 @@ async def toggle_recruiter_visibility(
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio not found")
     portfolio.visible_to_recruiters = not portfolio.visible_to_recruiters
+    await index_portfolio(db, portfolio)
     await db.commit()
     return {
         "visible_to_recruiters": portfolio.visible_to_recruiters,
@@ -1,15 +1,16 @@
-import json
 from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
 from database import get_db
 from models.user import User
-from models.portfolio import Portfolio
+from models.portfolio import LOAD_CONTENT, Portfolio
 from services.video_service import generate_video_script
 from utils.auth import get_current_user
+from utils.json_codec import dumps, loads
 
 router = APIRouter(prefix="/video", tags=["Video Portfolio"])
 
@@ -40,20 +41,20 @@ async def create_video_script(
     if req.tone not in TONES:
         raise HTTPException(status_code=400, detail=f"Tone must be one of {TONES}")
 
-    result = await db.execute(select(Portfolio).where(Portfolio.user_id == current_user.id))
+    result = await db.execute(select(Portfolio).options(*LOAD_CONTENT, undefer(Portfolio.video_scripts)).where(Portfolio.user_id == current_user.id))
     portfolio = result.scalar_one_or_none()
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio not found")
 
-    parsed_data = json.loads(portfolio.parsed_data) if portfolio.parsed_data else {}
-    career_graph = json.loads(portfolio.career_graph) if portfolio.career_graph else {}
+    parsed_data = portfolio.parsed_data or {}
+    career_graph = portfolio.career_graph or {}
 
     script = await generate_video_script(req.duration_seconds, req.tone, parsed_data, career_graph)
     if "error" in script:
         raise HTTPException(status_code=502, detail=script["error"])
 
     # Save to portfolio
-    scripts = json.loads(portfolio.video_scripts) if portfolio.video_scripts else []
+    scripts = loads(portfolio.video_scripts) if portfolio.video_scripts else []
     entry = {
         "id": str(len(scripts) + 1),
         "created_at": str(datetime.now(timezone.utc)),
@@ -62,7 +63,7 @@ async def create_video_script(
         "script": script,
     }
     scripts.append(entry)
-    portfolio.video_scripts = json.dumps(scripts)
+    portfolio.video_scripts = dumps(scripts)
     await db.commit()
 
     return entry
@@ -74,10 +75,10 @@ async def get_saved_scripts(
     current_user: User = Depends(get_current_user),
 ):
     """List all saved video scripts."""
-    result = await db.execute(select(Portfolio).where(Portfolio.user_id == current_user.id))
+    result = await db.execute(select(Portfolio).options(undefer(Portfolio.video_scripts)).where(Portfolio.user_id == current_user.id))
     portfolio = result.scalar_one_or_none()
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio not found")
 
-    scripts = json.loads(portfolio.video_scripts) if portfolio.video_scripts else []
+    scripts = loads(portfolio.video_scripts) if portfolio.video_scripts else []
     return {"scripts": scripts}
@@ -66,7 +66,7 @@ class PortfolioOut(BaseModel):
     slug: str
     custom_domain: Optional[str]
     avatar_url: Optional[str] = None
-    parsed_data: str  # JSON string
+    parsed_data: dict
     theme: str
     template_id: str
     mode: str
@@ -79,7 +79,7 @@ class PortfolioOut(BaseModel):
     resume_object_key: Optional[str] = None
     view_count: int = 0
     hidden_sections: str = ""
-    career_graph: Optional[str] = None  # JSON string
+    career_graph: Optional[dict] = None
     created_at: datetime
     updated_at: datetime
 
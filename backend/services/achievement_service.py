@@ -1,9 +1,6 @@
-import json
-from groq import AsyncGroq
 from loguru import logger
-from config import get_settings
-
-settings = get_settings()
+from services.llm_client import get_groq_client
+from utils.json_codec import dumps, loads
 
 ACHIEVEMENT_PROMPT = """You are a resume achievement analyst. Your job is to take vague experience or project descriptions and suggest metric-enriched versions that better communicate impact.
 
@@ -64,14 +61,14 @@ async def discover_achievements(
         "items": items_to_analyze,
     }
 
-    client = AsyncGroq(api_key=settings.groq_api_key)
+    client = get_groq_client()
 
     try:
         completion = await client.chat.completions.create(
             model="llama-3.3-70b-versatile",
             messages=[
                 {"role": "system", "content": ACHIEVEMENT_PROMPT},
-                {"role": "user", "content": json.dumps(context, indent=2)},
+                {"role": "user", "content": dumps(context, indent=True)},
             ],
             temperature=0.4,
             max_tokens=2048,
@@ -84,7 +81,7 @@ async def discover_achievements(
                 raw = raw[4:]
             raw = raw.strip()
 
-        results = json.loads(raw)
+        results = loads(raw)
         if isinstance(results, list):
             return results
         return []
@@ -1,10 +1,14 @@
+from collections import Counter, defaultdict
 from urllib.parse import urlparse
-from datetime import datetime, timezone, timedelta
+from datetime import date, datetime, timezone, timedelta
+from typing import Iterable
 
-from sqlalchemy import func, select
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.page_view import PageView
+from models.page_view_daily import PageViewDaily
 
 
 RECRUITER_REFERRERS = [
@@ -108,6 +112,10 @@ def is_mobile(user_agent: str | None) -> bool:
     return any(kw in ua for kw in ["mobile", "android", "iphone", "ipad", "ipod"])
 
 
+def classify_device(user_agent: str | None) -> str:
+    return "mobile" if is_mobile(user_agent) else "desktop"
+
+
 def clean_referrer(referrer: str | None) -> str:
     ref = (referrer or "").lower()
     if not ref or ref == "direct":
@@ -139,140 +147,251 @@ def clean_referrer(referrer: str | None) -> str:
         return "Other"
 
 
-async def get_enhanced_analytics(portfolio_id: str, db: AsyncSession) -> dict:
-    """Get enhanced analytics with visitor segments, intent scoring, and trends."""
-    now = datetime.now(timezone.utc)
-    seven_days_ago = now - timedelta(days=7)
-    thirty_days_ago = now - timedelta(days=30)
+def referrer_source(referrer: str | None) -> str:
+    """clean_referrer() label, truncated for storage in an indexed column."""
+    return clean_referrer(referrer)[:100]
 
-    # --- Total views (all time) ---
-    total = await db.scalar(
-        select(func.count(PageView.id)).where(PageView.portfolio_id == portfolio_id)
-    )
 
-    # --- Views trend (30 days) ---
-    views_30d = await db.execute(
-        select(
-            func.date(PageView.viewed_at).label("day"),
-            func.count(PageView.id).label("count"),
-        )
-        .where(PageView.portfolio_id == portfolio_id, PageView.viewed_at >= thirty_days_ago)
-        .group_by(func.date(PageView.viewed_at))
-        .order_by(func.date(PageView.viewed_at))
-    )
-    views_by_day_30d = {str(row.day): row.count for row in views_30d}
+def intent_bucket(score: int | None) -> str:
+    score = score or 0
+    if score >= 70:
+        return "high"
+    if score >= 40:
+        return "medium"
+    if score > 0:
+        return "low"
+    return "none"
 
-    # Fill missing days
-    daily_views_30d = []
-    for i in range(30):
-        day = (now - timedelta(days=29 - i)).strftime("%Y-%m-%d")
-        daily_views_30d.append({"date": day, "views": views_by_day_30d.get(day, 0)})
 
-    # 7-day (for backward compat and short view)
-    daily_views_7d = daily_views_30d[-7:]
+RollupKey = tuple[str, date, str, str, str, str]
 
-    # --- Visitor segments (30 days) ---
-    segments_raw = await db.execute(
-        select(
-            PageView.visitor_type,
-            func.count(PageView.id).label("count"),
-        )
-        .where(PageView.portfolio_id == portfolio_id, PageView.viewed_at >= thirty_days_ago)
-        .group_by(PageView.visitor_type)
-        .order_by(func.count(PageView.id).desc())
-    )
-    segments = [{"type": row.visitor_type or "unknown", "count": row.count} for row in segments_raw]
 
-    # --- Intent distribution ---
-    intent_raw = await db.execute(
-        select(
-            PageView.intent_score,
-            func.count(PageView.id).label("count"),
-        )
-        .where(PageView.portfolio_id == portfolio_id, PageView.viewed_at >= thirty_days_ago)
-        .group_by(PageView.intent_score)
-    )
-    total_scored = 0
-    weighted_sum = 0
-    for row in intent_raw:
-        cnt = row.count
-        total_scored += cnt
-        weighted_sum += (row.intent_score or 0) * cnt
-    avg_intent = round(weighted_sum / total_scored, 1) if total_scored > 0 else 0
-
-    # Intent buckets
-    high_intent = await db.scalar(
-        select(func.count(PageView.id))
-        .where(
-            PageView.portfolio_id == portfolio_id,
-            PageView.viewed_at >= thirty_days_ago,
-            PageView.intent_score >= 70,
+def _utc_day(viewed_at: datetime) -> date:
+    # SQLite hands back naive datetimes; every stored timestamp is UTC.
+    if viewed_at.tzinfo is not None:
+        viewed_at = viewed_at.astimezone(timezone.utc)
+    return viewed_at.date()
+
+
+def aggregate_rollup(views: Iterable[dict]) -> dict[RollupKey, list[int]]:
+    """Fold raw page-view dicts into {rollup key: [views, intent_sum]}."""
+    totals: dict[RollupKey, list[int]] = defaultdict(lambda: [0, 0])
+    for view in views:
+        key = (
+            view["portfolio_id"],
+            _utc_day(view["viewed_at"]),
+            view.get("visitor_type") or "unknown",
+            view.get("device_class") or classify_device(view.get("user_agent")),
+            view.get("referrer_source") or referrer_source(view.get("referrer")),
+            intent_bucket(view.get("intent_score")),
         )
+        totals[key][0] += 1
+        totals[key][1] += view.get("intent_score") or 0
+    return totals
+
+
+async def apply_rollup(db: AsyncSession, views: Iterable[dict]) -> None:
+    """Add raw page views to `page_view_daily` with an upsert per rollup key (caller commits)."""
+    totals = aggregate_rollup(views)
+    if not totals:
+        return
+    dialect = db.get_bind().dialect.name
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    rows = [
+        {
+            "portfolio_id": portfolio_id,
+            "day": day,
+            "segment": segment,
+            "device": device,
+            "referrer_source": source,
+            "intent_bucket": bucket,
+            "views": count,
+            "intent_sum": intent_sum,
+        }
+        for (portfolio_id, day, segment, device, source, bucket), (count, intent_sum) in totals.items()
+    ]
+    stmt = insert(PageViewDaily)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[c.name for c in PageViewDaily.__table__.primary_key.columns],
+        set_={
+            "views": PageViewDaily.views + stmt.excluded.views,
+            "intent_sum": PageViewDaily.intent_sum + stmt.excluded.intent_sum,
+        },
     )
-    medium_intent = await db.scalar(
-        select(func.count(PageView.id))
-        .where(
-            PageView.portfolio_id == portfolio_id,
-            PageView.viewed_at >= thirty_days_ago,
-            PageView.intent_score >= 40,
-            PageView.intent_score < 70,
-        )
-    )
-    low_intent = await db.scalar(
-        select(func.count(PageView.id))
-        .where(
-            PageView.portfolio_id == portfolio_id,
-            PageView.viewed_at >= thirty_days_ago,
-            PageView.intent_score < 40,
-            PageView.intent_score > 0,
+    # One cached statement executed per parameter set (executemany), not a freshly compiled multi-VALUES.
+    await db.execute(stmt, rows)
+
+
+async def rebuild_rollup(db: AsyncSession, portfolio_id: str | None = None, batch_size: int = 5000) -> int:
+    """Recompute `page_view_daily` from raw `page_views`. Returns the number of views rolled up."""
+    delete_stmt = delete(PageViewDaily)
+    query = select(
+        PageView.portfolio_id,
+        PageView.viewed_at,
+        PageView.referrer,
+        PageView.user_agent,
+        PageView.visitor_type,
+        PageView.intent_score,
+        PageView.device_class,
+        PageView.referrer_source,
+    ).execution_options(yield_per=batch_size)
+    if portfolio_id:
+        delete_stmt = delete_stmt.where(PageViewDaily.portfolio_id == portfolio_id)
+        query = query.where(PageView.portfolio_id == portfolio_id)
+
+    await db.execute(delete_stmt)
+    total = 0
+    batch: list[dict] = []
+    stream = await db.stream(query)
+    async for row in stream:
+        batch.append(row._asdict())
+        if len(batch) >= batch_size:
+            await apply_rollup(db, batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        await apply_rollup(db, batch)
+        total += len(batch)
+    await db.commit()
+    return total
+
+
+async def backfill_view_columns(db: AsyncSession, batch_size: int = 5000) -> int:
+    """Fill `device_class` / `referrer_source` on page views recorded before ingest-time enrichment."""
+    total = 0
+    while True:
+        rows = (await db.execute(
+            select(PageView.id, PageView.referrer, PageView.user_agent)
+            .where(or_(PageView.device_class.is_(None), PageView.referrer_source.is_(None)))
+            .limit(batch_size)
+        )).all()
+        if not rows:
+            return total
+        await db.execute(
+            update(PageView),
+            [
+                {
+                    "id": row.id,
+                    "device_class": classify_device(row.user_agent),
+                    "referrer_source": referrer_source(row.referrer),
+                }
+                for row in rows
+            ],
         )
+        await db.commit()
+        total += len(rows)
+
+
+def _fill_days(by_day: dict[str, int], days: int, today: date) -> list[dict]:
+    filled = []
+    for i in range(days):
+        day = (today - timedelta(days=days - 1 - i)).isoformat()
+        filled.append({"date": day, "views": by_day.get(day, 0)})
+    return filled
+
+
+class _RollupWindow:
+    """Every breakdown the dashboards need, folded from one scan of the rollup window."""
+
+    def __init__(self) -> None:
+        self.by_day: Counter[str] = Counter()
+        self.segments: Counter[str] = Counter()
+        self.devices: Counter[str] = Counter()
+        self.referrers: Counter[str] = Counter()
+        self.intent: Counter[str] = Counter()
+        self.views = 0
+        self.intent_sum = 0
+
+    def add(self, day: date, segment: str, device: str, source: str, bucket: str, views: int, intent_sum: int) -> None:
+        self.by_day[str(day)] += views
+        self.segments[segment or "unknown"] += views
+        self.devices[device] += views
+        self.referrers[source] += views
+        self.intent[bucket] += views
+        self.views += views
+        self.intent_sum += intent_sum or 0
+
+
+async def _scan_rollup(db: AsyncSession, portfolio_id: str, since: date) -> _RollupWindow:
+    # Range scan on the (portfolio_id, day, ...) primary key; rows are already unique per key.
+    rows = await db.execute(
+        select(
+            PageViewDaily.day,
+            PageViewDaily.segment,
+            PageViewDaily.device,
+            PageViewDaily.referrer_source,
+            PageViewDaily.intent_bucket,
+            PageViewDaily.views,
+            PageViewDaily.intent_sum,
+        ).where(PageViewDaily.portfolio_id == portfolio_id, PageViewDaily.day >= since)
     )
+    window = _RollupWindow()
+    for row in rows:
+        window.add(*row)
+    return window
 
-    # --- Repeat visitors (by IP) ---
-    repeat_raw = await db.execute(
-        select(
-            PageView.ip_address,
-            func.count(PageView.id).label("count"),
-        )
+
+def _total_views_query(portfolio_id: str):
+    return select(func.coalesce(func.sum(PageViewDaily.views), 0)).where(
+        PageViewDaily.portfolio_id == portfolio_id
+    ).scalar_subquery()
+
+
+def _repeat_visitors_query(portfolio_id: str, since: datetime):
+    # Served by the (portfolio_id, viewed_at) index.
+    repeat_ips = (
+        select(PageView.ip_address)
         .where(
             PageView.portfolio_id == portfolio_id,
-            PageView.viewed_at >= thirty_days_ago,
+            PageView.viewed_at >= since,
             PageView.ip_address.isnot(None),
         )
         .group_by(PageView.ip_address)
         .having(func.count(PageView.id) > 1)
+        .subquery()
     )
-    repeat_visitors = sum(1 for _ in repeat_raw)
+    return select(func.count()).select_from(repeat_ips).scalar_subquery()
 
-    # --- Device breakdown (30 days) ---
-    ua_rows = await db.execute(
-        select(PageView.user_agent)
-        .where(PageView.portfolio_id == portfolio_id, PageView.viewed_at >= thirty_days_ago)
-    )
-    mobile_count = 0
-    desktop_count = 0
-    for row in ua_rows:
-        if is_mobile(row.user_agent):
-            mobile_count += 1
-        else:
-            desktop_count += 1
-
-    # --- Referrer breakdown (30 days) ---
-    ref_query = await db.execute(
-        select(PageView.referrer, func.count(PageView.id).label("count"))
-        .where(PageView.portfolio_id == portfolio_id, PageView.viewed_at >= thirty_days_ago)
-        .group_by(PageView.referrer)
-        .order_by(func.count(PageView.id).desc())
-        .limit(10)
+
+async def get_basic_analytics(portfolio_id: str, db: AsyncSession) -> dict:
+    """7-day views, referrers and devices for the legacy /portfolio/me/analytics endpoint."""
+    today = datetime.now(timezone.utc).date()
+    window = await _scan_rollup(db, portfolio_id, today - timedelta(days=6))
+    total = await db.scalar(select(_total_views_query(portfolio_id)))
+    return {
+        "total_views": total or 0,
+        "daily_views": _fill_days(window.by_day, 7, today),
+        "referrers": [{"source": source, "count": count} for source, count in window.referrers.most_common(10)],
+        "devices": {"mobile": window.devices["mobile"], "desktop": window.devices["desktop"]},
+    }
+
+
+async def get_enhanced_analytics(portfolio_id: str, db: AsyncSession) -> dict:
+    """Get enhanced analytics with visitor segments, intent scoring, and trends.
+
+    Two round trips: one scan of the 30-day `page_view_daily` window (trend,
+    segments, intent, devices, referrers), and one statement that returns the
+    all-time total and the repeat-visitor count together.
+    """
+    now = datetime.now(timezone.utc)
+    today = now.date()
+
+    # --- 30-day breakdowns from the rollup ---
+    window = await _scan_rollup(db, portfolio_id, today - timedelta(days=29))
+    daily_views_30d = _fill_days(window.by_day, 30, today)
+    # 7-day (for backward compat and short view)
+    daily_views_7d = daily_views_30d[-7:]
+    segments = [{"type": segment, "count": count} for segment, count in window.segments.most_common()]
+    avg_intent = round(window.intent_sum / window.views, 1) if window.views > 0 else 0
+
+    # --- Total views (all time) + repeat visitors (by IP, raw rows) ---
+    totals = await db.execute(
+        select(
+            _total_views_query(portfolio_id),
+            _repeat_visitors_query(portfolio_id, now - timedelta(days=30)),
+        )
     )
-    referrers = []
-    for row in ref_query:
-        cleaned = clean_referrer(row.referrer)
-        existing = next((r for r in referrers if r["source"] == cleaned), None)
-        if existing:
-            existing["count"] += row.count
-        else:
-            referrers.append({"source": cleaned, "count": row.count})
+    total, repeat_visitors = totals.one()
 
     return {
         "total_views": total or 0,
@@ -282,12 +401,12 @@ async def get_enhanced_analytics(portfolio_id: str, db: AsyncSession) -> dict:
         "segments_total": sum(s["count"] for s in segments),
         "intent": {
             "average": avg_intent,
-            "high": high_intent or 0,
-            "medium": medium_intent or 0,
-            "low": low_intent or 0,
-            "total_scored": total_scored or 0,
+            "high": window.intent["high"],
+            "medium": window.intent["medium"],
+            "low": window.intent["low"],
+            "total_scored": window.views,
         },
-        "repeat_visitors": repeat_visitors,
-        "devices": {"mobile": mobile_count, "desktop": desktop_count},
-        "referrers": referrers,
+        "repeat_visitors": repeat_visitors or 0,
+        "devices": {"mobile": window.devices["mobile"], "desktop": window.devices["desktop"]},
+        "referrers": [{"source": source, "count": count} for source, count in window.referrers.most_common(10)],
     }
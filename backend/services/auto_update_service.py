@@ -1,4 +1,3 @@
-import json
 import re
 from datetime import datetime, timezone
 from urllib.parse import urlparse
@@ -6,6 +5,8 @@ from urllib.parse import urlparse
 import httpx
 from loguru import logger
 
+from utils.json_codec import clone
+
 
 GITHUB_API = "https://api.github.com"
 MEDIUM_RSS = "https://medium.com/feed/@"
@@ -94,7 +95,7 @@ async def fetch_medium_posts(username: str) -> list[dict]:
 
 def merge_into_parsed_data(parsed_data: dict, repos: list[dict] = None, posts: list[dict] = None) -> dict:
     """Merge fetched repos/posts into portfolio parsed_data."""
-    updated = json.loads(json.dumps(parsed_data))
+    updated = clone(parsed_data)
 
     if repos:
         existing_projects = updated.get("projects", [])
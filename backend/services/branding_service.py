@@ -1,9 +1,7 @@
-import json
-from groq import AsyncGroq
 from loguru import logger
-from config import get_settings
-
-settings = get_settings()
+from services.cache import llm_cache, make_key
+from services.llm_client import get_groq_client
+from utils.json_codec import dumps
 
 BRANDING_PROMPTS = {
     "linkedin_bio": """You are a personal branding expert. Write a compelling LinkedIn 'About' section based on the career data below.
@@ -83,8 +81,12 @@ async def generate_brand_asset(
     parsed_data: dict,
     asset_type: str,
     tone: str = "professional",
+    use_cache: bool = False,
 ) -> str:
-    """Generate a personal brand asset from career data."""
+    """Generate a personal brand asset from career data.
+
+    With `use_cache`, identical (asset, tone, career data) requests are served from the LLM cache.
+    """
     prompt_template = BRANDING_PROMPTS.get(asset_type)
     if not prompt_template:
         raise ValueError(f"Unknown asset type: {asset_type}. Valid: {list(BRANDING_PROMPTS.keys())}")
@@ -98,19 +100,28 @@ async def generate_brand_asset(
 
     system_prompt = f"{prompt_template}\n\nTone: {tone_instruction}"
 
-    client = AsyncGroq(api_key=settings.groq_api_key)
+    cache_key = make_key(asset_type, tone, context)
+    if use_cache:
+        cached = await llm_cache.get("branding", cache_key)
+        if cached is not None:
+            return cached
+
+    client = get_groq_client()
 
     try:
         completion = await client.chat.completions.create(
             model="llama-3.3-70b-versatile",
             messages=[
                 {"role": "system", "content": system_prompt},
-                {"role": "user", "content": f"Generate based on this career data:\n\n{json.dumps(context, indent=2)}"},
+                {"role": "user", "content": f"Generate based on this career data:\n\n{dumps(context, indent=True)}"},
             ],
             temperature=0.7,
             max_tokens=1024,
         )
-        return completion.choices[0].message.content.strip()
+        asset = completion.choices[0].message.content.strip()
+        if use_cache:
+            await llm_cache.set("branding", cache_key, asset)
+        return asset
     except Exception as e:
         logger.error(f"Brand asset generation failed ({asset_type}): {e}")
         raise
@@ -1,45 +1,297 @@
+"""Tiered LLM response cache: in-process LRU -> Redis (optional) -> disk.
+
+Entries are namespaced per prompt type ("resume_parse", "career_graph", ...).
+"""
+import asyncio
 import hashlib
-import json
 import os
+import tempfile
 import time
+from collections import OrderedDict, defaultdict
 from pathlib import Path
+from threading import Lock
+from typing import Any
+
+from loguru import logger
+
+from config import get_settings
+from utils.json_codec import dumps, loads
+
+settings = get_settings()
 
 CACHE_DIR = Path(os.path.dirname(__file__)) / ".." / ".cache"
-CACHE_TTL_SECONDS = 86400 * 7  # 7 days
+CACHE_TTL_SECONDS = settings.cache_ttl_seconds
 
-def _ensure_cache_dir():
-    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+# Scan the disk tier for eviction at most once every N writes.
+_DISK_EVICT_EVERY = 50
+# Before namespaces, resume parses and career graphs were stored flat as
+# CACHE_DIR/<digest>.json with the same digest and file format. Career graphs
+# keep their old make_key(resume_text, "_career_graph") digest, so both adopt.
+_LEGACY_NAMESPACES = {"resume_parse", "career_graph"}
 
-def _cache_key(resume_text: str, tone: str) -> str:
-    raw = f"{resume_text}:::{tone}"
+
+def make_key(*parts: Any) -> str:
+    """Stable SHA-256 key from arbitrary JSON-serialisable parts."""
+    raw = ":::".join(p if isinstance(p, str) else dumps(p, sort_keys=True, default=str) for p in parts)
     return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
-def _cache_path(key: str) -> Path:
-    return CACHE_DIR / f"{key}.json"
 
-def get_cached_parse(resume_text: str, tone: str) -> dict | None:
-    key = _cache_key(resume_text, tone)
-    path = _cache_path(key)
-    if not path.exists():
-        return None
-    try:
-        data = json.loads(path.read_text("utf-8"))
-        if time.time() - data["cached_at"] > CACHE_TTL_SECONDS:
+class MemoryTier:
+    """Thread-safe LRU bounded by entry count and total payload bytes (UTF-8 encoded)."""
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._data: OrderedDict[str, tuple[float, str, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, payload, _ = item
+            if expires_at < time.time():
+                self._remove(key)
+                return None
+            self._data.move_to_end(key)
+            return payload
+
+    def set(self, key: str, payload: str, ttl: int) -> None:
+        size = len(payload.encode("utf-8"))
+        if size > self._max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (time.time() + ttl, payload, size)
+            self._bytes += size
+            while self._data and (len(self._data) > self._max_entries or self._bytes > self._max_bytes):
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+
+class RedisTier:
+    """Best-effort Redis tier shared across workers. Errors degrade to a miss."""
+
+    def __init__(self, redis_url: str, prefix: str = "llmcache") -> None:
+        self._redis_url = redis_url
+        self._prefix = prefix
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            import redis.asyncio as redis  # type: ignore
+
+            self._client = redis.from_url(self._redis_url, decode_responses=True)
+        return self._client
+
+    async def get(self, key: str) -> str | None:
+        try:
+            return await self._get_client().get(f"{self._prefix}:{key}")
+        except Exception as e:
+            logger.warning(f"Redis cache get failed: {e}")
+            return None
+
+    async def set(self, key: str, payload: str, ttl: int) -> None:
+        try:
+            await self._get_client().set(f"{self._prefix}:{key}", payload, ex=ttl)
+        except Exception as e:
+            logger.warning(f"Redis cache set failed: {e}")
+
+
+class DiskTier:
+    """One JSON file per entry under CACHE_DIR/<namespace>/, with size-based eviction.
+
+    Files from the old flat layout are moved into their namespace when first
+    read, and count toward (and are evicted under) the byte budget until then.
+    """
+
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        self._root = root
+        self._max_bytes = max_bytes
+        self._writes = 0
+
+    def _path(self, key: str) -> Path:
+        namespace, _, digest = key.partition(":")
+        return self._root / namespace / f"{digest}.json"
+
+    def _adopt_legacy(self, key: str, path: Path) -> bool:
+        namespace, _, digest = key.partition(":")
+        if namespace not in _LEGACY_NAMESPACES:
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.replace(self._root / f"{digest}.json", path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def _read(self, key: str, ttl: int) -> str | None:
+        path = self._path(key)
+        if not path.exists() and not self._adopt_legacy(key, path):
+            return None
+        try:
+            data = loads(path.read_bytes())
+            if time.time() - data["cached_at"] > ttl:
+                path.unlink(missing_ok=True)
+                return None
+            return dumps(data["result"])
+        except Exception:
             path.unlink(missing_ok=True)
             return None
-        return data["result"]
-    except Exception:
-        path.unlink(missing_ok=True)
-        return None
 
-def set_cached_parse(resume_text: str, tone: str, result: dict):
-    _ensure_cache_dir()
-    key = _cache_key(resume_text, tone)
-    path = _cache_path(key)
-    try:
-        path.write_text(
-            json.dumps({"cached_at": time.time(), "result": result}, ensure_ascii=False),
-            encoding="utf-8",
+    def _write(self, key: str, payload: str) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # A unique temp file per writer: concurrent writes of one key each
+        # replace the entry atomically instead of racing on a shared temp path.
+        with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as tmp:
+            tmp.write(f'{{"cached_at": {time.time()}, "result": {payload}}}'.encode("utf-8"))
+        try:
+            os.replace(tmp.name, path)
+        except OSError:
+            os.unlink(tmp.name)
+            raise
+
+    def evict(self) -> int:
+        """Delete least-recently-written files until the tier is under 90% of its byte budget."""
+        files = []
+        total = 0
+        for path in [*self._root.glob("*.json"), *self._root.glob("*/*.json")]:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        if total <= self._max_bytes:
+            return 0
+
+        removed = 0
+        target = int(self._max_bytes * 0.9)
+        for _, size, path in sorted(files):
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    async def get(self, key: str, ttl: int) -> str | None:
+        return await asyncio.to_thread(self._read, key, ttl)
+
+    async def set(self, key: str, payload: str) -> None:
+        try:
+            await asyncio.to_thread(self._write, key, payload)
+        except Exception as e:
+            logger.warning(f"Disk cache write failed: {e}")
+            return
+        self._writes += 1
+        if self._writes % _DISK_EVICT_EVERY == 0:
+            removed = await asyncio.to_thread(self.evict)
+            if removed:
+                logger.info(f"Disk cache evicted {removed} entries")
+
+
+class TieredCache:
+    """Read-through across memory -> Redis -> disk, promoting hits into faster tiers."""
+
+    def __init__(
+        self,
+        memory: MemoryTier,
+        redis: RedisTier | None,
+        disk: DiskTier | None,
+        ttl: int = CACHE_TTL_SECONDS,
+    ) -> None:
+        self.memory = memory
+        self.redis = redis
+        self.disk = disk
+        self.ttl = ttl
+        self._stats: dict[str, dict[str, int]] = defaultdict(
+            lambda: {"memory_hits": 0, "redis_hits": 0, "disk_hits": 0, "misses": 0, "sets": 0}
         )
-    except Exception:
-        pass
+
+    async def get(self, namespace: str, key: str) -> Any | None:
+        full_key = f"{namespace}:{key}"
+        stats = self._stats[namespace]
+
+        payload = self.memory.get(full_key)
+        if payload is not None:
+            stats["memory_hits"] += 1
+            return loads(payload)
+
+        if self.redis is not None:
+            payload = await self.redis.get(full_key)
+            if payload is not None:
+                stats["redis_hits"] += 1
+                self.memory.set(full_key, payload, self.ttl)
+                return loads(payload)
+
+        if self.disk is not None:
+            payload = await self.disk.get(full_key, self.ttl)
+            if payload is not None:
+                stats["disk_hits"] += 1
+                self.memory.set(full_key, payload, self.ttl)
+                if self.redis is not None:
+                    await self.redis.set(full_key, payload, self.ttl)
+                return loads(payload)
+
+        stats["misses"] += 1
+        return None
+
+    async def set(self, namespace: str, key: str, value: Any) -> None:
+        full_key = f"{namespace}:{key}"
+        try:
+            payload = dumps(value)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Refusing to cache non-JSON value in '{namespace}': {e}")
+            return
+
+        self._stats[namespace]["sets"] += 1
+        self.memory.set(full_key, payload, self.ttl)
+        if self.redis is not None:
+            await self.redis.set(full_key, payload, self.ttl)
+        if self.disk is not None:
+            await self.disk.set(full_key, payload)
+
+    def stats(self) -> dict:
+        return {
+            "memory_entries": len(self.memory),
+            "memory_bytes": self.memory.size_bytes,
+            "redis_enabled": self.redis is not None,
+            "disk_enabled": self.disk is not None,
+            "namespaces": {ns: dict(counts) for ns, counts in self._stats.items()},
+        }
+
+
+llm_cache = TieredCache(
+    memory=MemoryTier(settings.cache_memory_max_entries, settings.cache_memory_max_bytes),
+    redis=RedisTier(settings.redis_url) if settings.redis_url else None,
+    disk=DiskTier(CACHE_DIR, settings.cache_disk_max_bytes) if settings.cache_disk_max_bytes > 0 else None,
+)
+
+
+async def get_cached_parse(resume_text: str, tone: str) -> dict | None:
+    return await llm_cache.get("resume_parse", make_key(resume_text, tone))
+
+
+async def set_cached_parse(resume_text: str, tone: str, result: dict):
+    await llm_cache.set("resume_parse", make_key(resume_text, tone), result)
@@ -1,9 +1,7 @@
-import json
-from groq import AsyncGroq
 from loguru import logger
-from config import get_settings
-
-settings = get_settings()
+from services.cache import llm_cache, make_key
+from services.llm_client import get_groq_client
+from utils.json_codec import loads
 
 CONTENT_TYPES = {
     "linkedin_post": "LinkedIn post",
@@ -113,8 +111,9 @@ async def generate_content(
     instructions: str,
     parsed_data: dict,
     career_graph: dict,
+    use_cache: bool = False,
 ) -> dict:
-    """Generate content based on portfolio data."""
+    """Generate content based on portfolio data. Set `use_cache` to reuse identical prior generations."""
     if content_type not in CONTENT_TYPES:
         return {"error": f"Invalid content type. Choose from: {', '.join(CONTENT_TYPES.keys())}"}
 
@@ -129,7 +128,13 @@ async def generate_content(
         instructions=instructions or "none",
     )
 
-    client = AsyncGroq(api_key=settings.groq_api_key)
+    cache_key = make_key(content_type, tone, prompt)
+    if use_cache:
+        cached = await llm_cache.get("content", cache_key)
+        if cached is not None:
+            return cached
+
+    client = get_groq_client()
 
     try:
         completion = await client.chat.completions.create(
@@ -149,9 +154,11 @@ async def generate_content(
                 raw = raw[4:]
             raw = raw.strip()
 
-        result = json.loads(raw)
+        result = loads(raw)
         result["content_type"] = content_type
         result["tone"] = tone
+        if use_cache:
+            await llm_cache.set("content", cache_key, result)
         return result
     except Exception as e:
         logger.error(f"Content generation failed: {e}")
@@ -179,7 +186,7 @@ async def regenerate_content(
         profile=profile_summary,
     )
 
-    client = AsyncGroq(api_key=settings.groq_api_key)
+    client = get_groq_client()
 
     try:
         completion = await client.chat.completions.create(
@@ -199,7 +206,7 @@ async def regenerate_content(
                 raw = raw[4:]
             raw = raw.strip()
 
-        return json.loads(raw)
+        return loads(raw)
     except Exception as e:
         logger.error(f"Content regeneration failed: {e}")
         return {
@@ -1,9 +1,6 @@
-import json
-from groq import AsyncGroq
 from loguru import logger
-from config import get_settings
-
-settings = get_settings()
+from services.llm_client import get_groq_client
+from utils.json_codec import dumps
 
 COPILOT_SYSTEM_PROMPT = """You are an AI portfolio copilot. You answer questions from visitors about the person whose portfolio they are viewing.
 
@@ -60,14 +57,14 @@ async def answer_question(
         "career_graph": career_graph,
     }
 
-    client = AsyncGroq(api_key=settings.groq_api_key)
+    client = get_groq_client()
 
     try:
         completion = await client.chat.completions.create(
             model="llama-3.3-70b-versatile",
             messages=[
                 {"role": "system", "content": COPILOT_SYSTEM_PROMPT},
-                {"role": "user", "content": f"Portfolio data:\n\n{json.dumps(context, indent=2)}\n\nVisitor question: {question}"},
+                {"role": "user", "content": f"Portfolio data:\n\n{dumps(context, indent=True)}\n\nVisitor question: {question}"},
             ],
             temperature=0.5,
             max_tokens=512,
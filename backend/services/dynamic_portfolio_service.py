@@ -1,9 +1,10 @@
-import json
-from groq import AsyncGroq
 from loguru import logger
-from config import get_settings
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-settings = get_settings()
+from models.portfolio_role_version import PortfolioRoleVersion
+from services.llm_client import get_groq_client
+from utils.json_codec import dumps, loads
 
 TAILOR_PROMPT = """You are a professional resume and portfolio tailor. Adapt the candidate's portfolio data for a {target_role} position.
 
@@ -78,8 +79,8 @@ async def generate_role_version(
         "career_insights": career_graph,
     }
 
-    client = AsyncGroq(api_key=settings.groq_api_key)
-    prompt = TAILOR_PROMPT.format(target_role=target_role, candidate_data=json.dumps(candidate_data, indent=2))
+    client = get_groq_client()
+    prompt = TAILOR_PROMPT.format(target_role=target_role, candidate_data=dumps(candidate_data, indent=True))
 
     try:
         completion = await client.chat.completions.create(
@@ -99,9 +100,82 @@ async def generate_role_version(
                 raw = raw[4:]
             raw = raw.strip()
 
-        result = json.loads(raw)
+        result = loads(raw)
         result["_role"] = target_role
         return result
     except Exception as e:
         logger.error(f"Role version generation failed for {target_role}: {e}")
         return None
+
+
+def role_version_summary(data: dict) -> dict:
+    """Columns stored next to a role version so listings don't read its data."""
+    return {
+        "title": data.get("title"),
+        "skill_count": len(data.get("skills") or []),
+        "experience_count": len(data.get("experience") or []),
+    }
+
+
+async def save_role_version(db: AsyncSession, portfolio_id: str, role: str, data: dict) -> None:
+    """Insert or replace the version for one role. Other roles are not touched. The caller commits."""
+    version = await db.get(PortfolioRoleVersion, (portfolio_id, role))
+    if version is None:
+        version = PortfolioRoleVersion(portfolio_id=portfolio_id, role=role)
+        db.add(version)
+    for key, value in role_version_summary(data).items():
+        setattr(version, key, value)
+    version.data = dumps(data)
+
+
+async def list_role_versions(db: AsyncSession, portfolio_id: str) -> list[dict]:
+    """Metadata of every role version, oldest first, without their data."""
+    result = await db.execute(
+        select(
+            PortfolioRoleVersion.role,
+            PortfolioRoleVersion.title,
+            PortfolioRoleVersion.skill_count,
+            PortfolioRoleVersion.experience_count,
+            PortfolioRoleVersion.updated_at,
+        )
+        .where(PortfolioRoleVersion.portfolio_id == portfolio_id)
+        .order_by(PortfolioRoleVersion.created_at, PortfolioRoleVersion.role)
+    )
+    return [
+        {
+            "role": row.role,
+            "title": row.title,
+            "skill_count": row.skill_count,
+            "experience_count": row.experience_count,
+            "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+        }
+        for row in result.all()
+    ]
+
+
+async def get_role_version(db: AsyncSession, portfolio_id: str, role: str) -> dict | None:
+    """The tailored data for one role, or None."""
+    result = await db.execute(
+        select(PortfolioRoleVersion.data).where(
+            PortfolioRoleVersion.portfolio_id == portfolio_id,
+            PortfolioRoleVersion.role == role,
+        )
+    )
+    data = result.scalar_one_or_none()
+    return loads(data) if data is not None else None
+
+
+async def role_version_exists(db: AsyncSession, portfolio_id: str, role: str) -> bool:
+    result = await db.execute(
+        select(PortfolioRoleVersion.role).where(
+            PortfolioRoleVersion.portfolio_id == portfolio_id,
+            PortfolioRoleVersion.role == role,
+        )
+    )
+    return result.first() is not None
+
+
+async def delete_role_versions(db: AsyncSession, portfolio_ids: list[str]) -> None:
+    """Drop the role versions of portfolios that are being deleted. The caller commits."""
+    if portfolio_ids:
+        await db.execute(delete(PortfolioRoleVersion).where(PortfolioRoleVersion.portfolio_id.in_(portfolio_ids)))
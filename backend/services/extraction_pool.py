@@ -0,0 +1,141 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
+from loguru import logger
+
+from config import get_settings
+from services.parser import ExtractionAttempt, TextExtractionError, extract_text_with_stats
+
+settings = get_settings()
+
+
+def _init_worker(memory_limit_mb: int) -> None:
+    """Cap the worker's address space so a pathological PDF fails with MemoryError instead of exhausting the host."""
+    if memory_limit_mb <= 0:
+        return
+    try:
+        import resource
+
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ImportError, ValueError, OSError) as e:  # non-POSIX or not permitted
+        logger.warning(f"Could not apply extraction worker memory limit: {e}")
+
+
+class ExtractionMetrics:
+    """Per-backend latency and outcome counters, aggregated in the API process."""
+
+    def __init__(self) -> None:
+        self._backends: dict[str, dict[str, float]] = {}
+
+    def record(self, attempts: list[ExtractionAttempt]) -> None:
+        for attempt in attempts:
+            stats = self._backends.setdefault(
+                attempt.backend,
+                {"calls": 0, "ok": 0, "empty": 0, "low_quality": 0, "error": 0, "total_seconds": 0.0, "max_seconds": 0.0},
+            )
+            stats["calls"] += 1
+            stats[attempt.outcome] = stats.get(attempt.outcome, 0) + 1
+            stats["total_seconds"] += attempt.seconds
+            stats["max_seconds"] = max(stats["max_seconds"], attempt.seconds)
+
+    def snapshot(self) -> dict:
+        return {
+            backend: {
+                **{k: v for k, v in stats.items() if k not in ("total_seconds", "max_seconds")},
+                "total_ms": round(stats["total_seconds"] * 1000, 1),
+                "avg_ms": round(stats["total_seconds"] * 1000 / stats["calls"], 1) if stats["calls"] else 0,
+                "max_ms": round(stats["max_seconds"] * 1000, 1),
+            }
+            for backend, stats in self._backends.items()
+        }
+
+
+extraction_metrics = ExtractionMetrics()
+
+
+class ExtractionPool:
+    """Bounded process pool for CPU-heavy document parsing.
+
+    - At most `max_workers` documents are extracted at once; others wait their turn
+      before their timeout starts counting.
+    - A document that exceeds `timeout` gets its worker processes terminated and the
+      pool is rebuilt, so a hung parser can never pin a worker forever.
+    - With `max_workers=0` extraction runs in a thread instead (useful for tests and
+      platforms without fork/spawn support).
+    """
+
+    def __init__(self, max_workers: int, timeout: float, memory_limit_mb: int) -> None:
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self._executor: ProcessPoolExecutor | None = None
+        self._slots = asyncio.Semaphore(max(1, max_workers))
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.memory_limit_mb,),
+            )
+        return self._executor
+
+    def _reset_executor(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+        # ProcessPoolExecutor cannot cancel a running task, so terminate its workers.
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        async with self._slots:
+            if self.max_workers <= 0:
+                return await asyncio.wait_for(asyncio.to_thread(fn, *args), timeout=self.timeout)
+
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._get_executor(), fn, *args)
+            try:
+                return await asyncio.wait_for(future, timeout=self.timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Extraction exceeded {self.timeout}s; restarting extraction workers")
+                self._reset_executor()
+                raise ValueError(f"Extraction timed out after {self.timeout:.0f}s. The file may be malformed or too complex.")
+            except BrokenProcessPool:
+                logger.warning("Extraction worker crashed; restarting extraction workers")
+                self._reset_executor()
+                raise ValueError("The file could not be processed (extraction worker crashed). It may be malformed or too large.")
+            except MemoryError:
+                raise ValueError("The file needs too much memory to extract. Please upload a simpler PDF or DOCX.")
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+extraction_pool = ExtractionPool(
+    max_workers=settings.extraction_pool_size,
+    timeout=settings.extraction_timeout_seconds,
+    memory_limit_mb=settings.extraction_worker_memory_mb,
+)
+
+
+async def extract_text_isolated(file_bytes: bytes, filename: str) -> str:
+    """Extract text from a PDF/DOCX in the extraction pool, off the event loop."""
+    try:
+        text, attempts = await extraction_pool.run(extract_text_with_stats, file_bytes, filename)
+    except TextExtractionError as e:
+        extraction_metrics.record(e.attempts)
+        raise
+    extraction_metrics.record(attempts)
+    if attempts:
+        summary = ", ".join(f"{a.backend}={a.outcome}/{a.seconds * 1000:.0f}ms" for a in attempts)
+        logger.info(f"Extracted {len(text)} chars from {filename.rsplit('.', 1)[-1]} ({summary})")
+    return text
@@ -1,10 +1,7 @@
-import json
-from groq import AsyncGroq
 from loguru import logger
-from config import get_settings
-from services.cache import get_cached_parse, set_cached_parse
-
-settings = get_settings()
+from services.llm_client import PooledGroqClient, get_groq_client
+from services.cache import get_cached_parse, llm_cache, make_key, set_cached_parse
+from utils.json_codec import JSONDecodeError, dumps, loads
 
 SYSTEM_PROMPT = """You are a resume parser AI. Extract structured information from the resume text provided.
 Return ONLY a valid JSON object with exactly this schema (no markdown, no explanation):
@@ -70,8 +67,8 @@ def _parse_json_response(raw: str) -> dict | None:
             raw = raw[4:]
         raw = raw.strip()
     try:
-        return json.loads(raw)
-    except json.JSONDecodeError:
+        return loads(raw)
+    except JSONDecodeError:
         return None
 
 
@@ -97,7 +94,7 @@ def _empty_fallback(resume_text: str) -> dict:
 RETRY_TONES = ["professional", "startup", "creative"]
 
 
-async def _call_groq(client: AsyncGroq, prompt: str, resume_text: str, model: str = "llama-3.1-8b-instant") -> str | None:
+async def _call_groq(client: PooledGroqClient, prompt: str, resume_text: str, model: str = "llama-3.1-8b-instant") -> str | None:
     """Make a single Groq API call. Returns raw text or None on failure."""
     try:
         completion = await client.chat.completions.create(
@@ -141,12 +138,14 @@ Rules:
 
 async def extract_career_graph(resume_text: str) -> dict:
     """Extract a career knowledge graph from resume text using Groq."""
-    cached = get_cached_parse(resume_text, "_career_graph")
+    # Same digest as the pre-namespace cache files, so those are adopted.
+    cache_key = make_key(resume_text, "_career_graph")
+    cached = await llm_cache.get("career_graph", cache_key)
     if cached is not None:
         logger.info("Cache hit for career graph")
         return cached
 
-    client = AsyncGroq(api_key=settings.groq_api_key)
+    client = get_groq_client()
     model = "llama-3.3-70b-versatile"
 
     try:
@@ -163,7 +162,7 @@ async def extract_career_graph(resume_text: str) -> dict:
         parsed = _parse_json_response(raw)
 
         if parsed is not None:
-            set_cached_parse(resume_text, "_career_graph", parsed)
+            await llm_cache.set("career_graph", cache_key, parsed)
             return parsed
 
         logger.warning("Failed to parse career graph JSON from Groq response")
@@ -192,16 +191,16 @@ async def parse_resume_with_groq(resume_text: str, tone: str = "professional") -
     """Send resume text to Groq and return structured JSON.
 
     Features:
-    - Content-hash cache: identical resumes return instantly
+    - Tiered content-hash cache: identical resumes return instantly, across workers
     - Auto-retry: on failure, retries with different tones before falling back
     """
     # Check cache first
-    cached = get_cached_parse(resume_text, tone)
+    cached = await get_cached_parse(resume_text, tone)
     if cached is not None:
         logger.info("Cache hit for resume parse")
         return cached
 
-    client = AsyncGroq(api_key=settings.groq_api_key)
+    client = get_groq_client()
 
     # Try requested tone first, then fallback tones
     tones_to_try = [tone] + [t for t in RETRY_TONES if t != tone]
@@ -218,7 +217,7 @@ async def parse_resume_with_groq(resume_text: str, tone: str = "professional") -
 
         parsed = _parse_json_response(raw)
         if parsed is not None:
-            set_cached_parse(resume_text, tone, parsed)
+            await set_cached_parse(resume_text, tone, parsed)
             return parsed
 
         last_error = "Groq returned invalid JSON"
@@ -241,7 +240,7 @@ REGENERATE_PROMPTS = {
 
 async def regenerate_field_with_groq(field: str, current_value: str, context: str = "") -> str:
     """Use Groq to improve a specific portfolio field."""
-    client = AsyncGroq(api_key=settings.groq_api_key)
+    client = get_groq_client()
 
     system_prompt = REGENERATE_PROMPTS.get(field, "Improve the following text professionally. Return ONLY the improved text.")
     user_content = current_value
@@ -264,7 +263,7 @@ async def regenerate_field_with_groq(field: str, current_value: str, context: st
 async def check_health() -> bool:
     """Verify Groq API connectivity with a minimal request."""
     try:
-        client = AsyncGroq(api_key=settings.groq_api_key)
+        client = get_groq_client()
         await client.chat.completions.create(
             model="llama-3.1-8b-instant",
             messages=[{"role": "user", "content": "ping"}],
@@ -277,7 +276,7 @@ async def check_health() -> bool:
 
 async def analyze_portfolio_spam(portfolio_data: dict) -> dict:
     """Use AI to detect if a portfolio contains spam, or placeholder content."""
-    client = AsyncGroq(api_key=settings.groq_api_key)
+    client = get_groq_client()
 
     prompt = """Analyze the following portfolio data for spam, placeholder content (like "foo", "bar", "test", "lorem ipsum"), or fake information.
 Determine if this is a legitimate professional portfolio or low-quality/test content.
@@ -291,7 +290,7 @@ Return ONLY a valid JSON object with:
 }
 
 Data to analyze:
-""" + json.dumps(portfolio_data, indent=2)
+""" + dumps(portfolio_data, indent=True)
 
     try:
         completion = await client.chat.completions.create(
@@ -305,7 +304,7 @@ Data to analyze:
             response_format={"type": "json_object"}
         )
         
-        result = json.loads(completion.choices[0].message.content)
+        result = loads(completion.choices[0].message.content)
         return result
     except Exception as e:
         return {
@@ -1,9 +1,6 @@
-import json
-from groq import AsyncGroq
 from loguru import logger
-from config import get_settings
-
-settings = get_settings()
+from services.llm_client import get_groq_client
+from utils.json_codec import dumps, loads
 
 QUESTIONS_PROMPT = """You are an expert technical and behavioral interviewer. Based on the candidate's career profile below, generate realistic interview questions.
 
@@ -71,14 +68,14 @@ async def generate_questions(
         "career_graph": career_graph,
     }
 
-    client = AsyncGroq(api_key=settings.groq_api_key)
+    client = get_groq_client()
 
     try:
         completion = await client.chat.completions.create(
             model="llama-3.3-70b-versatile",
             messages=[
                 {"role": "system", "content": QUESTIONS_PROMPT},
-                {"role": "user", "content": json.dumps(context, indent=2)},
+                {"role": "user", "content": dumps(context, indent=True)},
             ],
             temperature=0.5,
             max_tokens=2048,
@@ -91,7 +88,7 @@ async def generate_questions(
                 raw = raw[4:]
             raw = raw.strip()
 
-        return json.loads(raw)
+        return loads(raw)
     except Exception as e:
         logger.error(f"Question generation failed: {e}")
         return {"questions": [], "focus_areas": []}
@@ -115,14 +112,14 @@ async def evaluate_answer(
         },
     }
 
-    client = AsyncGroq(api_key=settings.groq_api_key)
+    client = get_groq_client()
 
     try:
         completion = await client.chat.completions.create(
             model="llama-3.3-70b-versatile",
             messages=[
                 {"role": "system", "content": FEEDBACK_PROMPT},
-                {"role": "user", "content": json.dumps(context, indent=2)},
+                {"role": "user", "content": dumps(context, indent=True)},
             ],
             temperature=0.4,
             max_tokens=1024,
@@ -135,7 +132,7 @@ async def evaluate_answer(
                 raw = raw[4:]
             raw = raw.strip()
 
-        return json.loads(raw)
+        return loads(raw)
     except Exception as e:
         logger.error(f"Answer evaluation failed: {e}")
         return {
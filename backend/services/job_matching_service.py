@@ -1,9 +1,7 @@
-import json
-from groq import AsyncGroq
 from loguru import logger
-from config import get_settings
-
-settings = get_settings()
+from services.cache import llm_cache, make_key
+from services.llm_client import get_groq_client
+from utils.json_codec import dumps, loads
 
 JOB_MATCHING_PROMPT = """You are an expert career matchmaker and recruiter. Analyze the career data below and return matching job opportunities.
 
@@ -41,9 +39,12 @@ Rules:
 async def find_matching_roles(
     parsed_data: dict,
     career_graph: dict,
+    use_cache: bool = False,
 ) -> dict:
-    """Analyze career data and return matching job roles with scores and skill gaps."""
-    client = AsyncGroq(api_key=settings.groq_api_key)
+    """Analyze career data and return matching job roles with scores and skill gaps.
+
+    With `use_cache`, results for an unchanged profile are served from the LLM cache.
+    """
 
     context = {
         "career_graph": career_graph,
@@ -58,12 +59,19 @@ async def find_matching_roles(
         },
     }
 
+    cache_key = make_key(context)
+    if use_cache:
+        cached = await llm_cache.get("job_matching", cache_key)
+        if cached is not None:
+            return cached
+
+    client = get_groq_client()
     try:
         completion = await client.chat.completions.create(
             model="llama-3.3-70b-versatile",
             messages=[
                 {"role": "system", "content": JOB_MATCHING_PROMPT},
-                {"role": "user", "content": json.dumps(context, indent=2)},
+                {"role": "user", "content": dumps(context, indent=True)},
             ],
             temperature=0.4,
             max_tokens=2048,
@@ -76,7 +84,9 @@ async def find_matching_roles(
                 raw = raw[4:]
             raw = raw.strip()
 
-        result = json.loads(raw)
+        result = loads(raw)
+        if use_cache:
+            await llm_cache.set("job_matching", cache_key, result)
         return result
 
     except Exception as e:
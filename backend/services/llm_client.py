@@ -0,0 +1,105 @@
+import asyncio
+
+import httpx
+from groq import AsyncGroq
+from loguru import logger
+
+from config import get_settings
+
+settings = get_settings()
+
+
+def _parse_model_concurrency(raw: str) -> dict[str, int]:
+    """Parse "model=limit,model=limit" into a dict, ignoring malformed entries."""
+    limits: dict[str, int] = {}
+    for item in (raw or "").split(","):
+        model, sep, value = item.partition("=")
+        if not sep or not model.strip():
+            continue
+        try:
+            limits[model.strip()] = max(1, int(value))
+        except ValueError:
+            logger.warning(f"Ignoring invalid Groq concurrency entry: {item!r}")
+    return limits
+
+
+class _ChatCompletions:
+    def __init__(self, pool: "PooledGroqClient") -> None:
+        self._pool = pool
+
+    async def create(self, **kwargs):
+        async with self._pool.semaphore_for(kwargs.get("model", "")):
+            return await self._pool.client.chat.completions.create(**kwargs)
+
+
+class _Chat:
+    def __init__(self, pool: "PooledGroqClient") -> None:
+        self.completions = _ChatCompletions(pool)
+
+
+class PooledGroqClient:
+    """Process-wide Groq client with a keep-alive HTTP pool and per-model concurrency caps.
+
+    Exposes the same `chat.completions.create(...)` surface as `AsyncGroq`, so services
+    can use it as a drop-in replacement.
+    """
+
+    def __init__(self) -> None:
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.groq_max_connections,
+                max_keepalive_connections=settings.groq_max_keepalive_connections,
+                keepalive_expiry=settings.groq_keepalive_expiry_seconds,
+            ),
+            timeout=httpx.Timeout(settings.groq_timeout_seconds, connect=10.0),
+        )
+        self.client = AsyncGroq(
+            api_key=settings.groq_api_key,
+            http_client=self._http,
+            max_retries=settings.groq_max_retries,
+        )
+        self._default_limit = max(1, settings.groq_default_model_concurrency)
+        self._limits = _parse_model_concurrency(settings.groq_model_concurrency)
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self.chat = _Chat(self)
+
+    def semaphore_for(self, model: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(model)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self._limits.get(model, self._default_limit))
+            self._semaphores[model] = semaphore
+        return semaphore
+
+    @property
+    def is_closed(self) -> bool:
+        return self._http.is_closed
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+
+_client: PooledGroqClient | None = None
+
+
+def init_llm_client() -> PooledGroqClient:
+    """Create the shared client. Called from the app lifespan."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = PooledGroqClient()
+        logger.info("Groq client pool initialised")
+    return _client
+
+
+def get_groq_client() -> PooledGroqClient:
+    """Return the shared client, creating it lazily for scripts and tests run outside the lifespan."""
+    if _client is None or _client.is_closed:
+        return init_llm_client()
+    return _client
+
+
+async def close_llm_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        logger.info("Groq client pool closed")
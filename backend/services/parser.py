@@ -1,5 +1,7 @@
 import io
-from typing import Callable
+import time
+from dataclasses import dataclass
+from typing import Any, Callable
 
 import fitz
 import pdfplumber
@@ -8,6 +10,12 @@ from pypdf import PdfReader
 
 PDFExtractionFn = Callable[[bytes], str]
 
+# Fast-path quality bar: below this many characters per page, PyMuPDF output is
+# treated as suspect (e.g. text drawn as vector paths) and pdfplumber is tried.
+MIN_CHARS_PER_PAGE = 200
+# Share of 1-3 character lines above which text looks shredded by bad ordering.
+MAX_FRAGMENT_LINE_RATIO = 0.3
+
 
 def _normalize_extracted_text(text: str) -> str:
     return "\n".join(line.strip() for line in text.splitlines() if line.strip()).strip()
@@ -34,40 +42,146 @@ def _extract_with_pypdf(file_bytes: bytes) -> str:
 
 
 def _extract_with_pymupdf(file_bytes: bytes) -> str:
+    text, _ = _extract_with_pymupdf_checked(file_bytes)
+    return text
+
+
+def _looks_interleaved(blocks: list[tuple], page_width: float) -> bool:
+    """Detect two-column layouts whose text blocks alternate between columns in reading order."""
+    if page_width <= 0:
+        return False
+    mid = page_width / 2
+    slack = page_width * 0.05
+    columns: list[str] = []
+    for block in blocks:
+        x0, x1 = block[0], block[2]
+        if x1 - x0 > page_width * 0.6:
+            continue  # full-width block (header, divider) belongs to neither column
+        if x1 <= mid + slack:
+            columns.append("L")
+        elif x0 >= mid - slack:
+            columns.append("R")
+    if "L" not in columns or "R" not in columns:
+        return False
+    switches = sum(1 for a, b in zip(columns, columns[1:]) if a != b)
+    return switches > max(3, len(columns) // 2)
+
+
+def _quality_problem(text: str, page_count: int, interleaved_pages: int) -> str | None:
+    """Return why fast-path output looks unreliable, or None if it is good enough."""
+    if not text:
+        return "empty"
+    if page_count and len(text) / page_count < MIN_CHARS_PER_PAGE:
+        return "low_char_density"
+    if page_count and interleaved_pages / page_count >= 0.5:
+        return "column_interleaving"
+    lines = text.splitlines()
+    if len(lines) >= 20 and sum(1 for line in lines if len(line) <= 3) / len(lines) > MAX_FRAGMENT_LINE_RATIO:
+        return "fragmented_lines"
+    return None
+
+
+def _extract_with_pymupdf_checked(file_bytes: bytes) -> tuple[str, str | None]:
     text_parts = []
+    interleaved_pages = 0
     with fitz.open(stream=file_bytes, filetype="pdf") as pdf:
+        page_count = pdf.page_count
         for page in pdf:
-            page_text = page.get_text("text") or ""
+            blocks = [b for b in page.get_text("blocks") if len(b) > 6 and b[6] == 0 and str(b[4]).strip()]
+            if _looks_interleaved(blocks, page.rect.width):
+                interleaved_pages += 1
+            page_text = "\n".join(str(b[4]) for b in blocks)
             if page_text.strip():
                 text_parts.append(page_text)
-    return "\n".join(text_parts)
+    text = _normalize_extracted_text("\n".join(text_parts))
+    return text, _quality_problem(text, page_count, interleaved_pages)
 
 
-def extract_text_from_pdf(file_bytes: bytes) -> str:
-    """Extract text from PDF bytes with multiple parser fallbacks."""
-    extractors: list[tuple[str, PDFExtractionFn]] = [
+@dataclass
+class ExtractionAttempt:
+    backend: str
+    seconds: float
+    outcome: str  # "ok" | "empty" | "low_quality" | "error"
+    detail: str = ""
+
+
+class TextExtractionError(ValueError):
+    """No backend produced text. Carries the attempts so callers can still record metrics."""
+
+    def __init__(self, message: str, attempts: list[ExtractionAttempt] | None = None) -> None:
+        super().__init__(message, attempts or [])
+
+    @property
+    def attempts(self) -> list[ExtractionAttempt]:
+        return self.args[1]
+
+    def __str__(self) -> str:
+        return self.args[0]
+
+
+def _timed(backend: str, fn: Callable[[bytes], Any], file_bytes: bytes) -> tuple[Any, ExtractionAttempt]:
+    started = time.perf_counter()
+    try:
+        result = fn(file_bytes)
+        return result, ExtractionAttempt(backend, time.perf_counter() - started, "ok")
+    except Exception as exc:
+        return None, ExtractionAttempt(backend, time.perf_counter() - started, "error", str(exc))
+
+
+def extract_text_from_pdf_with_stats(file_bytes: bytes) -> tuple[str, list[ExtractionAttempt]]:
+    """Extract PDF text, fast path first.
+
+    PyMuPDF runs first. Its output is accepted unless layout heuristics flag it
+    (low character density, interleaved columns, fragmented lines), in which case
+    pdfplumber (slow, layout-aware) and then pypdf are tried. If every backend
+    fails the quality bar, the best non-empty text is still returned.
+    """
+    attempts: list[ExtractionAttempt] = []
+    best_effort = ""
+
+    result, attempt = _timed("pymupdf", _extract_with_pymupdf_checked, file_bytes)
+    attempts.append(attempt)
+    if result is not None:
+        text, problem = result
+        if text and problem is None:
+            return text, attempts
+        attempt.outcome = "empty" if not text else "low_quality"
+        attempt.detail = problem or ""
+        best_effort = text
+
+    fallbacks: list[tuple[str, PDFExtractionFn]] = [
         ("pdfplumber", _extract_with_pdfplumber),
         ("pypdf", _extract_with_pypdf),
-        ("pymupdf", _extract_with_pymupdf),
     ]
-    errors: list[str] = []
-
-    for extractor_name, extractor in extractors:
-        try:
-            text = _normalize_extracted_text(extractor(file_bytes))
-            if text:
-                return text
-            errors.append(f"{extractor_name}: empty")
-        except Exception as exc:
-            errors.append(f"{extractor_name}: {exc}")
-
-    error_summary = "; ".join(errors) if errors else "no extractor attempts were made"
-    raise ValueError(
+    for backend, extractor in fallbacks:
+        raw, attempt = _timed(backend, extractor, file_bytes)
+        attempts.append(attempt)
+        if raw is None:
+            continue
+        text = _normalize_extracted_text(raw)
+        if text:
+            return text, attempts
+        attempt.outcome = "empty"
+
+    if best_effort:
+        return best_effort, attempts
+
+    error_summary = "; ".join(
+        f"{a.backend}: {a.detail or a.outcome}" for a in attempts
+    ) or "no extractor attempts were made"
+    raise TextExtractionError(
         "No extractable text found in the PDF. This usually means the file is scanned, image-based, encrypted, or malformed. "
-        f"Extraction attempts: {error_summary}"
+        f"Extraction attempts: {error_summary}",
+        attempts,
     )
 
 
+def extract_text_from_pdf(file_bytes: bytes) -> str:
+    """Extract text from PDF bytes with multiple parser fallbacks."""
+    text, _ = extract_text_from_pdf_with_stats(file_bytes)
+    return text
+
+
 def extract_text_from_docx(file_bytes: bytes) -> str:
     """Extract text from DOCX bytes using python-docx."""
     import io as _io
@@ -77,12 +191,23 @@ def extract_text_from_docx(file_bytes: bytes) -> str:
     return "\n".join(paragraphs)
 
 
-def extract_text(file_bytes: bytes, filename: str) -> str:
-    """Route to correct extractor based on file extension."""
+def extract_text_with_stats(file_bytes: bytes, filename: str) -> tuple[str, list[ExtractionAttempt]]:
+    """Route to correct extractor based on file extension, returning per-backend timings."""
     ext = filename.lower().split(".")[-1]
     if ext == "pdf":
-        return extract_text_from_pdf(file_bytes)
+        return extract_text_from_pdf_with_stats(file_bytes)
     elif ext == "docx":
-        return extract_text_from_docx(file_bytes)
+        text, attempt = _timed("python-docx", extract_text_from_docx, file_bytes)
+        if text is None:
+            raise TextExtractionError(f"Could not read DOCX: {attempt.detail}", [attempt])
+        if not text.strip():
+            attempt.outcome = "empty"
+        return text, [attempt]
     else:
         raise ValueError(f"Unsupported file type: {ext}")
+
+
+def extract_text(file_bytes: bytes, filename: str) -> str:
+    """Route to correct extractor based on file extension."""
+    text, _ = extract_text_with_stats(file_bytes, filename)
+    return text
@@ -0,0 +1,117 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from config import get_settings
+
+settings = get_settings()
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Raised instead of queueing when the hashing backlog is full."""
+
+
+class PasswordHashMetrics:
+    """Per-operation latency counters for bcrypt calls."""
+
+    def __init__(self) -> None:
+        self._ops: dict[str, dict[str, float]] = {}
+
+    def _stats(self, op: str) -> dict[str, float]:
+        return self._ops.setdefault(
+            op,
+            {"calls": 0, "rejected": 0, "total_seconds": 0.0, "max_seconds": 0.0, "total_wait_seconds": 0.0},
+        )
+
+    def record(self, op: str, wait_seconds: float, seconds: float) -> None:
+        stats = self._stats(op)
+        stats["calls"] += 1
+        stats["total_seconds"] += seconds
+        stats["max_seconds"] = max(stats["max_seconds"], seconds)
+        stats["total_wait_seconds"] += wait_seconds
+
+    def reject(self, op: str) -> None:
+        self._stats(op)["rejected"] += 1
+
+    def snapshot(self) -> dict:
+        return {
+            op: {
+                "calls": stats["calls"],
+                "rejected": stats["rejected"],
+                "avg_ms": round(stats["total_seconds"] * 1000 / stats["calls"], 1) if stats["calls"] else 0,
+                "max_ms": round(stats["max_seconds"] * 1000, 1),
+                "avg_wait_ms": round(stats["total_wait_seconds"] * 1000 / stats["calls"], 1) if stats["calls"] else 0,
+            }
+            for op, stats in self._ops.items()
+        }
+
+
+password_hash_metrics = PasswordHashMetrics()
+
+
+class PasswordHasher:
+    """Dedicated thread pool for bcrypt, so hashing never blocks the event loop.
+
+    bcrypt releases the GIL, so `max_workers` hashes really run in parallel.
+    At most `max_pending` more calls wait for a worker; beyond that `run`
+    raises PasswordHasherBusy at once rather than letting a login burst build
+    an unbounded queue.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int) -> None:
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(0, max_pending)
+        self._executor: ThreadPoolExecutor | None = None
+        self._in_flight = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def run(self, op: str, fn: Callable[..., Any], *args: Any) -> Any:
+        if self._in_flight >= self.max_workers + self.max_pending:
+            password_hash_metrics.reject(op)
+            raise PasswordHasherBusy(f"{self._in_flight} password hashes already in progress")
+
+        def timed() -> tuple[Any, float, float]:
+            started = time.perf_counter()
+            result = fn(*args)
+            return result, started, time.perf_counter()
+
+        loop = asyncio.get_running_loop()
+        submitted = time.perf_counter()
+        future = self._get_executor().submit(timed)
+        self._in_flight += 1
+        # Release the slot when the thread finishes, not when the caller stops
+        # waiting: a cancelled request leaves its hash running in the pool.
+        future.add_done_callback(lambda _: self._release(loop))
+        result, started, finished = await asyncio.wrap_future(future)
+        password_hash_metrics.record(op, started - submitted, finished - started)
+        return result
+
+    def _release(self, loop: asyncio.AbstractEventLoop) -> None:
+        # Done callbacks run on the worker thread; _in_flight belongs to the loop.
+        try:
+            loop.call_soon_threadsafe(self._decrement)
+        except RuntimeError:  # loop already closed
+            self._decrement()
+
+    def _decrement(self) -> None:
+        self._in_flight -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+)
@@ -1,9 +1,14 @@
-import json
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm.attributes import flag_modified
 from models.portfolio import Portfolio
+from services.public_cache import public_portfolio_cache
+from services.search_index import index_portfolio
+from utils.json_codec import loads
 from utils.slug import generate_slug
 
+_CONTENT_COLUMNS = ("parsed_data", "career_graph")
+
 
 async def create_portfolio(
     db: AsyncSession,
@@ -16,6 +21,8 @@ async def create_portfolio(
     resume_filename: str = None,
     resume_object_key: str = None,
     career_graph: dict = None,
+    resume_sha256: str = None,
+    resume_tone: str = None,
 ) -> Portfolio:
     """Create a new portfolio record."""
     name = parsed_data.get("name", "user")
@@ -29,8 +36,8 @@ async def create_portfolio(
     portfolio = Portfolio(
         user_id=user_id,
         slug=slug,
-        parsed_data=json.dumps(parsed_data),
-        career_graph=json.dumps(career_graph) if career_graph else None,
+        parsed_data=parsed_data,
+        career_graph=career_graph or None,
         theme=theme,
         template_id=template_id,
         mode=mode,
@@ -38,10 +45,14 @@ async def create_portfolio(
         is_published=True,
         resume_filename=resume_filename,
         resume_object_key=resume_object_key,
+        resume_sha256=resume_sha256,
+        resume_tone=resume_tone,
     )
     db.add(portfolio)
+    await index_portfolio(db, portfolio)
     await db.commit()
-    await db.refresh(portfolio)
+    # No refresh: every column has a Python-side default, and a refresh would
+    # drop the deferred content columns the caller just set.
     return portfolio
 
 
@@ -57,10 +68,18 @@ async def update_portfolio(
             continue
         if value is None:
             continue
-        if isinstance(value, dict) and key in ("parsed_data", "career_graph"):
-            setattr(portfolio, key, json.dumps(value))
+        if key in _CONTENT_COLUMNS:
+            if isinstance(value, str):
+                value = loads(value)
+            setattr(portfolio, key, value)
+            # JSON columns don't track in-place edits; callers often pass back
+            # the same (mutated) dict they read from the portfolio.
+            flag_modified(portfolio, key)
         else:
             setattr(portfolio, key, value)
+    await index_portfolio(db, portfolio)
     await db.commit()
-    await db.refresh(portfolio)
+    # No refresh, as in create_portfolio: updated_at is set Python-side, and a
+    # refresh would leave the content columns deferred for PortfolioOut.
+    public_portfolio_cache.invalidate(portfolio.id)
     return portfolio
@@ -0,0 +1,150 @@
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import get_settings
+from models.portfolio_version import PortfolioVersion
+from utils.json_codec import dumpb, loads
+from utils.json_patch import apply_patch, make_patch
+
+settings = get_settings()
+
+
+def encode_payload(value: Any) -> bytes:
+    return zlib.compress(dumpb(value), 6)
+
+
+def decode_payload(payload: bytes) -> Any:
+    return loads(zlib.decompress(payload))
+
+
+def encode_version(previous: Any, document: Any, chain_length: int, snapshot_every: int) -> tuple[bool, bytes] | None:
+    """(is_snapshot, payload) for `document` following `previous`, or None if nothing changed.
+
+    `chain_length` counts the versions since (and including) the last snapshot.
+    A full copy is stored every `snapshot_every` versions, for the first
+    version, and whenever the compressed delta would not be smaller.
+    """
+    ops = make_patch(previous, document) if previous is not None else None
+    if ops == []:
+        return None
+    full = encode_payload(document)
+    if ops is None or chain_length >= snapshot_every:
+        return True, full
+    delta = encode_payload(ops)
+    return (True, full) if len(delta) >= len(full) else (False, delta)
+
+
+def replay(chain: Iterable[tuple[bool, bytes]]) -> Any:
+    """Rebuild the last document of a chain that starts at a snapshot."""
+    document = None
+    for is_snapshot, payload in chain:
+        value = decode_payload(payload)
+        document = value if is_snapshot else apply_patch(document, value)
+    return document
+
+
+async def _chain(db: AsyncSession, portfolio_id: str, seq: int | None = None) -> list:
+    """Rows from the nearest snapshot at or before `seq` (default: latest) up to `seq`."""
+    bounds = [PortfolioVersion.portfolio_id == portfolio_id]
+    if seq is not None:
+        bounds.append(PortfolioVersion.seq <= seq)
+    start = (
+        select(func.max(PortfolioVersion.seq))
+        .where(*bounds, PortfolioVersion.is_snapshot.is_(True))
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        select(PortfolioVersion.seq, PortfolioVersion.is_snapshot, PortfolioVersion.payload)
+        .where(*bounds, PortfolioVersion.seq >= start)
+        .order_by(PortfolioVersion.seq)
+    )
+    return result.all()
+
+
+async def load_version(db: AsyncSession, portfolio_id: str, seq: int) -> dict | None:
+    """The parsed_data saved as version `seq`, or None if it doesn't exist (or was pruned)."""
+    rows = await _chain(db, portfolio_id, seq)
+    if not rows or rows[-1].seq != seq:
+        return None
+    return replay((row.is_snapshot, row.payload) for row in rows)
+
+
+async def record_version(
+    db: AsyncSession,
+    portfolio_id: str,
+    parsed_data: dict,
+    saved_at: datetime | None = None,
+) -> int | None:
+    """Append `parsed_data` to the portfolio's history and apply the retention limit.
+
+    Costs one read of the current delta chain (at most
+    portfolio_version_snapshot_every rows) and one insert, however long the
+    history is. Returns the new version number, or None when parsed_data is
+    unchanged since the last version. Flushes; the caller commits.
+    """
+    rows = await _chain(db, portfolio_id)
+    previous = replay((row.is_snapshot, row.payload) for row in rows) if rows else None
+    encoded = encode_version(previous, parsed_data, len(rows), settings.portfolio_version_snapshot_every)
+    if encoded is None:
+        return None
+    is_snapshot, payload = encoded
+    seq = rows[-1].seq + 1 if rows else 1
+    db.add(PortfolioVersion(
+        portfolio_id=portfolio_id,
+        seq=seq,
+        is_snapshot=is_snapshot,
+        payload=payload,
+        created_at=saved_at or datetime.now(timezone.utc),
+    ))
+    await db.flush()
+    await _prune(db, portfolio_id)
+    return seq
+
+
+async def _prune(db: AsyncSession, portfolio_id: str) -> None:
+    """Keep the newest portfolio_version_retention versions; the oldest kept becomes a snapshot."""
+    oldest_kept = (await db.execute(
+        select(PortfolioVersion.seq, PortfolioVersion.is_snapshot)
+        .where(PortfolioVersion.portfolio_id == portfolio_id)
+        .order_by(PortfolioVersion.seq.desc())
+        .offset(max(settings.portfolio_version_retention, 1) - 1)
+        .limit(1)
+    )).first()
+    if oldest_kept is None:
+        return
+    if not oldest_kept.is_snapshot:
+        document = await load_version(db, portfolio_id, oldest_kept.seq)
+        await db.execute(
+            update(PortfolioVersion)
+            .where(PortfolioVersion.portfolio_id == portfolio_id, PortfolioVersion.seq == oldest_kept.seq)
+            .values(is_snapshot=True, payload=encode_payload(document))
+        )
+    await db.execute(
+        delete(PortfolioVersion).where(
+            PortfolioVersion.portfolio_id == portfolio_id,
+            PortfolioVersion.seq < oldest_kept.seq,
+        )
+    )
+
+
+async def list_versions(db: AsyncSession, portfolio_id: str) -> list[dict]:
+    """Version metadata, newest first. Payloads are not read."""
+    result = await db.execute(
+        select(PortfolioVersion.seq, PortfolioVersion.created_at, func.length(PortfolioVersion.payload))
+        .where(PortfolioVersion.portfolio_id == portfolio_id)
+        .order_by(PortfolioVersion.seq.desc())
+    )
+    return [
+        {"version": seq, "saved_at": created_at.isoformat() if created_at else None, "stored_bytes": stored_bytes}
+        for seq, created_at, stored_bytes in result.all()
+    ]
+
+
+async def delete_versions(db: AsyncSession, portfolio_ids: list[str]) -> None:
+    """Drop the history of portfolios that are being deleted. The caller commits."""
+    if portfolio_ids:
+        await db.execute(delete(PortfolioVersion).where(PortfolioVersion.portfolio_id.in_(portfolio_ids)))
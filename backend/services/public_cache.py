@@ -0,0 +1,227 @@
+import asyncio
+import hashlib
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+
+from loguru import logger
+
+from config import get_settings
+from utils.json_codec import dumpb
+
+settings = get_settings()
+
+INVALIDATION_CHANNEL = "public_cache:invalidate"
+
+
+@dataclass
+class CachedPortfolio:
+    """Serialized public payload for one published portfolio.
+
+    `view_count` is kept out of the serialized body (and the ETag) because it
+    changes on every hit; it is spliced in at render time instead.
+    """
+
+    portfolio_id: str
+    user_id: str
+    etag: str
+    view_count: int
+    expires_at: float
+    _head: bytes  # JSON object without its closing brace
+
+    def render(self, view_count: int) -> bytes:
+        return self._head + b',"view_count":' + str(view_count).encode() + b"}"
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    # Weak comparison: W/"x" and "x" are equivalent for GET revalidation.
+    bare = etag.removeprefix("W/")
+    return "*" in candidates or any(tag.removeprefix("W/") == bare for tag in candidates)
+
+
+class PublicPortfolioCache:
+    """Process-local LRU of public portfolio payloads, looked up by slug or custom domain.
+
+    Entries are indexed by portfolio and owner, and dropped explicitly whenever
+    a portfolio (or its owner's avatar) changes. With redis_url set, each
+    invalidation is also published on INVALIDATION_CHANNEL so every worker
+    drops its copy; `ttl` bounds staleness if Redis is unavailable.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, redis_url: str = "") -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple[str, str], CachedPortfolio] = OrderedDict()
+        self._by_portfolio: defaultdict[str, set[tuple[str, str]]] = defaultdict(set)
+        self._by_user: defaultdict[str, set[str]] = defaultdict(set)
+        self._redis_url = redis_url
+        self._client = None
+        self._origin = uuid.uuid4().hex
+        self._listener: asyncio.Task | None = None
+        self._publishing: set[asyncio.Task] = set()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, kind: str, key: str) -> CachedPortfolio | None:
+        entry = self._entries.get((kind, key))
+        if entry is None or entry.expires_at <= time.monotonic():
+            if entry is not None:
+                self._remove((kind, key))
+            self.misses += 1
+            return None
+        self._entries.move_to_end((kind, key))
+        self.hits += 1
+        return entry
+
+    def put(self, kind: str, key: str, payload: dict) -> CachedPortfolio:
+        body = dict(payload)
+        view_count = body.pop("view_count", 0) or 0
+        serialized = dumpb(body, default=str)
+        entry = CachedPortfolio(
+            portfolio_id=payload["id"],
+            user_id=payload["user_id"],
+            etag=f'W/"{hashlib.sha1(serialized).hexdigest()}"',
+            view_count=view_count,
+            expires_at=time.monotonic() + self.ttl,
+            _head=serialized[:-1],
+        )
+        if self.max_entries > 0:
+            if (kind, key) in self._entries:
+                self._remove((kind, key))
+            self._entries[(kind, key)] = entry
+            self._by_portfolio[entry.portfolio_id].add((kind, key))
+            self._by_user[entry.user_id].add(entry.portfolio_id)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+        return entry
+
+    def _remove(self, cache_key: tuple[str, str]) -> None:
+        entry = self._entries.pop(cache_key)
+        keys = self._by_portfolio[entry.portfolio_id]
+        keys.discard(cache_key)
+        if not keys:
+            del self._by_portfolio[entry.portfolio_id]
+            portfolios = self._by_user[entry.user_id]
+            portfolios.discard(entry.portfolio_id)
+            if not portfolios:
+                del self._by_user[entry.user_id]
+
+    def add_views(self, counts: dict[str, int]) -> None:
+        """Fold flushed page-view increments into cached view counts."""
+        for portfolio_id, count in counts.items():
+            for cache_key in self._by_portfolio.get(portfolio_id, ()):
+                self._entries[cache_key].view_count += count
+
+    def invalidate(self, portfolio_id: str) -> None:
+        self._drop_portfolio(portfolio_id)
+        self._broadcast(f"portfolio:{portfolio_id}")
+
+    def invalidate_user(self, user_id: str) -> None:
+        self._drop_user(user_id)
+        self._broadcast(f"user:{user_id}")
+
+    def _drop_portfolio(self, portfolio_id: str) -> None:
+        for cache_key in list(self._by_portfolio.get(portfolio_id, ())):
+            self._remove(cache_key)
+
+    def _drop_user(self, user_id: str) -> None:
+        for portfolio_id in list(self._by_user.get(user_id, ())):
+            self._drop_portfolio(portfolio_id)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._by_portfolio.clear()
+        self._by_user.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "redis_enabled": bool(self._redis_url),
+        }
+
+    # Cross-worker invalidation over Redis pub/sub.
+
+    def _get_client(self):
+        if self._client is None:
+            import redis.asyncio as redis  # type: ignore
+
+            self._client = redis.from_url(self._redis_url, decode_responses=True)
+        return self._client
+
+    def _broadcast(self, target: str) -> None:
+        # Call sites are synchronous; publishing happens in the background.
+        if not self._redis_url:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self._publish(target))
+        self._publishing.add(task)
+        task.add_done_callback(self._publishing.discard)
+
+    async def _publish(self, target: str) -> None:
+        try:
+            await self._get_client().publish(INVALIDATION_CHANNEL, f"{self._origin} {target}")
+        except Exception as e:
+            logger.warning(f"Public cache invalidation publish failed: {e}")
+
+    def _apply(self, message: str) -> None:
+        origin, _, target = message.partition(" ")
+        if origin == self._origin:
+            return
+        kind, _, target_id = target.partition(":")
+        if kind == "portfolio":
+            self._drop_portfolio(target_id)
+        elif kind == "user":
+            self._drop_user(target_id)
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = None
+            subscribed = False
+            try:
+                pubsub = self._get_client().pubsub()
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                subscribed = True
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._apply(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Public cache invalidation listener failed: {e}")
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+            if subscribed:
+                # Invalidations sent while reconnecting would be missed.
+                self.clear()
+            await asyncio.sleep(1)
+
+    async def start(self) -> None:
+        if self._redis_url and self._listener is None:
+            self._listener = asyncio.create_task(self._listen(), name="public-cache-invalidation")
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        await asyncio.gather(*self._publishing, return_exceptions=True)
+
+
+public_portfolio_cache = PublicPortfolioCache(
+    max_entries=settings.public_cache_max_entries,
+    ttl=settings.public_cache_ttl_seconds,
+    redis_url=settings.redis_url,
+)
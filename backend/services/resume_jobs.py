@@ -0,0 +1,300 @@
+import asyncio
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from loguru import logger
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import get_settings
+from database import AsyncSessionLocal
+from models.resume_job import ResumeJob
+from models.user import User
+from services.resume_pipeline import ResumeExtractionError, process_resume
+from utils.json_codec import dumps, loads
+
+settings = get_settings()
+
+
+class _LeaseLost(Exception):
+    """Raised inside a job when another worker has taken over its lease."""
+
+
+async def enqueue_resume_job(
+    db: AsyncSession,
+    user_id: str,
+    file_bytes: bytes,
+    filename: str,
+    tone: str,
+    mode: str,
+) -> ResumeJob:
+    """Persist an upload for background processing and wake a local worker."""
+    job = ResumeJob(
+        user_id=user_id,
+        filename=filename,
+        tone=tone,
+        mode=mode,
+        payload=file_bytes,
+        status="queued",
+        stage="queued",
+    )
+    db.add(job)
+    await db.commit()
+    resume_job_worker.notify()
+    return job
+
+
+async def get_user_job(db: AsyncSession, job_id: str, user_id: str) -> ResumeJob | None:
+    result = await db.execute(
+        select(ResumeJob).where(ResumeJob.id == job_id, ResumeJob.user_id == user_id)
+    )
+    return result.scalar_one_or_none()
+
+
+def serialize_job(job: ResumeJob) -> dict:
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "stage": job.stage,
+        "filename": job.filename,
+        "result": loads(job.result) if job.result else None,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+class ResumeJobWorker:
+    """In-process workers that drain the `resume_jobs` table.
+
+    Jobs are claimed with a conditional UPDATE (queued -> running), so several
+    app instances can share the same database without processing a job twice.
+    Local enqueues wake workers immediately; jobs from other instances are
+    picked up on the next poll.
+
+    A claim is a lease: the worker id goes in `claimed_by`, and `heartbeat_at`
+    is renewed every `resume_job_heartbeat_seconds` while the job runs, however
+    long a single stage takes. Maintenance re-queues only jobs whose heartbeat
+    has expired, and a worker that lost its lease doesn't write the outcome.
+    """
+
+    def __init__(self, concurrency: int, poll_interval: float) -> None:
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup: asyncio.Event | None = None
+        self._last_maintenance = 0.0
+
+    def notify(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def start(self) -> None:
+        if self._tasks or self.concurrency <= 0:
+            return
+        self._wakeup = asyncio.Event()
+        await self._maintenance()
+        self._tasks = [
+            asyncio.create_task(self._run(i), name=f"resume-job-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        logger.info(f"Started {self.concurrency} resume job worker(s)")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._wakeup = None
+
+    async def _run(self, index: int) -> None:
+        while True:
+            try:
+                job_id = await self.claim_next()
+                if job_id is not None:
+                    await self.process(job_id)
+                    continue
+                if index == 0:
+                    await self._maybe_maintain()
+                await self._wait()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Resume job worker loop error")
+                await asyncio.sleep(self.poll_interval)
+
+    async def _wait(self) -> None:
+        if self._wakeup is None:
+            await asyncio.sleep(self.poll_interval)
+            return
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def claim_next(self) -> str | None:
+        """Atomically move the oldest queued job to running. Returns its id, or None if idle."""
+        async with AsyncSessionLocal() as db:
+            while True:
+                job_id = await db.scalar(
+                    select(ResumeJob.id)
+                    .where(ResumeJob.status == "queued")
+                    .order_by(ResumeJob.created_at)
+                    .limit(1)
+                )
+                if job_id is None:
+                    return None
+                now = datetime.now(timezone.utc)
+                claimed = await db.execute(
+                    update(ResumeJob)
+                    .where(ResumeJob.id == job_id, ResumeJob.status == "queued")
+                    .values(
+                        status="running",
+                        stage="extracting",
+                        started_at=now,
+                        heartbeat_at=now,
+                        claimed_by=self.worker_id,
+                        attempts=ResumeJob.attempts + 1,
+                    )
+                )
+                await db.commit()
+                if claimed.rowcount == 1:
+                    return job_id
+                # Another worker won the race; try the next one.
+
+    def _leased(self, job_id: str):
+        return (
+            ResumeJob.id == job_id,
+            ResumeJob.status == "running",
+            ResumeJob.claimed_by == self.worker_id,
+        )
+
+    async def _heartbeat(self, job_id: str) -> None:
+        """Renew the lease on `job_id` until cancelled or the lease is lost."""
+        interval = settings.resume_job_heartbeat_seconds
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with AsyncSessionLocal() as db:
+                    renewed = await db.execute(
+                        update(ResumeJob)
+                        .where(*self._leased(job_id))
+                        .values(heartbeat_at=datetime.now(timezone.utc))
+                    )
+                    await db.commit()
+            except Exception as e:
+                logger.warning(f"Could not renew lease on resume job {job_id}: {e}")
+                continue
+            if renewed.rowcount == 0:
+                logger.warning(f"Resume job {job_id} lease was lost to another worker")
+                return
+
+    async def process(self, job_id: str) -> None:
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            await self._process(job_id)
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+
+    async def _process(self, job_id: str) -> None:
+        async with AsyncSessionLocal() as db:
+            job = await db.get(ResumeJob, job_id)
+            if job is None:
+                return
+            file_bytes = await db.scalar(select(ResumeJob.payload).where(ResumeJob.id == job_id))
+            user = await db.get(User, job.user_id)
+
+            async def on_stage(stage: str) -> None:
+                updated = await db.execute(
+                    update(ResumeJob)
+                    .where(*self._leased(job_id))
+                    .values(stage=stage, heartbeat_at=datetime.now(timezone.utc))
+                )
+                await db.commit()
+                if updated.rowcount == 0:
+                    raise _LeaseLost()
+
+            try:
+                if user is None or not user.is_active:
+                    raise ResumeExtractionError("Account is no longer active.")
+                if not file_bytes:
+                    raise ResumeExtractionError("Uploaded file is no longer available. Please upload it again.")
+                response = await process_resume(
+                    db, user, file_bytes, job.filename, job.tone, job.mode, on_stage=on_stage
+                )
+                outcome = {"status": "succeeded", "stage": "done", "result": dumps(response, default=str)}
+            except ResumeExtractionError as e:
+                await db.rollback()
+                outcome = {"status": "failed", "error": str(e)}
+            except _LeaseLost:
+                await db.rollback()
+                logger.warning(f"Resume job {job_id} lease was lost to another worker; processing stopped")
+                return
+            except asyncio.CancelledError:
+                # Shutdown mid-job: leave it "running" so stale recovery re-queues it.
+                raise
+            except Exception:
+                logger.exception(f"Resume job {job_id} failed")
+                await db.rollback()
+                outcome = {"status": "failed", "error": "Processing failed unexpectedly. Please try again."}
+
+            finished = await db.execute(
+                update(ResumeJob)
+                .where(*self._leased(job_id))
+                .values(**outcome, payload=None, finished_at=datetime.now(timezone.utc))
+            )
+            await db.commit()
+            if finished.rowcount == 0:
+                logger.warning(f"Resume job {job_id} finished after its lease expired; outcome discarded")
+
+    async def _maybe_maintain(self) -> None:
+        now = asyncio.get_running_loop().time()
+        if now - self._last_maintenance >= 60:
+            await self._maintenance()
+
+    async def _maintenance(self) -> None:
+        """Re-queue jobs whose lease expired (e.g. the process died) and purge old finished jobs."""
+        self._last_maintenance = asyncio.get_running_loop().time()
+        now = datetime.now(timezone.utc)
+        stale_before = now - timedelta(seconds=settings.resume_job_stale_after_seconds)
+        # Rows claimed before leases existed have no heartbeat yet.
+        expired = func.coalesce(ResumeJob.heartbeat_at, ResumeJob.started_at) < stale_before
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(ResumeJob)
+                .where(
+                    ResumeJob.status == "running",
+                    expired,
+                    ResumeJob.attempts < settings.resume_job_max_attempts,
+                )
+                .values(status="queued", stage="queued", claimed_by=None)
+            )
+            await db.execute(
+                update(ResumeJob)
+                .where(ResumeJob.status == "running", expired)
+                .values(
+                    status="failed",
+                    error="Processing did not complete. Please try again.",
+                    payload=None,
+                    finished_at=now,
+                )
+            )
+            await db.execute(
+                delete(ResumeJob).where(
+                    ResumeJob.finished_at.isnot(None),
+                    ResumeJob.finished_at < now - timedelta(hours=settings.resume_job_retention_hours),
+                )
+            )
+            await db.commit()
+
+
+resume_job_worker = ResumeJobWorker(
+    concurrency=settings.resume_job_workers,
+    poll_interval=settings.resume_job_poll_interval_seconds,
+)
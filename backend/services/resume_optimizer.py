@@ -1,9 +1,6 @@
-import json
-from groq import AsyncGroq
 from loguru import logger
-from config import get_settings
-
-settings = get_settings()
+from services.llm_client import get_groq_client
+from utils.json_codec import dumps, loads
 
 OPTIMIZER_PROMPT = """You are an expert ATS (Applicant Tracking System) and resume optimization consultant. Analyze the resume data below and return a detailed scorecard.
 
@@ -46,7 +43,7 @@ async def analyze_resume(
     resume_text: str = "",
 ) -> dict:
     """Analyze resume quality and return ATS scorecard with suggestions."""
-    client = AsyncGroq(api_key=settings.groq_api_key)
+    client = get_groq_client()
 
     context = {
         "parsed_data": parsed_data,
@@ -59,7 +56,7 @@ async def analyze_resume(
             model="llama-3.3-70b-versatile",
             messages=[
                 {"role": "system", "content": OPTIMIZER_PROMPT},
-                {"role": "user", "content": f"Analyze this resume:\n\n{json.dumps(context, indent=2)}"},
+                {"role": "user", "content": f"Analyze this resume:\n\n{dumps(context, indent=True)}"},
             ],
             temperature=0.3,
             max_tokens=2048,
@@ -72,7 +69,7 @@ async def analyze_resume(
                 raw = raw[4:]
             raw = raw.strip()
 
-        result = json.loads(raw)
+        result = loads(raw)
         return result
 
     except Exception as e:
@@ -0,0 +1,363 @@
+import asyncio
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from loguru import logger
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.portfolio import LOAD_CONTENT, Portfolio
+from models.user import User
+from services.portfolio_service import create_portfolio, update_portfolio
+from services.portfolio_versions import record_version
+from services.cache import llm_cache, make_key
+from services.groq_service import extract_career_graph, parse_resume_with_groq
+from services.extraction_pool import extract_text_isolated
+from services.rustfs_service import resume_object_key, rustfs_service
+from utils.json_codec import loads
+
+
+StageCallback = Callable[[str], Awaitable[None]]
+
+
+class ResumeExtractionError(ValueError):
+    """Raised when no usable text can be extracted from an uploaded resume."""
+
+
+def is_fallback_parse(parsed_data: dict) -> bool:
+    """True for the empty data the parser returns when the LLM call fails."""
+    return not parsed_data.get("name") and not parsed_data.get("skills")
+
+
+@dataclass
+class ProcessedResume:
+    resume_text: str
+    parsed_data: dict
+    career_graph: dict
+    object_key: str | None
+    content_hash: str | None = None
+    tone: str | None = None
+
+    @property
+    def ai_fallback(self) -> bool:
+        return is_fallback_parse(self.parsed_data)
+
+
+class ResumeUploadPipeline:
+    """Staged resume processing with a single cleanup point.
+
+    Stages:
+      1. RustFS upload runs concurrently with text extraction.
+      2. Resume parse and career-graph extraction run concurrently on the text.
+
+    Use as an async context manager. Unless `keep_object()` is called before the
+    block exits (on error, cancellation or early return), the uploaded object is
+    deleted from RustFS.
+
+    Objects are keyed by the file's SHA-256, so another upload of the same file
+    may already own the key. Only an object this pipeline created is deleted on
+    exit: an existing one is reused as-is, and so is `stored_object_key` (the
+    object the portfolio already references for this exact file).
+    """
+
+    def __init__(
+        self,
+        file_bytes: bytes,
+        filename: str,
+        user_id: str,
+        on_stage: StageCallback | None = None,
+        content_hash: str | None = None,
+        stored_object_key: str | None = None,
+    ) -> None:
+        self.file_bytes = file_bytes
+        self.content_hash = content_hash or hashlib.sha256(file_bytes).hexdigest()
+        self.stored_object_key = stored_object_key
+        self.filename = filename
+        self.user_id = user_id
+        self._on_stage = on_stage
+        self.object_key: str | None = None
+        self._upload_task: asyncio.Task | None = None
+        self._created = False
+        self._keep = False
+
+    async def __aenter__(self) -> "ResumeUploadPipeline":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if self._upload_task is not None and not self._upload_task.done():
+            self._upload_task.cancel()
+            await asyncio.gather(self._upload_task, return_exceptions=True)
+        if not self._keep and self._created and self.object_key:
+            deleted = await rustfs_service.delete_file(self.object_key)
+            if not deleted:
+                logger.warning(f"Failed to clean up uploaded resume object {self.object_key}")
+            self.object_key = None
+
+    async def stage(self, name: str) -> None:
+        """Report progress to the optional stage callback (used by background jobs)."""
+        if self._on_stage is not None:
+            await self._on_stage(name)
+
+    def keep_object(self) -> None:
+        """Mark the uploaded object as referenced so it survives the context exit."""
+        self._keep = True
+
+    async def _upload(self) -> str | None:
+        if self.stored_object_key:
+            return self.stored_object_key
+        if not rustfs_service.s3_client:
+            return None
+        object_key = resume_object_key(self.user_id, self.content_hash, self.filename)
+        try:
+            if await rustfs_service.object_exists(object_key):
+                return object_key
+            object_key = await rustfs_service.upload_file(self.file_bytes, self.filename, self.user_id, self.content_hash)
+        except Exception as e:
+            logger.warning(f"Failed to upload to RustFS: {e}")
+            return None
+        self._created = True
+        return object_key
+
+    async def _extract(self) -> str:
+        try:
+            resume_text = await extract_text_isolated(self.file_bytes, self.filename)
+        except Exception as e:
+            raise ResumeExtractionError(f"Could not extract text: {str(e)}") from e
+        if not resume_text.strip():
+            raise ResumeExtractionError(
+                "No text found in the uploaded file. Please upload a text-based PDF or DOCX."
+            )
+        return resume_text
+
+    async def run(self, tone: str = "professional") -> ProcessedResume:
+        # Stage 1: storage upload overlaps with extraction.
+        await self.stage("extracting")
+        self._upload_task = asyncio.create_task(self._upload())
+        try:
+            resume_text = await self._extract()
+            # Stage 2: both LLM calls depend only on the text.
+            await self.stage("analyzing")
+            parsed_data, career_graph = await asyncio.gather(
+                parse_resume_with_groq(resume_text, tone=tone),
+                extract_career_graph(resume_text),
+            )
+        finally:
+            # Always collect the upload result, even on failure, so __aexit__
+            # knows which object to delete instead of orphaning it.
+            self.object_key = await self._upload_task
+
+        return ProcessedResume(
+            resume_text=resume_text,
+            parsed_data=parsed_data,
+            career_graph=career_graph,
+            object_key=self.object_key,
+            content_hash=self.content_hash,
+            tone=tone,
+        )
+
+
+async def save_parsed_resume(
+    db: AsyncSession,
+    current_user: User,
+    processed: ProcessedResume,
+    filename: str,
+    mode: str,
+) -> tuple[Portfolio, dict, str | None]:
+    """Create or update the user's portfolio from a processed resume.
+
+    Returns the portfolio, the parsed data as stored, and the previous resume object key (if any).
+    """
+    parsed_data = processed.parsed_data
+    career_graph = processed.career_graph
+    resume_object_key = processed.object_key
+
+    # Check if user already has a portfolio
+    result = await db.execute(select(Portfolio).options(*LOAD_CONTENT).where(Portfolio.user_id == current_user.id))
+    existing_portfolio = result.scalar_one_or_none()
+
+    if existing_portfolio:
+        # Snapshot current state to portfolio_versions before any mutation. A
+        # savepoint keeps a failure (e.g. a concurrent job taking the same seq)
+        # from poisoning the session the portfolio update commits with.
+        try:
+            async with db.begin_nested():
+                await record_version(db, existing_portfolio.id, existing_portfolio.parsed_data or {})
+        except Exception:
+            logger.exception(f"Failed to snapshot version history for portfolio {existing_portfolio.id}")
+
+        previous_resume_object_key = existing_portfolio.resume_object_key
+        if mode == "merge":
+            # Deep merge: keep existing edited fields, only fill empty/null from new parse
+            existing_data = existing_portfolio.parsed_data or {}
+            new_data = loads(parsed_data) if isinstance(parsed_data, str) else parsed_data
+            merged: dict[str, Any] = {**new_data}
+            for key, val in existing_data.items():
+                if val and val != "" and val != []:
+                    if key == "skills" and isinstance(val, list) and isinstance(merged.get("skills", []), list):
+                        # Deduplicate and append new skills
+                        existing_set = set(s.lower() for s in val)
+                        new_skills = [s for s in merged.get("skills", []) if s.lower() not in existing_set]
+                        merged["skills"] = val + new_skills
+                    else:
+                        merged[key] = val
+            portfolio = await update_portfolio(
+                db,
+                existing_portfolio,
+                {
+                    "parsed_data": merged,
+                    "career_graph": career_graph,
+                    "resume_filename": filename,
+                    "resume_object_key": resume_object_key if resume_object_key else existing_portfolio.resume_object_key,
+                    "resume_sha256": processed.content_hash,
+                    "resume_tone": processed.tone,
+                    # Auto-publish on successful generation/update.
+                    "is_published": True,
+                },
+            )
+            parsed_data = merged
+        else:
+            # Replace mode: overwrite everything
+            portfolio = await update_portfolio(
+                db,
+                existing_portfolio,
+                {
+                    "parsed_data": parsed_data, 
+                    "career_graph": career_graph,
+                    "resume_filename": filename,
+                    "resume_object_key": resume_object_key if resume_object_key else existing_portfolio.resume_object_key,
+                    "resume_sha256": processed.content_hash,
+                    "resume_tone": processed.tone,
+                    # Auto-publish on successful generation/update.
+                    "is_published": True,
+                },
+            )
+    else:
+        # Create new portfolio
+        previous_resume_object_key = None
+        portfolio = await create_portfolio(
+            db,
+            user_id=current_user.id,
+            parsed_data=parsed_data,
+            career_graph=career_graph,
+            resume_filename=filename,
+            resume_object_key=resume_object_key,
+            resume_sha256=processed.content_hash,
+            resume_tone=processed.tone,
+        )
+
+    return portfolio, parsed_data, previous_resume_object_key
+
+
+async def process_resume(
+    db: AsyncSession,
+    user: User,
+    file_bytes: bytes,
+    filename: str,
+    tone: str = "professional",
+    mode: str = "replace",
+    on_stage: StageCallback | None = None,
+) -> dict:
+    """Run the full upload flow for `user` and return the upload response payload.
+
+    Re-uploading the file (same SHA-256, same tone) the portfolio was built
+    from skips extraction, storage and LLM calls, unless the stored parse is
+    the empty AI fallback. In merge mode nothing would change, so the stored
+    parse is returned as-is. In replace mode the file's cached parse and
+    career graph are saved again, overwriting any edits as requested.
+    Raises ResumeExtractionError when the file has no usable text.
+    """
+    content_hash = hashlib.sha256(file_bytes).hexdigest()
+    current = (await db.execute(
+        select(Portfolio.id, Portfolio.resume_sha256, Portfolio.resume_tone, Portfolio.resume_object_key)
+        .where(Portfolio.user_id == user.id)
+    )).first()
+    upload_key = make_key(content_hash, tone)
+    stored_object_key = None
+    if current is not None and current.resume_sha256 == content_hash:
+        stored_object_key = current.resume_object_key
+        if current.resume_tone == tone and (stored_object_key or not rustfs_service.s3_client):
+            if mode == "merge":
+                portfolio = await db.get(Portfolio, current.id, options=LOAD_CONTENT)
+                parsed_data = portfolio.parsed_data or {}
+                # A stored fallback parse is retried, so re-uploading is how users recover from a failed LLM call.
+                if not is_fallback_parse(parsed_data):
+                    logger.info(f"Resume upload for user {user.id} matches the stored file; reusing its parse")
+                    return {
+                        "message": "This resume is unchanged. Your portfolio is already up to date.",
+                        "portfolio_id": portfolio.id,
+                        "slug": portfolio.slug,
+                        "parsed_data": parsed_data,
+                        "ai_fallback": False,
+                        "unchanged": True,
+                    }
+            else:
+                cached = await llm_cache.get("resume_upload", upload_key)
+                if cached is not None:
+                    logger.info(f"Resume upload for user {user.id} matches the stored file; replacing with its cached parse")
+                    processed = ProcessedResume(
+                        resume_text="",
+                        parsed_data=cached["parsed_data"],
+                        career_graph=cached["career_graph"],
+                        object_key=stored_object_key,
+                        content_hash=content_hash,
+                        tone=tone,
+                    )
+                    if on_stage is not None:
+                        await on_stage("saving")
+                    portfolio, parsed_data, _ = await save_parsed_resume(db, user, processed, filename, mode)
+                    return {
+                        "message": "Resume parsed successfully",
+                        "portfolio_id": portfolio.id,
+                        "slug": portfolio.slug,
+                        "parsed_data": parsed_data,
+                        "ai_fallback": False,
+                        "unchanged": False,
+                    }
+
+    async with ResumeUploadPipeline(
+        file_bytes,
+        filename,
+        user.id,
+        on_stage=on_stage,
+        content_hash=content_hash,
+        stored_object_key=stored_object_key,
+    ) as pipeline:
+        # Storage upload || extraction, then parse || career graph (LLM calls never throw)
+        processed = await pipeline.run(tone=tone)
+        if processed.ai_fallback:
+            logger.warning(f"AI parsing returned fallback (empty) data for user {user.id}")
+        else:
+            # Lets a replace-mode re-upload of this file skip extraction and the LLM.
+            await llm_cache.set(
+                "resume_upload",
+                upload_key,
+                {"parsed_data": processed.parsed_data, "career_graph": processed.career_graph},
+            )
+
+        await pipeline.stage("saving")
+        portfolio, parsed_data, previous_resume_object_key = await save_parsed_resume(
+            db, user, processed, filename, mode
+        )
+        pipeline.keep_object()
+
+    resume_object_key = processed.object_key
+    if (
+        resume_object_key
+        and previous_resume_object_key
+        and resume_object_key != previous_resume_object_key
+    ):
+        deleted = await rustfs_service.delete_file(previous_resume_object_key)
+        if not deleted:
+            logger.warning(
+                f"Uploaded a replacement resume for {user.email}, but failed to delete old object {previous_resume_object_key}"
+            )
+
+    return {
+        "message": "Resume parsed successfully" if not processed.ai_fallback else "AI parsing was limited. You can edit the data manually in the editor.",
+        "portfolio_id": portfolio.id,
+        "slug": portfolio.slug,
+        "parsed_data": parsed_data,
+        "ai_fallback": processed.ai_fallback,
+        "unchanged": False,
+    }
@@ -1,153 +1,240 @@
+import asyncio
+import functools
+import hashlib
+import mimetypes
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
 import boto3
 from botocore.client import Config
-from botocore.exceptions import ClientError
+from botocore.exceptions import BotoCoreError, ClientError
+from loguru import logger
+
 from config import get_settings
-import uuid
-import os
-import mimetypes
 
 settings = get_settings()
 
+# S3 DeleteObjects accepts at most this many keys per request.
+DELETE_BATCH_SIZE = 1000
+_MISSING_CODES = {"404", "NoSuchKey", "NotFound"}
+
+
+def resume_object_key(user_id: str, content_hash: str, filename: str) -> str:
+    """Content-addressed key: the same file uploaded twice by a user maps to one object."""
+    extension = os.path.splitext(filename)[1].lower()
+    return f"resumes/{user_id}/{content_hash}{extension}"
+
+
+def _error_code(error: ClientError) -> str:
+    return str(error.response.get("Error", {}).get("Code", ""))
+
+
 class RustFSService:
+    """S3 client for RustFS.
+
+    One boto3 client (thread-safe, with a urllib3 pool of
+    `rustfs_max_connections`) is shared by every request. Its blocking calls
+    run on a dedicated executor of the same size, so storage traffic never
+    waits behind other `to_thread` work or opens more sockets than the pool
+    holds. Retries and timeouts come from settings.
+    """
+
     def __init__(self):
         self.endpoint_url = settings.rustfs_endpoint_url
         self.access_key = settings.rustfs_access_key
         self.secret_key = settings.rustfs_secret_key
         self.bucket_name = settings.rustfs_bucket_name
+        self.max_connections = max(1, settings.rustfs_max_connections)
+        self._executor: ThreadPoolExecutor | None = None
+        self._bucket_ready = False
 
         if not self.endpoint_url or not self.access_key or not self.secret_key:
             self.s3_client = None
-            print("WARNING: RustFS credentials not fully configured.")
-        else:
-            try:
-                self.s3_client = boto3.client(
-                    's3',
-                    endpoint_url=self.endpoint_url,
-                    aws_access_key_id=self.access_key,
-                    aws_secret_access_key=self.secret_key,
-                    config=Config(signature_version='s3v4'),
-                    region_name='us-east-1' # RustFS ignores this, but boto3 needs a value
-                )
-                self._ensure_bucket_exists()
-            except Exception as e:
-                print(f"Failed to initialize RustFS client: {e}")
-                self.s3_client = None
+            logger.warning("RustFS credentials not fully configured.")
+            return
+        try:
+            self.s3_client = boto3.client(
+                "s3",
+                endpoint_url=self.endpoint_url,
+                aws_access_key_id=self.access_key,
+                aws_secret_access_key=self.secret_key,
+                config=Config(
+                    signature_version="s3v4",
+                    max_pool_connections=self.max_connections,
+                    connect_timeout=settings.rustfs_connect_timeout_seconds,
+                    read_timeout=settings.rustfs_read_timeout_seconds,
+                    retries={"total_max_attempts": settings.rustfs_max_attempts, "mode": "standard"},
+                ),
+                region_name="us-east-1",  # RustFS ignores this, but boto3 needs a value
+            )
+        except Exception as e:
+            logger.error(f"Failed to initialize RustFS client: {e}")
+            self.s3_client = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_connections, thread_name_prefix="rustfs")
+        return self._executor
 
-    def _ensure_bucket_exists(self):
-        """Ensure the target bucket exists before uploading."""
+    async def _call(self, fn: Callable[..., Any], **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), functools.partial(fn, **kwargs))
+
+    async def ensure_bucket(self) -> bool:
+        """Check (once) that the bucket exists, creating it if missing.
+
+        Called from the app lifespan rather than at import, and retried by the
+        first upload if the store was unreachable at startup.
+        """
+        if self._bucket_ready:
+            return True
         if not self.s3_client:
-            return
-        
+            return False
         try:
-            self.s3_client.head_bucket(Bucket=self.bucket_name)
+            await self._call(self.s3_client.head_bucket, Bucket=self.bucket_name)
         except ClientError as e:
-            error_code = e.response.get('Error', {}).get('Code')
-            if error_code == '404':
-                try:
-                    self.s3_client.create_bucket(Bucket=self.bucket_name)
-                    print(f"Created RustFS bucket: {self.bucket_name}")
-                except Exception as create_err:
-                    print(f"Could not create bucket {self.bucket_name}: {create_err}")
-            else:
-                print(f"Error checking bucket {self.bucket_name}: {e}")
-
-    async def upload_file(self, file_bytes: bytes, filename: str, user_id: str) -> str:
+            if _error_code(e) not in _MISSING_CODES:
+                logger.warning(f"Error checking bucket {self.bucket_name}: {e}")
+                return False
+            try:
+                await self._call(self.s3_client.create_bucket, Bucket=self.bucket_name)
+                logger.info(f"Created RustFS bucket: {self.bucket_name}")
+            except (BotoCoreError, ClientError) as create_err:
+                logger.warning(f"Could not create bucket {self.bucket_name}: {create_err}")
+                return False
+        except BotoCoreError as e:
+            logger.warning(f"RustFS unreachable while checking bucket {self.bucket_name}: {e}")
+            return False
+        self._bucket_ready = True
+        return True
+
+    async def upload_file(
+        self,
+        file_bytes: bytes,
+        filename: str,
+        user_id: str,
+        content_hash: str | None = None,
+    ) -> str:
         """
-        Upload a file bytes to RustFS (non-blocking).
+        Upload a file bytes to RustFS (non-blocking) under its content-addressed key.
         Returns the object key to store in the database.
         """
-        import asyncio
         if not self.s3_client:
             raise Exception("RustFS client not initialized. Check your credentials.")
+        await self.ensure_bucket()
 
-        # Generate a unique key
-        extension = os.path.splitext(filename)[1].lower()
-        unique_id = str(uuid.uuid4())
-        object_key = f"resumes/{user_id}/{unique_id}{extension}"
-        
+        content_hash = content_hash or hashlib.sha256(file_bytes).hexdigest()
+        object_key = resume_object_key(user_id, content_hash, filename)
         content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
 
-        def _do_upload():
-            self.s3_client.put_object(
+        try:
+            await self._call(
+                self.s3_client.put_object,
                 Bucket=self.bucket_name,
                 Key=object_key,
                 Body=file_bytes,
                 ContentType=content_type,
             )
             return object_key
+        except (BotoCoreError, ClientError) as e:
+            raise Exception(f"Failed to upload file to RustFS: {str(e)}")
 
+    async def object_exists(self, object_key: str) -> bool:
+        """Whether an object is stored under `object_key`. Errors other than "not found" are raised."""
+        if not self.s3_client:
+            raise Exception("RustFS client not initialized. Check your credentials.")
         try:
-            # Run blocking boto3 call in a thread so it doesn't block the event loop
-            await asyncio.to_thread(_do_upload)
-            return object_key
+            await self._call(self.s3_client.head_object, Bucket=self.bucket_name, Key=object_key)
+            return True
         except ClientError as e:
-            raise Exception(f"Failed to upload file to RustFS: {str(e)}")
+            if _error_code(e) in _MISSING_CODES:
+                return False
+            raise
 
     async def delete_file(self, object_key: str) -> bool:
         """Delete an object from RustFS. Returns True if deleted or already missing."""
-        import asyncio
-
         if not object_key:
             return True
         if not self.s3_client:
             return False
 
-        def _do_delete():
-            self.s3_client.delete_object(Bucket=self.bucket_name, Key=object_key)
-
         try:
-            await asyncio.to_thread(_do_delete)
+            await self._call(self.s3_client.delete_object, Bucket=self.bucket_name, Key=object_key)
             return True
         except ClientError as e:
-            error_code = e.response.get("Error", {}).get("Code")
-            if error_code in {"404", "NoSuchKey", "NotFound"}:
+            if _error_code(e) in _MISSING_CODES:
                 return True
-            print(f"Error deleting object {object_key}: {e}")
+            logger.warning(f"Error deleting object {object_key}: {e}")
+            return False
+        except BotoCoreError as e:
+            logger.warning(f"Error deleting object {object_key}: {e}")
             return False
 
     async def delete_files(self, object_keys: list[str]) -> list[str]:
-        """Delete multiple objects and return any keys that could not be removed."""
+        """Delete multiple objects and return any keys that could not be removed.
+
+        Uses DeleteObjects, one request per DELETE_BATCH_SIZE keys.
+        """
+        keys = sorted({key for key in object_keys if key})
+        if not keys:
+            return []
+        if not self.s3_client:
+            return keys
+
         failed_keys: list[str] = []
-        for object_key in {key for key in object_keys if key}:
-            if not await self.delete_file(object_key):
-                failed_keys.append(object_key)
+        for start in range(0, len(keys), DELETE_BATCH_SIZE):
+            batch = keys[start:start + DELETE_BATCH_SIZE]
+            try:
+                response = await self._call(
+                    self.s3_client.delete_objects,
+                    Bucket=self.bucket_name,
+                    Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+                )
+            except (BotoCoreError, ClientError) as e:
+                logger.warning(f"Error deleting {len(batch)} objects: {e}")
+                failed_keys.extend(batch)
+                continue
+            for error in response.get("Errors", []):
+                if error.get("Code") in _MISSING_CODES:
+                    continue
+                logger.warning(f"Error deleting object {error.get('Key')}: {error.get('Code')} {error.get('Message')}")
+                failed_keys.append(error.get("Key"))
         return failed_keys
 
     def get_presigned_url(self, object_key: str, expires_in: int = 3600) -> str:
         """
         Generate a presigned GET URL valid for `expires_in` seconds for secure downloading.
+        Signing is local, so this does not touch the network.
         """
         if not self.s3_client:
             return ""
 
         try:
-            url = self.s3_client.generate_presigned_url(
-                ClientMethod='get_object',
-                Params={'Bucket': self.bucket_name, 'Key': object_key},
-                ExpiresIn=expires_in
+            return self.s3_client.generate_presigned_url(
+                ClientMethod="get_object",
+                Params={"Bucket": self.bucket_name, "Key": object_key},
+                ExpiresIn=expires_in,
             )
-            return url
         except ClientError as e:
-            print(f"Error generating presigned URL: {e}")
+            logger.warning(f"Error generating presigned URL: {e}")
             return ""
 
     async def check_health(self) -> bool:
         """Verify RustFS connectivity by checking if the bucket is accessible."""
         if not self.s3_client:
             return False
-        
-        import asyncio
-        def _do_check():
-            try:
-                self.s3_client.head_bucket(Bucket=self.bucket_name)
-                return True
-            except Exception:
-                return False
-
         try:
-            return await asyncio.to_thread(_do_check)
+            await self._call(self.s3_client.head_bucket, Bucket=self.bucket_name)
+            return True
         except Exception:
             return False
 
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
 # Initialize global instance
 rustfs_service = RustFSService()
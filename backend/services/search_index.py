@@ -0,0 +1,430 @@
+import re
+import secrets
+from datetime import datetime
+from typing import Any, Iterable
+
+from sqlalchemy import Float, String, delete, func, insert, inspect, literal_column, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from models.portfolio import LOAD_CONTENT, Portfolio
+from models.portfolio_search import PortfolioSearch
+from models.portfolio_skill import PortfolioSkill
+from config import get_settings
+from models.user import User
+from services.cache import MemoryTier, RedisTier, TieredCache, make_key
+from utils.json_codec import dumps, loads
+from utils.pagination import after_key, split_page
+
+settings = get_settings()
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# parsed_data / career_graph keys that feed the search document. Contact details
+# and URLs are left out on purpose.
+_PARSED_FIELDS = ("name", "title", "tagline", "summary", "location", "skills", "projects", "experience", "education")
+_NESTED_SKIP = {"url", "github", "duration", "year"}
+_CAREER_FIELDS = ("skills", "technologies", "industries", "roles", "strengths", "top_skills", "career_level")
+
+# Lowercased spellings folded onto one canonical skill so filters and facets line up.
+SKILL_SYNONYMS = {
+    "js": "javascript",
+    "ecmascript": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "python3": "python",
+    "golang": "go",
+    "reactjs": "react",
+    "react.js": "react",
+    "vuejs": "vue",
+    "vue.js": "vue",
+    "angularjs": "angular",
+    "node": "node.js",
+    "nodejs": "node.js",
+    "nextjs": "next.js",
+    "postgres": "postgresql",
+    "psql": "postgresql",
+    "mongo": "mongodb",
+    "k8s": "kubernetes",
+    "amazon web services": "aws",
+    "gcp": "google cloud",
+    "google cloud platform": "google cloud",
+    "ms azure": "azure",
+    "microsoft azure": "azure",
+    "c sharp": "c#",
+    "cpp": "c++",
+    "ml": "machine learning",
+    "dl": "deep learning",
+    "nlp": "natural language processing",
+    "cicd": "ci/cd",
+    "tf": "tensorflow",
+    "sklearn": "scikit-learn",
+    "scikit learn": "scikit-learn",
+}
+_FACET_VALUE_MAX = 100
+# Deferred Portfolio columns the search entry is built from.
+_CONTENT_COLUMNS = ("parsed_data", "career_graph")
+
+# Ordered match ids of ranked searches, so later pages don't depend on scores
+# that move as the corpus changes. Shared across workers when Redis is set.
+# Cursors are "ranked:<query hash>:<snapshot>", so a key from one search
+# can't page through another search's snapshot.
+_RANKED_CURSOR = "ranked:"
+search_snapshots = TieredCache(
+    memory=MemoryTier(settings.search_snapshot_max_entries, 32 * 1024 * 1024),
+    redis=RedisTier(settings.redis_url, prefix="search") if settings.redis_url else None,
+    disk=None,
+    ttl=settings.search_snapshot_ttl_seconds,
+)
+
+
+def tokenize(value: str | None) -> list[str]:
+    return _TOKEN_RE.findall((value or "").lower())
+
+
+def canonical_skill(name: str | None) -> str:
+    """Lowercase, whitespace-collapsed and synonym-folded form of a skill name."""
+    key = " ".join((name or "").lower().split()).strip(" .,;:")[:_FACET_VALUE_MAX]
+    return SKILL_SYNONYMS.get(key, key)
+
+
+def _facet_key(value: str | None) -> str:
+    return " ".join((value or "").lower().split())[:_FACET_VALUE_MAX]
+
+
+def _strings(value: Any) -> Iterable[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, list):
+        for item in value:
+            yield from _strings(item)
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            if key not in _NESTED_SKIP:
+                yield from _strings(item)
+
+
+def _as_dict(value: Any) -> dict:
+    return value if isinstance(value, dict) else {}
+
+
+def build_facets(parsed: dict, career: dict) -> dict[tuple[str, str], str]:
+    """Map (facet, canonical value) -> display label for the portfolio_skills index."""
+    facets: dict[tuple[str, str], str] = {}
+
+    def add(facet: str, key: str, label: Any) -> None:
+        if key and isinstance(label, str):
+            facets.setdefault((facet, key), label.strip()[:_FACET_VALUE_MAX])
+
+    for field in (parsed.get("skills"), career.get("technologies")):
+        for skill in field if isinstance(field, list) else []:
+            if isinstance(skill, str):
+                add("skill", canonical_skill(skill), skill)
+    industries = career.get("industries")
+    for industry in industries if isinstance(industries, list) else []:
+        if isinstance(industry, str):
+            add("industry", _facet_key(industry), industry)
+    career_level = career.get("career_level")
+    if isinstance(career_level, str):
+        add("career_level", _facet_key(career_level), career_level)
+    return facets
+
+
+def build_search_entry(portfolio: Portfolio, user: User | None) -> tuple[str, dict, dict[tuple[str, str], str]]:
+    """Return (normalized search document, result card, facets) for a portfolio."""
+    parsed = _as_dict(portfolio.parsed_data)
+    career = _as_dict(portfolio.career_graph)
+    name = user.name if user else "Anonymous"
+
+    parts = [name]
+    parts += [s for field in _PARSED_FIELDS for s in _strings(parsed.get(field))]
+    parts += [s for field in _CAREER_FIELDS for s in _strings(career.get(field))]
+    document = " ".join(token for part in parts for token in tokenize(part))
+
+    card = {
+        "id": portfolio.id,
+        "slug": portfolio.slug,
+        "name": name,
+        "avatar_url": user.avatar_url if user else None,
+        "title": parsed.get("title", "Professional"),
+        "summary": (parsed.get("summary", "") or "")[:200],
+        "skills": (parsed.get("skills", []) or [])[:15],
+        "top_skills": (career.get("skills", []) or [])[:8] if career else (parsed.get("skills", []) or [])[:8],
+        "industries": career.get("industries", []) if career else [],
+        "experience_years": career.get("experience_years", 0) if career else None,
+        "career_level": career.get("career_level", "") if career else "",
+        "experience_count": len(parsed.get("experience", []) or []),
+        "project_count": len(parsed.get("projects", []) or []),
+        "updated_at": portfolio.updated_at.isoformat() if portfolio.updated_at else None,
+    }
+    return document, card, build_facets(parsed, career)
+
+
+def _dialect(db: AsyncSession) -> str:
+    return db.get_bind().dialect.name
+
+
+async def index_portfolio(db: AsyncSession, portfolio: Portfolio, user: User | None = None) -> None:
+    """Upsert the portfolio's search row in the current transaction (caller commits).
+
+    When the content columns were neither loaded nor changed (visibility,
+    publish or slug updates) only the flag and card metadata are touched;
+    otherwise the document, card and facets are rebuilt.
+    """
+    state = inspect(portfolio)
+    content_changed = state.pending or state.transient or any(
+        state.attrs[name].history.has_changes() for name in _CONTENT_COLUMNS
+    )
+    await db.flush()  # assigns ids/updated_at for new or modified portfolios
+    row = await db.get(PortfolioSearch, portfolio.id)
+    searchable = bool(portfolio.is_published and portfolio.visible_to_recruiters)
+    updated_at = portfolio.updated_at.isoformat() if portfolio.updated_at else None
+
+    unloaded = [name for name in _CONTENT_COLUMNS if name in state.unloaded]
+    if row is not None and unloaded and not content_changed:
+        card = loads(row.card)
+        card.update(slug=portfolio.slug, updated_at=updated_at)
+        row.searchable = searchable
+        row.card = dumps(card)
+        row.updated_at = portfolio.updated_at
+        return
+    if unloaded:
+        await db.refresh(portfolio, attribute_names=unloaded)
+
+    if user is None:
+        user = await db.get(User, portfolio.user_id)
+    document, card, facets = build_search_entry(portfolio, user)
+    if row is None:
+        row = PortfolioSearch(portfolio_id=portfolio.id)
+        db.add(row)
+    row.searchable = searchable
+    row.document = document
+    row.card = dumps(card)
+    row.updated_at = portfolio.updated_at
+
+    if _dialect(db) == "sqlite":
+        await db.execute(text("DELETE FROM portfolio_search_fts WHERE portfolio_id = :id"), {"id": portfolio.id})
+        await db.execute(
+            text("INSERT INTO portfolio_search_fts (portfolio_id, document) VALUES (:id, :document)"),
+            {"id": portfolio.id, "document": document},
+        )
+
+    await db.execute(delete(PortfolioSkill).where(PortfolioSkill.portfolio_id == portfolio.id))
+    if facets:
+        await db.execute(
+            insert(PortfolioSkill),
+            [
+                {"portfolio_id": portfolio.id, "facet": facet, "value": value, "label": label}
+                for (facet, value), label in facets.items()
+            ],
+        )
+
+
+async def index_user_portfolios(db: AsyncSession, user: User) -> None:
+    """Refresh search rows after a profile change (name/avatar appear on result cards)."""
+    result = await db.execute(select(Portfolio).options(*LOAD_CONTENT).where(Portfolio.user_id == user.id))
+    for portfolio in result.scalars():
+        await index_portfolio(db, portfolio, user)
+
+
+async def remove_from_index(db: AsyncSession, portfolio_ids: list[str]) -> None:
+    """Drop search rows for deleted portfolios (caller commits)."""
+    if not portfolio_ids:
+        return
+    await db.execute(delete(PortfolioSkill).where(PortfolioSkill.portfolio_id.in_(portfolio_ids)))
+    await db.execute(delete(PortfolioSearch).where(PortfolioSearch.portfolio_id.in_(portfolio_ids)))
+    if _dialect(db) == "sqlite":
+        for portfolio_id in portfolio_ids:
+            await db.execute(text("DELETE FROM portfolio_search_fts WHERE portfolio_id = :id"), {"id": portfolio_id})
+
+
+async def reindex_all(db: AsyncSession, batch_size: int = 500) -> int:
+    """Rebuild every search row from the portfolios table. Returns the number indexed."""
+    total = 0
+    last_id = ""
+    while True:
+        result = await db.execute(
+            select(Portfolio)
+            .options(*LOAD_CONTENT, joinedload(Portfolio.user))
+            .where(Portfolio.id > last_id)
+            .order_by(Portfolio.id)
+            .limit(batch_size)
+        )
+        portfolios = result.scalars().all()
+        if not portfolios:
+            return total
+        for portfolio in portfolios:
+            await index_portfolio(db, portfolio, portfolio.user)
+        await db.commit()
+        total += len(portfolios)
+        last_id = portfolios[-1].id
+        db.expunge_all()
+
+
+def _facet_filter(facet: str, values: list[str], match_all: bool = False):
+    """`portfolio_id IN (...)` against the (facet, value) index; ANY by default."""
+    ids = select(PortfolioSkill.portfolio_id).where(PortfolioSkill.facet == facet, PortfolioSkill.value.in_(values))
+    if match_all:
+        ids = ids.group_by(PortfolioSkill.portfolio_id).having(
+            func.count(PortfolioSkill.value) == len(values)
+        )
+    return PortfolioSearch.portfolio_id.in_(ids)
+
+
+async def _facet_counts(db: AsyncSession, matched, facet_limit: int) -> dict[str, list[dict]]:
+    ids = matched.with_only_columns(PortfolioSearch.portfolio_id).subquery()
+    count = func.count()
+    result = await db.execute(
+        select(PortfolioSkill.facet, PortfolioSkill.value, func.min(PortfolioSkill.label), count)
+        .join(ids, ids.c.portfolio_id == PortfolioSkill.portfolio_id)
+        .group_by(PortfolioSkill.facet, PortfolioSkill.value)
+        .order_by(count.desc(), PortfolioSkill.value)
+    )
+    facets: dict[str, list[dict]] = {"skill": [], "industry": [], "career_level": []}
+    for facet, value, label, total in result:
+        bucket = facets.setdefault(facet, [])
+        if len(bucket) < facet_limit:
+            bucket.append({"value": value, "label": label, "count": total})
+    return facets
+
+
+async def search_portfolios(
+    db: AsyncSession,
+    terms: list[str],
+    limit: int,
+    after: tuple | None = None,
+    skills: list[str] | None = None,
+    match_any_skill: bool = False,
+    industries: list[str] | None = None,
+    career_levels: list[str] | None = None,
+    facet_limit: int = 0,
+) -> tuple[list[dict], tuple | None, int | None, dict[str, list[dict]]]:
+    """Ranked, keyset-paginated search over recruiter-visible portfolios.
+
+    Every token in `terms` must match (as a prefix); with no tokens the newest
+    profiles come first. `skills` must all match (or any, with
+    `match_any_skill`) by canonical name; `industries` and `career_levels`
+    each match any listed value.
+
+    Results are ordered by (score, updated_at, portfolio_id) descending; pass
+    the returned key back as `after` for the next page. The total and, with
+    `facet_limit` > 0, the top values per facet are only computed for the
+    first page. Returns (result cards, next key, total, facets).
+
+    Without search terms the key is (updated_at, portfolio_id), so pages are a
+    plain keyset walk. Relevance scores aren't stable enough for that: bm25
+    depends on corpus-wide statistics, and both bm25 and ts_rank change when
+    a profile is edited. A score boundary between pages would skip or repeat
+    profiles. Ranked searches therefore store the ordered ids of their first
+    `search_snapshot_max_results` matches, and the key is a position in that
+    snapshot. The trade-offs:
+      - Later pages keep the first page's order. They drop profiles that
+        stopped being searchable, but don't pick up new matches.
+      - Paging stops after search_snapshot_max_results matches, though
+        `total` counts all of them.
+      - A snapshot that expired, or (without Redis) lives on another worker,
+        is ranked again. That can shift results by whatever changed since
+        the first page.
+    Ranked keys carry a hash of the terms and filters, so a key only pages
+    the search it came from. Raises ValueError for a key that doesn't fit the
+    query.
+    """
+    tokens = [token for term in terms for token in tokenize(term)]
+    skill_keys = sorted({key for key in map(canonical_skill, skills or []) if key})
+    industry_keys = sorted({key for key in map(_facet_key, industries or []) if key})
+    level_keys = sorted({key for key in map(_facet_key, career_levels or []) if key})
+
+    filters = [PortfolioSearch.searchable.is_(True)]
+    if skill_keys:
+        filters.append(_facet_filter("skill", skill_keys, match_all=not match_any_skill))
+    if industry_keys:
+        filters.append(_facet_filter("industry", industry_keys))
+    if level_keys:
+        filters.append(_facet_filter("career_level", level_keys))
+
+    if not tokens:
+        base = select(PortfolioSearch.card).where(*filters)
+    elif _dialect(db) == "postgresql":
+        # Generated tsvector column + GIN index; every token must match as a prefix.
+        tsquery = func.to_tsquery("simple", " & ".join(f"{token}:*" for token in tokens))
+        document_tsv = literal_column("portfolio_search.document_tsv")
+        score = func.ts_rank(document_tsv, tsquery, type_=Float)
+        base = select(PortfolioSearch.card).where(document_tsv.op("@@")(tsquery), *filters)
+    else:
+        # SQLite FTS5: implicit AND of quoted prefix terms; bm25 is lower-is-better, so negate it.
+        fts = (
+            text(
+                "SELECT portfolio_id, bm25(portfolio_search_fts) AS bm25 "
+                "FROM portfolio_search_fts WHERE portfolio_search_fts MATCH :match"
+            )
+            .bindparams(match=" ".join(f'"{token}"*' for token in tokens))
+            .columns(portfolio_id=String, bm25=Float)
+            .subquery("fts")
+        )
+        score = -fts.c.bm25
+        base = (
+            select(PortfolioSearch.card)
+            .join(fts, fts.c.portfolio_id == PortfolioSearch.portfolio_id)
+            .where(*filters)
+        )
+
+    if tokens:
+        query_hash = make_key(tokens, skill_keys, match_any_skill, industry_keys, level_keys)[:16]
+        cards, next_key = await _ranked_page(db, base, score, limit, after, query_hash)
+    else:
+        keys = (PortfolioSearch.updated_at, PortfolioSearch.portfolio_id)
+        page = base.add_columns(*keys)
+        if after is not None:
+            if len(after) != len(keys) or not isinstance(after[0], datetime):
+                raise ValueError("cursor does not belong to this search")
+            page = page.where(after_key(keys, after))
+        rows = (await db.execute(page.order_by(*(key.desc() for key in keys)).limit(limit + 1))).all()
+        rows, next_key = split_page(rows, limit, lambda row: row[1:])
+        cards = [loads(row[0]) for row in rows]
+
+    if after is not None:
+        return cards, next_key, None, {}
+    total = await db.scalar(select(func.count()).select_from(base.subquery())) or 0
+    facets = await _facet_counts(db, base, facet_limit) if facet_limit > 0 else {}
+    return cards, next_key, total, facets
+
+
+async def _ranked_page(
+    db: AsyncSession, base, score, limit: int, after: tuple | None, query_hash: str
+) -> tuple[list[dict], tuple | None]:
+    """One page of a ranked search, read from (or starting) its id snapshot.
+
+    Raises ValueError when `after` came from a search with other terms or filters.
+    """
+    if after is None:
+        snapshot, offset = f"{query_hash}:{secrets.token_urlsafe(16)}", 0
+    else:
+        position, offset = after if len(after) == 2 else (None, None)
+        if not isinstance(position, str) or not position.startswith(_RANKED_CURSOR) or not isinstance(offset, int) or offset < 0:
+            raise ValueError("cursor does not belong to this search")
+        snapshot = position.removeprefix(_RANKED_CURSOR)
+        if snapshot.partition(":")[0] != query_hash:
+            raise ValueError("cursor does not belong to this search")
+
+    ids = await search_snapshots.get("ranked", snapshot) if after is not None else None
+    if ids is None:
+        ranked = base.add_columns(
+            score.label("score"), PortfolioSearch.updated_at, PortfolioSearch.portfolio_id
+        ).subquery()
+        ids = list((await db.scalars(
+            select(ranked.c.portfolio_id)
+            .order_by(ranked.c.score.desc(), ranked.c.updated_at.desc(), ranked.c.portfolio_id.desc())
+            .limit(settings.search_snapshot_max_results)
+        )).all())
+        if len(ids) > offset + limit:
+            await search_snapshots.set("ranked", snapshot, ids)
+
+    page_ids = ids[offset:offset + limit]
+    rows = await db.execute(
+        select(PortfolioSearch.portfolio_id, PortfolioSearch.card)
+        .where(PortfolioSearch.portfolio_id.in_(page_ids), PortfolioSearch.searchable.is_(True))
+    ) if page_ids else []
+    cards_by_id = {portfolio_id: card for portfolio_id, card in rows}
+    cards = [loads(cards_by_id[portfolio_id]) for portfolio_id in page_ids if portfolio_id in cards_by_id]
+    next_key = (_RANKED_CURSOR + snapshot, offset + limit) if len(ids) > offset + limit else None
+    return cards, next_key
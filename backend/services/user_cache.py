@@ -0,0 +1,179 @@
+"""Short-TTL cache of the user rows behind authenticated requests.
+
+get_current_user would otherwise SELECT the same row on every request. Only
+non-secret columns are cached (no password hash or refresh token); callers
+that need those refresh them from the database.
+"""
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from loguru import logger
+from sqlalchemy import DateTime
+from sqlalchemy.orm import make_transient_to_detached
+
+from config import get_settings
+from models.user import User
+from utils.json_codec import dumps, loads
+
+settings = get_settings()
+
+_SECRET_COLUMNS = {"hashed_password", "refresh_token"}
+_COLUMNS = [column for column in User.__table__.columns if column.key not in _SECRET_COLUMNS]
+_DATETIME_COLUMNS = {column.key for column in _COLUMNS if isinstance(column.type, DateTime)}
+
+# SET the snapshot only if the user's generation is still the one read before
+# the database query; invalidate bumps it, so a fill that raced it is dropped.
+_SET_IF_CURRENT = """
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+
+def snapshot(user: User) -> dict:
+    """The cacheable column values of `user`, JSON-compatible."""
+    row = {}
+    for column in _COLUMNS:
+        value = getattr(user, column.key)
+        row[column.key] = value.isoformat() if isinstance(value, datetime) else value
+    return row
+
+
+def hydrate(row: dict) -> User:
+    """A detached User built from a snapshot, ready for `session.merge(user, load=False)`.
+
+    The secret columns are left unloaded.
+    """
+    values = {
+        key: datetime.fromisoformat(value) if key in _DATETIME_COLUMNS and value else value
+        for key, value in row.items()
+    }
+    user = User(**values)
+    make_transient_to_detached(user)
+    return user
+
+
+class UserCache:
+    """Process-local LRU of user snapshots, backed by Redis when redis_url is set.
+
+    Writes that change a cached column call `invalidate`, which drops the entry
+    here and in Redis. Other instances' memory tiers converge within `ttl`.
+
+    A fill takes a `generation` before reading the row and hands it to `set`,
+    which skips the write if the user was invalidated in between; otherwise a
+    snapshot read before an invalidation could repopulate the cache after it.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, redis_url: str = "") -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._redis_url = redis_url
+        self._client = None
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        # Any local invalidation voids the fills in flight: coarse, but never stale.
+        self._invalidations = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _get_client(self):
+        if self._client is None:
+            import redis.asyncio as redis  # type: ignore
+
+            self._client = redis.from_url(self._redis_url, decode_responses=True)
+        return self._client
+
+    async def get(self, user_id: str) -> dict | None:
+        entry = self._entries.get(user_id)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry[1]
+        if entry is not None:
+            del self._entries[user_id]
+
+        if self._redis_url:
+            try:
+                payload = await self._get_client().get(f"user:{user_id}")
+            except Exception as e:
+                logger.warning(f"Redis user cache get failed: {e}")
+                payload = None
+            if payload is not None:
+                row = loads(payload)
+                self._remember(user_id, row)
+                self.hits += 1
+                return row
+
+        self.misses += 1
+        return None
+
+    async def generation(self, user_id: str) -> tuple[int, str | None]:
+        """Token to pass to `set` for a row read from the database after this call."""
+        remote = None
+        if self._redis_url:
+            try:
+                remote = await self._get_client().get(f"user-gen:{user_id}") or "0"
+            except Exception as e:
+                logger.warning(f"Redis user cache generation failed: {e}")
+        return self._invalidations, remote
+
+    async def set(self, user: User, generation: tuple[int, str | None] | None = None) -> None:
+        """Cache `user`, unless it was invalidated since `generation` was taken."""
+        local, remote = generation if generation is not None else (self._invalidations, None)
+        if local != self._invalidations:
+            return
+        row = snapshot(user)
+        if self._redis_url:
+            payload, ex = dumps(row), max(int(self.ttl), 1)
+            try:
+                if generation is None:
+                    await self._get_client().set(f"user:{user.id}", payload, ex=ex)
+                elif remote is None or not await self._get_client().eval(
+                    _SET_IF_CURRENT, 2, f"user:{user.id}", f"user-gen:{user.id}", remote, payload, ex
+                ):
+                    return
+            except Exception as e:
+                logger.warning(f"Redis user cache set failed: {e}")
+        if local == self._invalidations:
+            self._remember(user.id, row)
+
+    async def invalidate(self, user_id: str) -> None:
+        self._invalidations += 1
+        self._entries.pop(user_id, None)
+        if self._redis_url:
+            try:
+                async with self._get_client().pipeline(transaction=True) as pipe:
+                    pipe.delete(f"user:{user_id}")
+                    pipe.incr(f"user-gen:{user_id}")
+                    pipe.expire(f"user-gen:{user_id}", max(int(self.ttl), 1) * 10)
+                    await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Redis user cache delete failed: {e}")
+
+    def _remember(self, user_id: str, row: dict) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[user_id] = (time.monotonic() + self.ttl, row)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "redis_enabled": bool(self._redis_url),
+        }
+
+
+user_cache = UserCache(
+    max_entries=settings.user_cache_max_entries,
+    ttl=settings.user_cache_ttl_seconds,
+    redis_url=settings.redis_url,
+)
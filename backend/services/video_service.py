@@ -1,9 +1,7 @@
-import json
-from groq import AsyncGroq
 from loguru import logger
-from config import get_settings
-
-settings = get_settings()
+from services.cache import llm_cache, make_key
+from services.llm_client import get_groq_client
+from utils.json_codec import dumps, loads
 
 SCRIPT_PROMPT = """You are a video production scriptwriter. Create a professional portfolio video script for the candidate.
 
@@ -54,8 +52,9 @@ async def generate_video_script(
     tone: str,
     parsed_data: dict,
     career_graph: dict,
+    use_cache: bool = False,
 ) -> dict:
-    """Generate a video portfolio script from portfolio data."""
+    """Generate a video portfolio script from portfolio data. Set `use_cache` to reuse identical prior scripts."""
     profile = {
         "title": parsed_data.get("title", "Professional"),
         "summary": (parsed_data.get("summary", "") or "")[:500],
@@ -80,9 +79,15 @@ async def generate_video_script(
         "career_level": career_graph.get("career_level", "") if career_graph else "",
     }
 
-    client = AsyncGroq(api_key=settings.groq_api_key)
+    cache_key = make_key(duration_seconds, tone, profile)
+    if use_cache:
+        cached = await llm_cache.get("video_script", cache_key)
+        if cached is not None:
+            return cached
+
+    client = get_groq_client()
     prompt = SCRIPT_PROMPT.format(
-        profile=json.dumps(profile, indent=2),
+        profile=dumps(profile, indent=True),
         duration_seconds=duration_seconds,
         tone=tone,
     )
@@ -105,7 +110,10 @@ async def generate_video_script(
                 raw = raw[4:]
             raw = raw.strip()
 
-        return json.loads(raw)
+        script = loads(raw)
+        if use_cache:
+            await llm_cache.set("video_script", cache_key, script)
+        return script
     except Exception as e:
         logger.error(f"Video script generation failed: {e}")
         return {"error": str(e), "scenes": []}
@@ -0,0 +1,150 @@
+import asyncio
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+
+from loguru import logger
+from sqlalchemy import func, insert, select, update
+
+from config import get_settings
+from database import AsyncSessionLocal
+from models.page_view import PageView
+from models.portfolio import Portfolio
+from services.analytics_service import apply_rollup
+from services.public_cache import public_portfolio_cache
+
+settings = get_settings()
+
+
+class ViewBuffer:
+    """In-process buffer for public page views.
+
+    Public portfolio reads call `record()`, which only appends to memory. A
+    background task flushes every `flush_interval` seconds (or as soon as
+    `max_pending` views are waiting): all PageView rows go in one multi-row
+    INSERT, the `page_view_daily` rollup is upserted in the same transaction,
+    and each portfolio's `view_count` gets a single aggregated `view_count + n`
+    UPDATE. `stop()` performs a final flush on shutdown.
+
+    If a flush fails the batch is put back and retried, but at most
+    `max_backlog` views are held so a database outage cannot grow memory unbounded.
+    """
+
+    def __init__(self, flush_interval: float, max_pending: int, max_backlog: int) -> None:
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_backlog = max_backlog
+        self._rows: list[dict] = []
+        self._counts: Counter[str] = Counter()
+        self._lock = asyncio.Lock()
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self.dropped = 0
+
+    def record(
+        self,
+        portfolio_id: str,
+        referrer: str | None,
+        user_agent: str | None,
+        ip_address: str | None,
+        visitor_type: str,
+        intent_score: int,
+        device_class: str | None = None,
+        referrer_source: str | None = None,
+    ) -> None:
+        if len(self._rows) >= self.max_backlog:
+            self.dropped += 1
+            return
+        self._rows.append({
+            "id": str(uuid.uuid4()),
+            "portfolio_id": portfolio_id,
+            "viewed_at": datetime.now(timezone.utc),
+            "referrer": referrer,
+            "user_agent": user_agent,
+            "ip_address": ip_address,
+            "visitor_type": visitor_type,
+            "intent_score": intent_score,
+            "device_class": device_class,
+            "referrer_source": referrer_source,
+        })
+        self._counts[portfolio_id] += 1
+        if len(self._rows) >= self.max_pending and self._wakeup is not None:
+            self._wakeup.set()
+
+    def pending_for(self, portfolio_id: str) -> int:
+        """Views recorded for a portfolio that are not yet in `view_count`."""
+        return self._counts.get(portfolio_id, 0)
+
+    @property
+    def pending(self) -> int:
+        return len(self._rows)
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="view-buffer-flusher")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            self._wakeup = None
+        await self.flush()
+        if self._rows:
+            logger.warning(f"Discarding {len(self._rows)} buffered page views on shutdown")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Write buffered views to the database. Returns the number of rows written."""
+        async with self._lock:
+            if not self._rows:
+                return 0
+            rows, self._rows = self._rows, []
+            counts, self._counts = self._counts, Counter()
+            try:
+                async with AsyncSessionLocal() as db:
+                    # Portfolios deleted since the view was recorded would violate the FK.
+                    existing = set(
+                        (await db.execute(select(Portfolio.id).where(Portfolio.id.in_(list(counts))))).scalars()
+                    )
+                    rows = [row for row in rows if row["portfolio_id"] in existing]
+                    if rows:
+                        await db.execute(insert(PageView), rows)
+                        await apply_rollup(db, rows)
+                    for portfolio_id, count in counts.items():
+                        if portfolio_id in existing:
+                            await db.execute(
+                                update(Portfolio)
+                                .where(Portfolio.id == portfolio_id)
+                                .values(view_count=func.coalesce(Portfolio.view_count, 0) + count)
+                                .execution_options(synchronize_session=False)
+                            )
+                    await db.commit()
+                public_portfolio_cache.add_views({pid: n for pid, n in counts.items() if pid in existing})
+                return len(rows)
+            except Exception:
+                logger.exception(f"Failed to flush {len(rows)} page views; will retry")
+                keep = max(0, self.max_backlog - len(self._rows))
+                self.dropped += max(0, len(rows) - keep)
+                retry = rows[:keep]
+                self._rows = retry + self._rows
+                for row in retry:
+                    self._counts[row["portfolio_id"]] += 1
+                return 0
+
+
+view_buffer = ViewBuffer(
+    flush_interval=settings.view_buffer_flush_seconds,
+    max_pending=settings.view_buffer_max_pending,
+    max_backlog=settings.view_buffer_max_backlog,
+)
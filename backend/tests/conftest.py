@@ -9,6 +9,7 @@ def pytest_configure(config):
 
 
 import pytest
+import pytest_asyncio
 
 
 @pytest.fixture
@@ -49,3 +50,17 @@ def sample_pdf_bytes():
 @pytest.fixture
 def empty_pdf_bytes():
     return b""
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    """Session factory bound to a fresh SQLite database with every table created."""
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from database import Base
+    from models import audit_log, page_view, page_view_daily, portfolio, portfolio_search, portfolio_role_version, portfolio_skill, portfolio_version, resume_job, user  # noqa: F401
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
@@ -1,5 +1,22 @@
 import pytest
-from services.analytics_service import classify_visitor, is_mobile, clean_referrer
+import pytest_asyncio
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select
+
+from models.page_view import PageView
+from models.portfolio import Portfolio
+from models.user import User
+from services.analytics_service import (
+    backfill_view_columns,
+    classify_device,
+    classify_visitor,
+    clean_referrer,
+    get_basic_analytics,
+    get_enhanced_analytics,
+    intent_bucket,
+    is_mobile,
+    rebuild_rollup,
+)
 
 
 class TestClassifyVisitor:
@@ -145,3 +162,72 @@ class TestCleanReferrer:
     def test_malformed_url(self):
         result = clean_referrer("not a url at all")
         assert result == "Other"
+
+
+@pytest_asyncio.fixture
+async def seeded(session_factory):
+    now = datetime.now(timezone.utc)
+    async with session_factory() as db:
+        db.add(User(id="u1", email="jane@example.com", name="Jane"))
+        db.add(Portfolio(id="p1", user_id="u1", slug="jane"))
+        views = [
+            ("https://linkedin.com/recruiter/x", "Mozilla/5.0", "1.1.1.1", now),
+            ("https://linkedin.com/recruiter/y", "Mozilla/5.0 (iPhone)", "1.1.1.1", now),
+            ("direct", "Mozilla/5.0", "2.2.2.2", now - timedelta(days=2)),
+            ("https://github.com/jane", "Googlebot/2.1", "3.3.3.3", now - timedelta(days=40)),
+        ]
+        for referrer, user_agent, ip, viewed_at in views:
+            visitor_type, score = classify_visitor(user_agent, referrer)
+            db.add(PageView(
+                portfolio_id="p1", referrer=referrer, user_agent=user_agent, ip_address=ip,
+                visitor_type=visitor_type, intent_score=score, viewed_at=viewed_at,
+            ))
+        await db.commit()
+        assert await rebuild_rollup(db) == 4
+    return session_factory
+
+
+class TestRollupAnalytics:
+    def test_classify_device(self):
+        assert classify_device("Mozilla/5.0 (iPhone; CPU iPhone OS 17_0)") == "mobile"
+        assert classify_device("Mozilla/5.0 (Windows NT 10.0)") == "desktop"
+        assert classify_device(None) == "desktop"
+
+    def test_intent_bucket(self):
+        assert intent_bucket(95) == "high"
+        assert intent_bucket(50) == "medium"
+        assert intent_bucket(10) == "low"
+        assert intent_bucket(0) == "none"
+        assert intent_bucket(None) == "none"
+
+    @pytest.mark.asyncio
+    async def test_enhanced_analytics_from_rollup(self, seeded):
+        async with seeded() as db:
+            analytics = await get_enhanced_analytics("p1", db)
+        assert analytics["total_views"] == 4
+        assert sum(d["views"] for d in analytics["daily_views_30d"]) == 3
+        assert analytics["daily_views_30d"][-1]["views"] == 2
+        assert analytics["segments"][0] == {"type": "recruiter", "count": 2}
+        assert analytics["intent"]["high"] == 3
+        assert analytics["intent"]["total_scored"] == 3
+        assert analytics["devices"] == {"mobile": 1, "desktop": 2}
+        assert analytics["referrers"][0] == {"source": "LinkedIn", "count": 2}
+        assert analytics["repeat_visitors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_rebuild_is_idempotent(self, seeded):
+        async with seeded() as db:
+            await rebuild_rollup(db, "p1")
+            basic = await get_basic_analytics("p1", db)
+        assert basic["total_views"] == 4
+        assert len(basic["daily_views"]) == 7
+        assert basic["devices"] == {"mobile": 1, "desktop": 2}
+
+    @pytest.mark.asyncio
+    async def test_backfill_view_columns(self, seeded):
+        async with seeded() as db:
+            assert await backfill_view_columns(db, batch_size=3) == 4
+            assert await backfill_view_columns(db) == 0
+            rows = (await db.execute(select(PageView.device_class, PageView.referrer_source))).all()
+        assert ("mobile", "LinkedIn") in rows
+        assert ("desktop", "Direct") in rows
@@ -1,35 +1,174 @@
+import os
+import time
+
 import pytest
-from services.cache import get_cached_parse, set_cached_parse
+from services.cache import (
+    DiskTier,
+    MemoryTier,
+    TieredCache,
+    get_cached_parse,
+    make_key,
+    set_cached_parse,
+)
 
 
 class TestResumeCache:
-    def test_cache_miss_returns_none(self):
-        result = get_cached_parse("some resume text", "professional")
+    @pytest.mark.asyncio
+    async def test_cache_miss_returns_none(self):
+        result = await get_cached_parse("some resume text", "professional")
         assert result is None
 
-    def test_cache_set_and_get(self):
+    @pytest.mark.asyncio
+    async def test_cache_set_and_get(self):
         text = "unique resume content abc123"
         data = {"name": "Test User", "skills": ["Python"]}
-        set_cached_parse(text, "professional", data)
+        await set_cached_parse(text, "professional", data)
 
-        cached = get_cached_parse(text, "professional")
+        cached = await get_cached_parse(text, "professional")
         assert cached == data
 
-    def test_cache_different_tone_is_different(self):
+    @pytest.mark.asyncio
+    async def test_cache_different_tone_is_different(self):
         text = "same resume content"
-        set_cached_parse(text, "professional", {"name": "Pro"})
-        set_cached_parse(text, "creative", {"name": "Creative"})
+        await set_cached_parse(text, "professional", {"name": "Pro"})
+        await set_cached_parse(text, "creative", {"name": "Creative"})
 
-        pro = get_cached_parse(text, "professional")
-        creative = get_cached_parse(text, "creative")
+        pro = await get_cached_parse(text, "professional")
+        creative = await get_cached_parse(text, "creative")
         assert pro == {"name": "Pro"}
         assert creative == {"name": "Creative"}
 
-    def test_cache_different_text_is_different(self):
-        set_cached_parse("resume A", "professional", {"name": "Alice"})
-        set_cached_parse("resume B", "professional", {"name": "Bob"})
+    @pytest.mark.asyncio
+    async def test_cache_different_text_is_different(self):
+        await set_cached_parse("resume A", "professional", {"name": "Alice"})
+        await set_cached_parse("resume B", "professional", {"name": "Bob"})
 
-        a = get_cached_parse("resume A", "professional")
-        b = get_cached_parse("resume B", "professional")
+        a = await get_cached_parse("resume A", "professional")
+        b = await get_cached_parse("resume B", "professional")
         assert a == {"name": "Alice"}
         assert b == {"name": "Bob"}
+
+    @pytest.mark.asyncio
+    async def test_returned_value_is_a_copy(self):
+        await set_cached_parse("copy test", "professional", {"skills": ["Python"]})
+        first = await get_cached_parse("copy test", "professional")
+        first["skills"].append("Mutated")
+        second = await get_cached_parse("copy test", "professional")
+        assert second == {"skills": ["Python"]}
+
+
+class TestMemoryTier:
+    def test_evicts_least_recently_used_by_count(self):
+        tier = MemoryTier(max_entries=2, max_bytes=10_000)
+        tier.set("a", '"1"', 60)
+        tier.set("b", '"2"', 60)
+        tier.get("a")
+        tier.set("c", '"3"', 60)
+        assert tier.get("a") == '"1"'
+        assert tier.get("b") is None
+        assert tier.get("c") == '"3"'
+
+    def test_evicts_by_total_bytes(self):
+        tier = MemoryTier(max_entries=100, max_bytes=10)
+        tier.set("a", "x" * 6, 60)
+        tier.set("b", "y" * 6, 60)
+        assert tier.get("a") is None
+        assert tier.size_bytes == 6
+
+    def test_budget_counts_encoded_bytes(self):
+        tier = MemoryTier(max_entries=100, max_bytes=10)
+        tier.set("a", "é" * 4, 60)
+        assert tier.size_bytes == 8
+        tier.set("b", "é" * 6, 60)  # 12 bytes, though only 6 characters
+        assert tier.get("b") is None
+
+    def test_expired_entry_is_a_miss(self):
+        tier = MemoryTier(max_entries=10, max_bytes=1000)
+        tier.set("a", '"1"', -1)
+        assert tier.get("a") is None
+        assert len(tier) == 0
+
+
+class TestTieredCache:
+    @pytest.mark.asyncio
+    async def test_namespaces_are_isolated(self):
+        cache = TieredCache(MemoryTier(10, 10_000), redis=None, disk=None)
+        await cache.set("branding", "k", "bio")
+        assert await cache.get("content", "k") is None
+        assert await cache.get("branding", "k") == "bio"
+
+    @pytest.mark.asyncio
+    async def test_disk_hit_is_promoted_to_memory(self, tmp_path):
+        disk = DiskTier(tmp_path, max_bytes=1_000_000)
+        writer = TieredCache(MemoryTier(10, 10_000), redis=None, disk=disk)
+        await writer.set("resume_parse", "k", {"name": "Disk"})
+
+        reader = TieredCache(MemoryTier(10, 10_000), redis=None, disk=disk)
+        assert await reader.get("resume_parse", "k") == {"name": "Disk"}
+        assert await reader.get("resume_parse", "k") == {"name": "Disk"}
+        stats = reader.stats()["namespaces"]["resume_parse"]
+        assert stats["disk_hits"] == 1
+        assert stats["memory_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_non_json_value_is_not_cached(self):
+        cache = TieredCache(MemoryTier(10, 10_000), redis=None, disk=None)
+        await cache.set("branding", "k", {"client": object()})
+        assert await cache.get("branding", "k") is None
+        assert cache.stats()["namespaces"]["branding"]["sets"] == 0
+
+    @pytest.mark.asyncio
+    async def test_miss_is_counted(self):
+        cache = TieredCache(MemoryTier(10, 10_000), redis=None, disk=None)
+        await cache.get("career_graph", "missing")
+        assert cache.stats()["namespaces"]["career_graph"]["misses"] == 1
+
+    def test_disk_eviction_respects_byte_budget(self, tmp_path):
+        disk = DiskTier(tmp_path, max_bytes=500)
+        for i in range(10):
+            disk._write(f"ns:{i}", '"' + "x" * 100 + '"')
+        removed = disk.evict()
+        assert removed > 0
+        total = sum(p.stat().st_size for p in tmp_path.glob("*/*.json"))
+        assert total <= 500
+
+    def test_concurrent_writes_of_one_key_do_not_collide(self, tmp_path):
+        from concurrent.futures import ThreadPoolExecutor
+
+        disk = DiskTier(tmp_path, max_bytes=1_000_000)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda i: disk._write("ns:k", f'{{"v": {i}}}'), range(200)))
+        assert disk._read("ns:k", ttl=60) is not None
+        assert list(tmp_path.glob("**/*.tmp")) == []
+
+    @pytest.mark.asyncio
+    async def test_legacy_flat_files_are_adopted_and_evictable(self, tmp_path):
+        key = make_key("resume text", "professional")
+        legacy = tmp_path / f"{key}.json"
+        legacy.write_text('{"cached_at": %f, "result": {"name": "Old"}}' % time.time(), encoding="utf-8")
+        disk = DiskTier(tmp_path, max_bytes=1_000_000)
+        cache = TieredCache(MemoryTier(10, 10_000), redis=None, disk=disk)
+        assert await cache.get("resume_parse", key) == {"name": "Old"}
+        assert not legacy.exists()
+        assert (tmp_path / "resume_parse" / f"{key}.json").exists()
+
+        graph_key = make_key("resume text", "_career_graph")
+        (tmp_path / f"{graph_key}.json").write_text(
+            '{"cached_at": %f, "result": {"roles": []}}' % time.time(), encoding="utf-8"
+        )
+        assert await cache.get("career_graph", graph_key) == {"roles": []}
+        assert (tmp_path / "career_graph" / f"{graph_key}.json").exists()
+
+        orphan = tmp_path / ("0" * 64 + ".json")
+        orphan.write_text("x" * 200, encoding="utf-8")
+        os.utime(orphan, (0, 0))
+        assert DiskTier(tmp_path, max_bytes=100).evict() >= 1
+        assert not orphan.exists()
+
+
+class TestMakeKey:
+    def test_stable_for_dicts(self):
+        assert make_key({"a": 1, "b": 2}) == make_key({"b": 2, "a": 1})
+
+    def test_parts_matter(self):
+        assert make_key("text", "professional") != make_key("text", "creative")
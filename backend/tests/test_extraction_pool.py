@@ -0,0 +1,40 @@
+import time
+import pytest
+
+from services.extraction_pool import ExtractionPool
+from services.parser import extract_text
+
+
+class TestExtractionPool:
+    @pytest.mark.asyncio
+    async def test_runs_in_worker_process(self):
+        pool = ExtractionPool(max_workers=1, timeout=30, memory_limit_mb=0)
+        try:
+            assert await pool.run(abs, -3) == 3
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_timeout_raises_value_error_and_pool_recovers(self):
+        pool = ExtractionPool(max_workers=1, timeout=1, memory_limit_mb=0)
+        try:
+            with pytest.raises(ValueError, match="timed out"):
+                await pool.run(time.sleep, 10)
+            # The hung worker was terminated and a fresh one serves the next document.
+            assert await pool.run(abs, -5) == 5
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_extractor_errors_propagate(self):
+        pool = ExtractionPool(max_workers=1, timeout=30, memory_limit_mb=0)
+        try:
+            with pytest.raises(ValueError, match="Unsupported file type"):
+                await pool.run(extract_text, b"data", "resume.txt")
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_thread_mode_when_pool_disabled(self):
+        pool = ExtractionPool(max_workers=0, timeout=5, memory_limit_mb=0)
+        assert await pool.run(abs, -7) == 7
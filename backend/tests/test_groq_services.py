@@ -82,16 +82,16 @@ def sample_career_graph():
 
 @pytest.fixture
 def mock_groq():
-    """Create a mock AsyncGroq client that returns JSON response."""
-    with patch("services.content_service.AsyncGroq") as mock, \
-         patch("services.achievement_service.AsyncGroq") as mock2, \
-         patch("services.branding_service.AsyncGroq") as mock3, \
-         patch("services.copilot_service.AsyncGroq") as mock4, \
-         patch("services.dynamic_portfolio_service.AsyncGroq") as mock5, \
-         patch("services.interview_service.AsyncGroq") as mock6, \
-         patch("services.job_matching_service.AsyncGroq") as mock7, \
-         patch("services.resume_optimizer.AsyncGroq") as mock8, \
-         patch("services.video_service.AsyncGroq") as mock9:
+    """Mock the shared Groq client so each service returns a JSON response."""
+    with patch("services.content_service.get_groq_client") as mock, \
+         patch("services.achievement_service.get_groq_client") as mock2, \
+         patch("services.branding_service.get_groq_client") as mock3, \
+         patch("services.copilot_service.get_groq_client") as mock4, \
+         patch("services.dynamic_portfolio_service.get_groq_client") as mock5, \
+         patch("services.interview_service.get_groq_client") as mock6, \
+         patch("services.job_matching_service.get_groq_client") as mock7, \
+         patch("services.resume_optimizer.get_groq_client") as mock8, \
+         patch("services.video_service.get_groq_client") as mock9:
         mock_instances = [m.return_value for m in [mock, mock2, mock3, mock4, mock5, mock6, mock7, mock8, mock9]]
         for inst in mock_instances:
             inst.chat.completions.create = AsyncMock()
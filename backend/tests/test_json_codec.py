@@ -0,0 +1,57 @@
+import json
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+
+from utils.json_codec import FastJSONResponse, JSONDecodeError, clone, dumpb, dumps, loads
+
+
+class TestCodec:
+    def test_matches_stdlib_for_plain_documents(self):
+        doc = {"name": "Zoë", "skills": ["Python", "SQL"], "years": 7, "score": 0.5, "remote": True, "link": None}
+        assert loads(dumpb(doc)) == doc
+        assert json.loads(dumps(doc)) == doc
+        assert "Zoë" in dumps(doc)
+
+    def test_encodes_known_types(self):
+        stamp = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        value = uuid.UUID(int=1)
+        assert loads(dumpb({"at": stamp, "id": value, 2: {"a"}, "price": Decimal("1.10")})) == {
+            "at": "2026-01-02T03:04:05+00:00",
+            "id": str(value),
+            "2": ["a"],
+            "price": "1.10",
+        }
+
+    def test_rejects_unknown_types_unless_asked(self):
+        class Opaque:
+            def __str__(self):
+                return "opaque"
+
+        with pytest.raises(TypeError):
+            dumps({"value": Opaque()})
+        assert dumps({"value": Opaque(), "tags": {"a"}}, default=str) == '{"value":"opaque","tags":["a"]}'
+
+    def test_options(self):
+        assert dumps({"b": 1, "a": 2}, sort_keys=True) == '{"a":2,"b":1}'
+        assert dumps({"a": 1}, indent=True) == '{\n  "a": 1\n}'
+
+    def test_decode_error_is_a_value_error(self):
+        with pytest.raises(JSONDecodeError):
+            loads("{not json")
+        assert issubclass(JSONDecodeError, json.JSONDecodeError)
+        assert issubclass(JSONDecodeError, ValueError)
+
+    def test_clone_is_deep(self):
+        doc = {"experience": [{"role": "Engineer", "bullets": ["a"]}]}
+        copied = clone(doc)
+        copied["experience"][0]["bullets"].append("b")
+        assert doc == {"experience": [{"role": "Engineer", "bullets": ["a"]}]}
+
+
+def test_response_renders_compact_utf8():
+    response = FastJSONResponse({"name": "Zoë", "count": 2})
+    assert response.body == '{"name":"Zoë","count":2}'.encode()
+    assert response.media_type == "application/json"
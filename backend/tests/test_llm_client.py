@@ -0,0 +1,61 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+import services.llm_client as llm_client
+from services.llm_client import PooledGroqClient, _parse_model_concurrency
+
+
+class TestParseModelConcurrency:
+    def test_parses_pairs(self):
+        assert _parse_model_concurrency("a=2, b=5") == {"a": 2, "b": 5}
+
+    def test_ignores_malformed_entries(self):
+        assert _parse_model_concurrency("a=x,=3,b,c=4") == {"c": 4}
+
+    def test_empty_string(self):
+        assert _parse_model_concurrency("") == {}
+
+    def test_minimum_is_one(self):
+        assert _parse_model_concurrency("a=0") == {"a": 1}
+
+
+class TestPooledGroqClient:
+    @pytest.mark.asyncio
+    async def test_caps_in_flight_requests_per_model(self):
+        pool = PooledGroqClient()
+        pool._limits = {"big-model": 2}
+        in_flight = 0
+        peak = 0
+
+        async def fake_create(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return MagicMock()
+
+        pool.client = MagicMock()
+        pool.client.chat.completions.create = AsyncMock(side_effect=fake_create)
+
+        await asyncio.gather(*[pool.chat.completions.create(model="big-model") for _ in range(6)])
+        assert peak == 2
+        assert pool.client.chat.completions.create.await_count == 6
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_models_have_independent_semaphores(self):
+        pool = PooledGroqClient()
+        assert pool.semaphore_for("a") is pool.semaphore_for("a")
+        assert pool.semaphore_for("a") is not pool.semaphore_for("b")
+        await pool.aclose()
+
+    @pytest.mark.asyncio
+    async def test_shared_client_is_reused_until_closed(self):
+        first = llm_client.get_groq_client()
+        assert llm_client.get_groq_client() is first
+        await llm_client.close_llm_client()
+        second = llm_client.get_groq_client()
+        assert second is not first
+        await llm_client.close_llm_client()
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from models.portfolio import Portfolio
+from models.user import User
+from routers.admin import list_portfolios, list_users
+from utils.pagination import decode_cursor, encode_cursor
+
+
+class TestCursor:
+    def test_round_trip(self):
+        key = (datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc), "abc", 1.5)
+        cursor = encode_cursor(key)
+        assert "=" not in cursor
+        assert decode_cursor(cursor, 3) == key
+
+    def test_empty(self):
+        assert encode_cursor(None) is None
+        assert decode_cursor(None, 2) is None
+        assert decode_cursor("", 2) is None
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor(("a",)), encode_cursor(({"dt": 1}, "a"))])
+    def test_rejects_foreign_cursors(self, cursor):
+        with pytest.raises(HTTPException) as exc:
+            decode_cursor(cursor, 2)
+        assert exc.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_admin_lists_page_by_created_at(session_factory):
+    now = datetime.now(timezone.utc)
+    async with session_factory() as db:
+        for i in range(5):
+            # Two rows share a timestamp so the id tiebreaker is exercised.
+            created = now - timedelta(minutes=i // 2)
+            db.add(User(id=f"u{i}", email=f"u{i}@example.com", name=f"User {i}", created_at=created))
+            db.add(Portfolio(id=f"p{i}", user_id=f"u{i}", slug=f"user-{i}", parsed_data="{}", created_at=created))
+        await db.commit()
+
+        seen, cursor = [], None
+        while True:
+            page = await list_portfolios(limit=2, cursor=cursor, db=db, _=None)
+            assert set(page["portfolios"][0]) == {
+                "id", "user_id", "slug", "theme", "primary_color", "is_published", "view_count", "created_at",
+            }
+            seen += [p["id"] for p in page["portfolios"]]
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert seen == ["p1", "p0", "p3", "p2", "p4"]
+
+        first = await list_users(search="user", limit=3, cursor=None, db=db, _=None)
+        rest = await list_users(search="user", limit=3, cursor=first["next_cursor"], db=db, _=None)
+        assert [u["id"] for u in first["users"] + rest["users"]] == ["u1", "u0", "u3", "u2", "u4"]
+        assert rest["next_cursor"] is None
@@ -0,0 +1,97 @@
+import fitz
+import pytest
+
+from services.parser import (
+    TextExtractionError,
+    _looks_interleaved,
+    _quality_problem,
+    extract_text_from_pdf_with_stats,
+    extract_text_with_stats,
+)
+from services.extraction_pool import ExtractionMetrics
+
+
+def _make_pdf(lines: list[str]) -> bytes:
+    doc = fitz.open()
+    page = doc.new_page()
+    y = 72
+    for line in lines:
+        page.insert_text((72, y), line, fontsize=10)
+        y += 14
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+class TestLooksInterleaved:
+    def test_single_column_is_not_interleaved(self):
+        blocks = [(50, y, 550, y + 10, "text") for y in range(0, 200, 20)]
+        assert _looks_interleaved(blocks, 600) is False
+
+    def test_column_by_column_order_is_not_interleaved(self):
+        left = [(40, y, 280, y + 10, "l") for y in range(0, 100, 20)]
+        right = [(320, y, 560, y + 10, "r") for y in range(0, 100, 20)]
+        assert _looks_interleaved(left + right, 600) is False
+
+    def test_alternating_columns_is_interleaved(self):
+        blocks = []
+        for y in range(0, 200, 20):
+            blocks.append((40, y, 280, y + 10, "l"))
+            blocks.append((320, y, 560, y + 10, "r"))
+        assert _looks_interleaved(blocks, 600) is True
+
+
+class TestQualityProblem:
+    def test_good_text(self):
+        assert _quality_problem("x" * 1000, 1, 0) is None
+
+    def test_low_char_density(self):
+        assert _quality_problem("short", 2, 0) == "low_char_density"
+
+    def test_column_interleaving(self):
+        assert _quality_problem("x" * 1000, 2, 1) == "column_interleaving"
+
+    def test_fragmented_lines(self):
+        text = "\n".join(["ab"] * 15 + ["a proper line of text" * 10] * 10)
+        assert _quality_problem(text, 1, 0) == "fragmented_lines"
+
+
+class TestExtractTextFromPdfWithStats:
+    def test_dense_pdf_uses_fast_path_only(self):
+        pdf = _make_pdf([f"Experience line {i} at a company doing real work" for i in range(30)])
+        text, attempts = extract_text_from_pdf_with_stats(pdf)
+        assert "Experience line 0" in text
+        assert [a.backend for a in attempts] == ["pymupdf"]
+        assert attempts[0].outcome == "ok"
+
+    def test_sparse_pdf_escalates_to_pdfplumber(self):
+        pdf = _make_pdf(["Jane Doe"])
+        text, attempts = extract_text_from_pdf_with_stats(pdf)
+        assert "Jane Doe" in text
+        assert [a.backend for a in attempts] == ["pymupdf", "pdfplumber"]
+        assert attempts[0].outcome == "low_quality"
+        assert attempts[0].detail == "low_char_density"
+
+    def test_garbage_raises_with_attempts(self):
+        with pytest.raises(TextExtractionError) as exc_info:
+            extract_text_from_pdf_with_stats(b"%PDF-1.4 not really a pdf")
+        assert [a.backend for a in exc_info.value.attempts] == ["pymupdf", "pdfplumber", "pypdf"]
+        assert "No extractable text" in str(exc_info.value)
+
+    def test_unsupported_extension(self):
+        with pytest.raises(ValueError, match="Unsupported file type"):
+            extract_text_with_stats(b"data", "resume.txt")
+
+
+class TestExtractionMetrics:
+    def test_aggregates_per_backend(self):
+        pdf = _make_pdf(["Jane Doe"])
+        _, attempts = extract_text_from_pdf_with_stats(pdf)
+        metrics = ExtractionMetrics()
+        metrics.record(attempts)
+        metrics.record(attempts)
+        snapshot = metrics.snapshot()
+        assert snapshot["pymupdf"]["calls"] == 2
+        assert snapshot["pymupdf"]["low_quality"] == 2
+        assert snapshot["pdfplumber"]["ok"] == 2
+        assert snapshot["pdfplumber"]["avg_ms"] >= 0
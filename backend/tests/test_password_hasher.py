@@ -0,0 +1,78 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+import utils.auth as auth
+from services.password_hasher import PasswordHasher, PasswordHasherBusy, password_hash_metrics
+
+
+@pytest.mark.asyncio
+async def test_hashing_runs_off_the_event_loop():
+    hasher = PasswordHasher(max_workers=1, max_pending=0)
+    release = threading.Event()
+    task = asyncio.create_task(hasher.run("hash", lambda: release.wait(5) and "done"))
+    await asyncio.sleep(0.01)
+    # The loop is still free while the worker is blocked.
+    assert hasher.in_flight == 1
+    release.set()
+    assert await task == "done"
+    assert hasher.in_flight == 0
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_keeps_its_slot_until_the_hash_finishes():
+    hasher = PasswordHasher(max_workers=1, max_pending=0)
+    release = threading.Event()
+    task = asyncio.create_task(hasher.run("hash", release.wait, 5))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    # The bcrypt call is still occupying the only worker.
+    assert hasher.in_flight == 1
+    with pytest.raises(PasswordHasherBusy):
+        await hasher.run("hash", release.wait, 5)
+    release.set()
+    for _ in range(100):
+        if hasher.in_flight == 0:
+            break
+        await asyncio.sleep(0.01)
+    assert hasher.in_flight == 0
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_full_backlog_is_rejected():
+    hasher = PasswordHasher(max_workers=1, max_pending=1)
+    release = threading.Event()
+    running = [asyncio.create_task(hasher.run("verify", release.wait, 5)) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    rejected_before = password_hash_metrics.snapshot().get("verify", {}).get("rejected", 0)
+    with pytest.raises(PasswordHasherBusy):
+        await hasher.run("verify", release.wait, 5)
+    assert password_hash_metrics.snapshot()["verify"]["rejected"] == rejected_before + 1
+    release.set()
+    assert await asyncio.gather(*running) == [True, True]
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_async_helpers_hash_verify_and_shed(monkeypatch):
+    hashed = await auth.hash_password_async("s3cret-pass")
+    assert await auth.verify_password_async("s3cret-pass", hashed)
+    assert not await auth.verify_password_async("wrong", hashed)
+    assert password_hash_metrics.snapshot()["hash"]["calls"] >= 1
+
+    monkeypatch.setattr(auth, "password_hasher", PasswordHasher(max_workers=1, max_pending=0))
+    release = threading.Event()
+    blocker = asyncio.create_task(auth.password_hasher.run("hash", release.wait, 5))
+    await asyncio.sleep(0.01)
+    with pytest.raises(HTTPException) as exc:
+        await auth.verify_password_async("s3cret-pass", hashed)
+    assert exc.value.status_code == 429
+    assert exc.value.headers["Retry-After"]
+    release.set()
+    await blocker
+    auth.password_hasher.shutdown()
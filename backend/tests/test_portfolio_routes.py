@@ -0,0 +1,70 @@
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import routers.portfolio as portfolio_router
+from database import get_db
+from models.user import User
+from services.portfolio_service import create_portfolio
+from services.portfolio_versions import record_version
+from utils.auth import get_current_user
+
+
+@pytest_asyncio.fixture
+async def client(session_factory, monkeypatch):
+    async with session_factory() as db:
+        user = User(id="u1", email="ada@example.com", name="Ada")
+        db.add(user)
+        await db.commit()
+        portfolio = await create_portfolio(db, "u1", {"name": "Ada", "skills": ["Python"]})
+        await record_version(db, portfolio.id, {"name": "Ada v1", "skills": []})
+        await db.commit()
+
+    async def spam_check(_data):
+        return {"category": "approved", "confidence": 0.1, "reason": None}
+
+    async def no_email(**_kwargs):
+        return None
+
+    monkeypatch.setattr(portfolio_router, "analyze_portfolio_spam", spam_check)
+    monkeypatch.setattr(portfolio_router, "send_publish_notification_email", no_email)
+
+    async def override_db():
+        async with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(portfolio_router.router, prefix="/api")
+    app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[get_current_user] = lambda: user
+    return TestClient(app)
+
+
+# Each of these writes through update_portfolio and serializes the result as
+# PortfolioOut, which reads the deferred content columns after the commit.
+def test_update_returns_content(client):
+    response = client.put("/api/portfolio/me", json={"theme": "dark", "parsed_data": {"name": "Ada L"}})
+    assert response.status_code == 200, response.text
+    assert response.json()["theme"] == "dark"
+    assert response.json()["parsed_data"]["name"] == "Ada L"
+
+
+def test_publish_and_unpublish_return_content(client):
+    response = client.post("/api/portfolio/me/unpublish")
+    assert response.status_code == 200, response.text
+    assert response.json()["is_published"] is False
+    assert response.json()["parsed_data"]["skills"] == ["Python"]
+
+    response = client.post("/api/portfolio/me/publish")
+    assert response.status_code == 200, response.text
+    assert response.json()["is_published"] is True
+    assert response.json()["moderation_status"] == "approved"
+    assert response.json()["parsed_data"]["name"] == "Ada"
+
+
+def test_restore_version_returns_content(client):
+    response = client.post("/api/portfolio/me/versions/1/restore")
+    assert response.status_code == 200, response.text
+    assert response.json()["parsed_data"]["name"] == "Ada v1"
+    assert client.get("/api/portfolio/me").json()["parsed_data"]["name"] == "Ada v1"
@@ -36,3 +36,60 @@ class TestGenerateSlug:
         slug1 = generate_slug("Alice", "aaa111")
         slug2 = generate_slug("Alice", "bbb222")
         assert slug1 != slug2
+
+
+@pytest.mark.asyncio
+async def test_large_columns_are_deferred(session_factory):
+    from sqlalchemy import inspect, select
+    from sqlalchemy.exc import InvalidRequestError
+    from models.portfolio import LOAD_CONTENT, Portfolio
+    from models.user import User
+    from services.portfolio_service import create_portfolio, update_portfolio
+    from services.search_index import search_portfolios
+
+    async with session_factory() as db:
+        db.add(User(id="u1", email="ada@example.com", name="Ada"))
+        await db.commit()
+        created = await create_portfolio(db, "u1", {"name": "Ada", "skills": ["Python"]})
+        assert created.parsed_data  # still readable on the returned instance
+
+    async with session_factory() as db:
+        portfolio = (await db.execute(select(Portfolio))).scalar_one()
+        assert {"parsed_data", "career_graph", "connected_sources", "video_scripts"} <= inspect(portfolio).unloaded
+        with pytest.raises(InvalidRequestError):
+            portfolio.parsed_data
+
+        # Metadata-only updates work without loading content and keep the search entry intact.
+        await update_portfolio(db, portfolio, {"visible_to_recruiters": True, "theme": "dark"})
+        assert "parsed_data" in inspect(portfolio).unloaded
+        _, _, total, _ = await search_portfolios(db, [], limit=5, skills=["python"])
+        assert total == 1
+
+    async with session_factory() as db:
+        portfolio = (await db.execute(select(Portfolio).options(*LOAD_CONTENT))).scalar_one()
+        assert portfolio.parsed_data["skills"] == ["Python"]
+        assert "video_scripts" in inspect(portfolio).unloaded
+
+
+@pytest.mark.asyncio
+async def test_in_place_content_edits_are_saved(session_factory):
+    from sqlalchemy import select
+    from models.portfolio import LOAD_CONTENT, Portfolio
+    from models.user import User
+    from services.portfolio_service import create_portfolio, update_portfolio
+
+    async with session_factory() as db:
+        db.add(User(id="u1", email="ada@example.com", name="Ada"))
+        await db.commit()
+        await create_portfolio(db, "u1", {"name": "Ada", "skills": ["Python"]}, career_graph={"career_level": "senior"})
+
+    async with session_factory() as db:
+        portfolio = (await db.execute(select(Portfolio).options(*LOAD_CONTENT))).scalar_one()
+        parsed_data = portfolio.parsed_data
+        parsed_data["skills"].append("Rust")  # mutates the loaded dict itself
+        await update_portfolio(db, portfolio, {"parsed_data": parsed_data, "career_graph": '{"career_level": "staff"}'})
+
+    async with session_factory() as db:
+        portfolio = (await db.execute(select(Portfolio).options(*LOAD_CONTENT))).scalar_one()
+        assert portfolio.parsed_data["skills"] == ["Python", "Rust"]
+        assert portfolio.career_graph == {"career_level": "staff"}
@@ -0,0 +1,108 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+
+from models.portfolio_version import PortfolioVersion
+from models.user import User
+from services import portfolio_versions
+from services.portfolio_service import create_portfolio
+from services.portfolio_versions import delete_versions, list_versions, load_version, record_version
+from utils.json_patch import apply_patch, make_patch
+
+
+def _resume(title: str, skills: list[str], jobs: int = 3) -> dict:
+    return {
+        "name": "Ada Lovelace",
+        "title": title,
+        "summary": "Engineer. " * 50,
+        "skills": skills,
+        "experience": [{"company": f"Company {i}", "role": "Engineer", "bullets": ["Shipped things"] * 5} for i in range(jobs)],
+    }
+
+
+@pytest_asyncio.fixture
+async def portfolio_id(session_factory):
+    async with session_factory() as db:
+        db.add(User(id="u1", email="ada@example.com", name="Ada"))
+        await db.commit()
+        portfolio = await create_portfolio(db, "u1", _resume("Engineer", ["Python"]))
+        return portfolio.id
+
+
+class TestJsonPatch:
+    @pytest.mark.parametrize("source, target", [
+        ({"a": 1, "b": [1, 2, 3]}, {"a": 2, "b": [1, 2, 3], "c": {"d": None}}),
+        ({"items": [{"x": 1}, {"x": 2}]}, {"items": [{"x": 0}, {"x": 1}, {"x": 2}]}),
+        ({"items": [1, 2, 3, 4]}, {"items": [1, 4]}),
+        ({"a/b": {"~": 1}}, {"a/b": {"~": 2}}),
+        ({"flag": 1}, {"flag": True}),
+        ([1, 2], {"now": "a dict"}),
+    ])
+    def test_round_trip(self, source, target):
+        assert apply_patch(source, make_patch(source, target)) == target
+
+    def test_insert_at_front_is_one_op(self):
+        jobs = [{"company": f"C{i}"} for i in range(5)]
+        ops = make_patch({"experience": jobs}, {"experience": [{"company": "New"}, *jobs]})
+        assert ops == [{"op": "add", "path": "/experience/0", "value": {"company": "New"}}]
+
+    def test_apply_does_not_mutate_input(self):
+        source = {"skills": ["Python"]}
+        apply_patch(source, [{"op": "add", "path": "/skills/-", "value": "Go"}])
+        assert source == {"skills": ["Python"]}
+
+    def test_bad_path_raises_value_error(self):
+        with pytest.raises(ValueError):
+            apply_patch({"a": 1}, [{"op": "remove", "path": "/missing/key"}])
+
+
+class TestPortfolioVersions:
+    @pytest.mark.asyncio
+    async def test_versions_round_trip_as_deltas(self, session_factory, portfolio_id):
+        documents = [_resume("Engineer", ["Python"] + ["Go"] * i, jobs=3 + i) for i in range(7)]
+        async with session_factory() as db:
+            for document in documents:
+                await record_version(db, portfolio_id, document)
+            await db.commit()
+
+            for seq, document in enumerate(documents, start=1):
+                assert await load_version(db, portfolio_id, seq) == document
+            rows = (await db.execute(
+                select(PortfolioVersion.seq, PortfolioVersion.is_snapshot).order_by(PortfolioVersion.seq)
+            )).all()
+            assert [seq for seq, is_snapshot in rows if is_snapshot] == [1, 6]
+
+            versions = await list_versions(db, portfolio_id)
+            assert [v["version"] for v in versions] == [7, 6, 5, 4, 3, 2, 1]
+            assert versions[0]["stored_bytes"] < versions[1]["stored_bytes"]  # delta vs. snapshot
+
+    @pytest.mark.asyncio
+    async def test_unchanged_content_is_not_recorded(self, session_factory, portfolio_id):
+        async with session_factory() as db:
+            assert await record_version(db, portfolio_id, _resume("Engineer", ["Python"])) == 1
+            assert await record_version(db, portfolio_id, _resume("Engineer", ["Python"])) is None
+            assert await record_version(db, portfolio_id, _resume("Lead", ["Python"])) == 2
+
+    @pytest.mark.asyncio
+    async def test_retention_keeps_newest_and_rebases_oldest(self, session_factory, portfolio_id, monkeypatch):
+        monkeypatch.setattr(portfolio_versions.settings, "portfolio_version_retention", 3)
+        documents = [_resume(f"Title {i}", ["Python"]) for i in range(1, 6)]
+        async with session_factory() as db:
+            for document in documents:
+                await record_version(db, portfolio_id, document)
+            await db.commit()
+
+            assert [v["version"] for v in await list_versions(db, portfolio_id)] == [5, 4, 3]
+            assert await load_version(db, portfolio_id, 2) is None
+            oldest = (await db.execute(select(PortfolioVersion).where(PortfolioVersion.seq == 3))).scalar_one()
+            assert oldest.is_snapshot
+            for seq in (3, 4, 5):
+                assert await load_version(db, portfolio_id, seq) == documents[seq - 1]
+
+    @pytest.mark.asyncio
+    async def test_delete_versions(self, session_factory, portfolio_id):
+        async with session_factory() as db:
+            await record_version(db, portfolio_id, _resume("Engineer", ["Python"]))
+            await delete_versions(db, [portfolio_id])
+            await db.commit()
+            assert (await db.execute(select(func.count()).select_from(PortfolioVersion))).scalar_one() == 0
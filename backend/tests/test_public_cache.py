@@ -0,0 +1,146 @@
+import asyncio
+import json
+
+import pytest
+
+from services.public_cache import PublicPortfolioCache, etag_matches
+
+
+def _payload(**overrides):
+    payload = {
+        "id": "p1",
+        "user_id": "u1",
+        "slug": "jane",
+        "parsed_data": {"name": "Jane"},
+        "view_count": 7,
+        "hidden_sections": "",
+    }
+    payload.update(overrides)
+    return payload
+
+
+class TestPublicPortfolioCache:
+    def test_render_splices_view_count(self):
+        cache = PublicPortfolioCache(max_entries=10, ttl=60)
+        entry = cache.put("slug", "jane", _payload())
+        body = json.loads(entry.render(12))
+        assert body["view_count"] == 12
+        assert body["parsed_data"] == {"name": "Jane"}
+        assert cache.get("slug", "jane") is entry
+
+    def test_etag_ignores_view_count(self):
+        cache = PublicPortfolioCache(max_entries=10, ttl=60)
+        a = cache.put("slug", "a", _payload(view_count=1))
+        b = cache.put("slug", "b", _payload(view_count=999))
+        c = cache.put("slug", "c", _payload(parsed_data={"name": "Other"}))
+        assert a.etag == b.etag
+        assert a.etag != c.etag
+
+    def test_invalidate_drops_slug_and_domain_entries(self):
+        cache = PublicPortfolioCache(max_entries=10, ttl=60)
+        cache.put("slug", "jane", _payload())
+        cache.put("domain", "jane.dev", _payload())
+        cache.put("slug", "bob", _payload(id="p2", user_id="u2"))
+        cache.invalidate("p1")
+        assert cache.get("slug", "jane") is None
+        assert cache.get("domain", "jane.dev") is None
+        assert cache.get("slug", "bob") is not None
+        cache.invalidate_user("u2")
+        assert cache.get("slug", "bob") is None
+
+    def test_expired_entries_miss(self):
+        cache = PublicPortfolioCache(max_entries=10, ttl=0)
+        cache.put("slug", "jane", _payload())
+        assert cache.get("slug", "jane") is None
+
+    def test_lru_eviction(self):
+        cache = PublicPortfolioCache(max_entries=2, ttl=60)
+        cache.put("slug", "a", _payload(id="a"))
+        cache.put("slug", "b", _payload(id="b"))
+        cache.get("slug", "a")
+        cache.put("slug", "c", _payload(id="c"))
+        assert cache.get("slug", "b") is None
+        assert cache.get("slug", "a") is not None
+
+    def test_add_views(self):
+        cache = PublicPortfolioCache(max_entries=10, ttl=60)
+        cache.put("slug", "jane", _payload(view_count=7))
+        cache.add_views({"p1": 3, "other": 1})
+        assert cache.get("slug", "jane").view_count == 10
+
+    def test_index_follows_eviction_and_expiry(self):
+        cache = PublicPortfolioCache(max_entries=2, ttl=60)
+        cache.put("slug", "a", _payload(id="a"))
+        cache.put("domain", "a.dev", _payload(id="a"))
+        cache.put("slug", "b", _payload(id="b"))  # evicts ("slug", "a")
+        cache.invalidate_user("u1")
+        assert cache.stats()["entries"] == 0
+        assert not cache._by_portfolio and not cache._by_user
+
+
+class FakeRedis:
+    """The slice of redis.asyncio used for invalidation: publish and pubsub."""
+
+    def __init__(self):
+        self.queues: list[asyncio.Queue] = []
+
+    async def publish(self, channel, message):
+        for queue in self.queues:
+            queue.put_nowait({"type": "message", "channel": channel, "data": message})
+
+    def pubsub(self):
+        redis = self
+
+        class PubSub:
+            async def subscribe(self, channel):
+                self.queue = asyncio.Queue()
+                redis.queues.append(self.queue)
+
+            async def listen(self):
+                while True:
+                    yield await self.queue.get()
+
+            async def aclose(self):
+                redis.queues.remove(self.queue)
+
+        return PubSub()
+
+
+class TestCrossWorkerInvalidation:
+    @pytest.mark.asyncio
+    async def test_invalidation_reaches_other_workers(self):
+        redis = FakeRedis()
+        workers = [PublicPortfolioCache(max_entries=10, ttl=60, redis_url="redis://fake") for _ in range(2)]
+        for worker in workers:
+            worker._client = redis
+            await worker.start()
+            worker.put("slug", "jane", _payload())
+            worker.put("slug", "bob", _payload(id="p2", user_id="u2"))
+        await asyncio.sleep(0)
+
+        workers[0].invalidate("p1")
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert workers[1].get("slug", "jane") is None
+        assert workers[1].get("slug", "bob") is not None
+
+        workers[1].invalidate_user("u2")
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert workers[0].get("slug", "bob") is None
+
+        for worker in workers:
+            await worker.stop()
+        assert redis.queues == []
+
+
+class TestEtagMatches:
+    def test_matching(self):
+        assert etag_matches('W/"abc"', 'W/"abc"')
+        assert etag_matches('"abc"', 'W/"abc"')
+        assert etag_matches('"x", W/"abc"', 'W/"abc"')
+        assert etag_matches("*", 'W/"abc"')
+
+    def test_not_matching(self):
+        assert not etag_matches(None, 'W/"abc"')
+        assert not etag_matches('W/"def"', 'W/"abc"')
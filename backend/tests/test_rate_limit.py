@@ -0,0 +1,81 @@
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from utils.rate_limit import InMemoryRateLimiter, RateLimit, RateLimiter, _parse_overrides
+
+RULE = RateLimit(limit=3, window_seconds=30, message="slow down")
+
+
+def _request(ip: str = "1.2.3.4") -> Request:
+    return Request({"type": "http", "headers": [], "client": (ip, 1234)})
+
+
+class TestInMemoryGCRA:
+    def test_allows_a_burst_then_refills_gradually(self):
+        limiter = InMemoryRateLimiter()
+        results = [limiter.hit("k", RULE, now=100.0) for _ in range(4)]
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert [r.remaining for r in results] == [2, 1, 0, 0]
+        assert results[-1].retry_after == pytest.approx(10.0)
+        assert results[2].reset_after == pytest.approx(30.0)
+
+        # One request's worth (window / limit) later, exactly one more is allowed.
+        assert limiter.hit("k", RULE, now=109.9).allowed is False
+        assert limiter.hit("k", RULE, now=110.0).allowed is True
+        assert limiter.hit("k", RULE, now=110.0).allowed is False
+        assert limiter.hit("other", RULE, now=110.0).allowed is True
+
+    def test_key_table_is_bounded(self):
+        limiter = InMemoryRateLimiter(max_keys=100, sweep_every=50)
+        for i in range(1000):
+            limiter.hit(f"ip-{i}", RULE, now=100.0)
+        assert len(limiter) == 100
+
+        # Every bucket has refilled by now, so the next sweep empties the table.
+        for i in range(50):
+            limiter.hit(f"late-{i}", RULE, now=1000.0 + i * 20)
+        assert len(limiter) <= 2
+
+
+def test_parse_overrides():
+    assert _parse_overrides("auth_login=20/60, resume_upload = 1/5,bad,x=1,y=a/b") == {
+        "auth_login": (20, 60),
+        "resume_upload": (1, 5),
+    }
+
+
+@pytest.mark.asyncio
+async def test_enforce_sets_headers_and_raises_429():
+    limiter = RateLimiter()
+    limiter.rules["auth_login"] = RateLimit(2, 60, "Too many login attempts.")
+    request = _request()
+
+    await limiter.enforce(request, "auth_login", "Ada@Example.com")
+    assert request.state.rate_limit_headers == {
+        "X-RateLimit-Limit": "2",
+        "X-RateLimit-Remaining": "1",
+        "X-RateLimit-Reset": "30",
+    }
+    await limiter.enforce(request, "auth_login", "ada@example.com")
+    with pytest.raises(HTTPException) as exc:
+        await limiter.enforce(request, "auth_login", "ada@example.com")
+    assert exc.value.status_code == 429
+    assert exc.value.detail == "Too many login attempts."
+    assert exc.value.headers["Retry-After"] == "30"
+    assert exc.value.headers["X-RateLimit-Remaining"] == "0"
+
+    # Other clients have their own bucket.
+    await limiter.enforce(_request("5.6.7.8"), "auth_login", "ada@example.com")
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_memory_when_redis_fails():
+    class BrokenRedis:
+        async def hit(self, key, rule):
+            raise ConnectionError("redis down")
+
+    limiter = RateLimiter()
+    limiter._redis = BrokenRedis()
+    result = await limiter.check("k", RULE)
+    assert result.allowed and result.remaining == 2
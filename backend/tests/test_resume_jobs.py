@@ -0,0 +1,165 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, patch
+from sqlalchemy import select, update
+
+from models.resume_job import ResumeJob
+from models.user import User
+from services.resume_jobs import ResumeJobWorker, serialize_job, settings
+from services.resume_pipeline import ResumeExtractionError
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def _seed(session_factory):
+    async with session_factory() as db:
+        db.add(User(id="u1", email="jane@example.com", name="Jane", is_active=True))
+        await db.commit()
+    with patch("services.resume_jobs.AsyncSessionLocal", session_factory):
+        yield
+
+
+async def _add_job(factory, **kwargs) -> str:
+    async with factory() as db:
+        job = ResumeJob(user_id="u1", filename="cv.pdf", payload=b"pdf", **kwargs)
+        db.add(job)
+        await db.commit()
+        return job.id
+
+
+class TestResumeJobWorker:
+    @pytest.mark.asyncio
+    async def test_claim_is_exclusive(self, session_factory):
+        job_id = await _add_job(session_factory)
+        worker = ResumeJobWorker(concurrency=1, poll_interval=0.01)
+        assert await worker.claim_next() == job_id
+        assert await worker.claim_next() is None
+
+    @pytest.mark.asyncio
+    async def test_success_stores_result_and_drops_payload(self, session_factory):
+        job_id = await _add_job(session_factory)
+        worker = ResumeJobWorker(concurrency=1, poll_interval=0.01)
+        stages = []
+
+        async def fake_process(db, user, file_bytes, filename, tone, mode, on_stage=None):
+            assert file_bytes == b"pdf"
+            for stage in ("extracting", "analyzing", "saving"):
+                await on_stage(stage)
+                stages.append(stage)
+            return {"portfolio_id": "p1", "slug": "jane-u1"}
+
+        with patch("services.resume_jobs.process_resume", side_effect=fake_process):
+            await worker.process(await worker.claim_next())
+
+        async with session_factory() as db:
+            job = await db.get(ResumeJob, job_id)
+            payload = await db.scalar(select(ResumeJob.payload).where(ResumeJob.id == job_id))
+        assert stages == ["extracting", "analyzing", "saving"]
+        assert job.status == "succeeded"
+        assert job.stage == "done"
+        assert payload is None
+        assert serialize_job(job)["result"] == {"portfolio_id": "p1", "slug": "jane-u1"}
+
+    @pytest.mark.asyncio
+    async def test_extraction_error_is_reported(self, session_factory):
+        job_id = await _add_job(session_factory)
+        worker = ResumeJobWorker(concurrency=1, poll_interval=0.01)
+        failing = AsyncMock(side_effect=ResumeExtractionError("No text found"))
+        with patch("services.resume_jobs.process_resume", failing):
+            await worker.process(await worker.claim_next())
+
+        async with session_factory() as db:
+            job = await db.get(ResumeJob, job_id)
+        assert job.status == "failed"
+        assert job.error == "No text found"
+
+    @pytest.mark.asyncio
+    async def test_unexpected_error_hides_details(self, session_factory):
+        job_id = await _add_job(session_factory)
+        worker = ResumeJobWorker(concurrency=1, poll_interval=0.01)
+        with patch("services.resume_jobs.process_resume", AsyncMock(side_effect=RuntimeError("db password wrong"))):
+            await worker.process(await worker.claim_next())
+
+        async with session_factory() as db:
+            job = await db.get(ResumeJob, job_id)
+        assert job.status == "failed"
+        assert "db password" not in job.error
+
+    @pytest.mark.asyncio
+    async def test_sweep_requeues_only_expired_leases(self, session_factory):
+        now = datetime.now(timezone.utc)
+        old = now - timedelta(hours=1)
+        live = await _add_job(session_factory, status="running", started_at=old, heartbeat_at=now, attempts=1)
+        dead = await _add_job(session_factory, status="running", started_at=old, heartbeat_at=old, attempts=1, claimed_by="gone")
+        legacy = await _add_job(session_factory, status="running", started_at=old, attempts=5)
+        await ResumeJobWorker(concurrency=1, poll_interval=0.01)._maintenance()
+
+        async with session_factory() as db:
+            statuses = {job.id: (job.status, job.claimed_by) for job in (await db.scalars(select(ResumeJob))).all()}
+        assert statuses[live] == ("running", None)
+        assert statuses[dead] == ("queued", None)
+        assert statuses[legacy][0] == "failed"
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_keeps_a_slow_job_leased(self, session_factory, monkeypatch):
+        monkeypatch.setattr(settings, "resume_job_heartbeat_seconds", 0.01)
+        job_id = await _add_job(session_factory)
+        worker = ResumeJobWorker(concurrency=1, poll_interval=0.01)
+        claimed_at = None
+
+        async def slow_process(db, user, file_bytes, filename, tone, mode, on_stage=None):
+            nonlocal claimed_at
+            async with session_factory() as other:
+                claimed_at = (await other.get(ResumeJob, job_id)).heartbeat_at
+            await asyncio.sleep(0.1)
+            async with session_factory() as other:
+                assert (await other.get(ResumeJob, job_id)).heartbeat_at > claimed_at
+            return {}
+
+        with patch("services.resume_jobs.process_resume", side_effect=slow_process):
+            await worker.process(await worker.claim_next())
+        async with session_factory() as db:
+            assert (await db.get(ResumeJob, job_id)).status == "succeeded"
+
+    @pytest.mark.asyncio
+    async def test_lost_lease_discards_the_outcome(self, session_factory):
+        job_id = await _add_job(session_factory)
+        worker = ResumeJobWorker(concurrency=1, poll_interval=0.01)
+        other = ResumeJobWorker(concurrency=1, poll_interval=0.01)
+
+        async def reclaimed(db, user, file_bytes, filename, tone, mode, on_stage=None):
+            async with session_factory() as db2:
+                await db2.execute(update(ResumeJob).where(ResumeJob.id == job_id).values(claimed_by=other.worker_id))
+                await db2.commit()
+            return {"portfolio_id": "p1"}
+
+        with patch("services.resume_jobs.process_resume", side_effect=reclaimed):
+            await worker.process(await worker.claim_next())
+        async with session_factory() as db:
+            job = await db.get(ResumeJob, job_id)
+        assert (job.status, job.claimed_by, job.result) == ("running", other.worker_id, None)
+
+    @pytest.mark.asyncio
+    async def test_lost_lease_stops_processing_at_the_next_stage(self, session_factory):
+        job_id = await _add_job(session_factory)
+        worker = ResumeJobWorker(concurrency=1, poll_interval=0.01)
+        other = ResumeJobWorker(concurrency=1, poll_interval=0.01)
+        stages = []
+
+        async def reclaimed(db, user, file_bytes, filename, tone, mode, on_stage=None):
+            async with session_factory() as db2:
+                await db2.execute(update(ResumeJob).where(ResumeJob.id == job_id).values(claimed_by=other.worker_id))
+                await db2.commit()
+            await on_stage("parsing")
+            stages.append("saving")
+            return {"portfolio_id": "p1"}
+
+        with patch("services.resume_jobs.process_resume", side_effect=reclaimed):
+            await worker.process(await worker.claim_next())
+        async with session_factory() as db:
+            job = await db.get(ResumeJob, job_id)
+        assert stages == []
+        assert (job.status, job.stage, job.claimed_by) == ("running", "extracting", other.worker_id)
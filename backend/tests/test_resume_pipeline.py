@@ -0,0 +1,249 @@
+import asyncio
+import hashlib
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from models.portfolio import LOAD_CONTENT, Portfolio
+from models.user import User
+from services.cache import MemoryTier, TieredCache
+from services.resume_pipeline import ResumeExtractionError, ResumeUploadPipeline, process_resume
+
+
+@pytest.fixture
+def mock_storage():
+    with patch("services.resume_pipeline.rustfs_service") as storage:
+        storage.s3_client = MagicMock()
+        storage.object_exists = AsyncMock(return_value=False)
+        storage.upload_file = AsyncMock(return_value="resumes/u1/key.pdf")
+        storage.delete_file = AsyncMock(return_value=True)
+        yield storage
+
+
+@pytest.fixture(autouse=True)
+def upload_cache():
+    cache = TieredCache(MemoryTier(100, 1_000_000), redis=None, disk=None)
+    with patch("services.resume_pipeline.llm_cache", cache):
+        yield cache
+
+
+@pytest.fixture
+def mock_llm():
+    with patch("services.resume_pipeline.parse_resume_with_groq") as parse, \
+         patch("services.resume_pipeline.extract_career_graph") as graph:
+        parse.return_value = {"name": "Jane", "skills": ["Python"]}
+        graph.return_value = {"skills": ["Python"]}
+        yield parse, graph
+
+
+class TestResumeUploadPipeline:
+    @pytest.mark.asyncio
+    async def test_runs_llm_calls_concurrently(self, mock_storage, mock_llm, sample_resume_text):
+        parse, graph = mock_llm
+        running = 0
+        peak = 0
+
+        async def slow(*args, **kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+            return {"name": "Jane", "skills": []}
+
+        parse.side_effect = slow
+        graph.side_effect = slow
+
+        with patch("services.resume_pipeline.extract_text_isolated", return_value=sample_resume_text):
+            async with ResumeUploadPipeline(b"pdf", "cv.pdf", "u1") as pipeline:
+                processed = await pipeline.run()
+                pipeline.keep_object()
+
+        assert peak == 2
+        assert processed.object_key == "resumes/u1/key.pdf"
+        mock_storage.delete_file.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_extraction_failure_deletes_uploaded_object(self, mock_storage, mock_llm):
+        with patch("services.resume_pipeline.extract_text_isolated", side_effect=ValueError("bad pdf")):
+            with pytest.raises(ResumeExtractionError, match="bad pdf"):
+                async with ResumeUploadPipeline(b"pdf", "cv.pdf", "u1") as pipeline:
+                    await pipeline.run()
+
+        mock_storage.delete_file.assert_awaited_once_with("resumes/u1/key.pdf")
+        mock_llm[0].assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_empty_text_is_an_extraction_error(self, mock_storage, mock_llm):
+        with patch("services.resume_pipeline.extract_text_isolated", return_value="   "):
+            with pytest.raises(ResumeExtractionError, match="No text found"):
+                async with ResumeUploadPipeline(b"pdf", "cv.pdf", "u1") as pipeline:
+                    await pipeline.run()
+        mock_storage.delete_file.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failure_after_run_deletes_object_unless_kept(self, mock_storage, mock_llm, sample_resume_text):
+        with patch("services.resume_pipeline.extract_text_isolated", return_value=sample_resume_text):
+            with pytest.raises(RuntimeError):
+                async with ResumeUploadPipeline(b"pdf", "cv.pdf", "u1") as pipeline:
+                    await pipeline.run()
+                    raise RuntimeError("db write failed")
+        mock_storage.delete_file.assert_awaited_once_with("resumes/u1/key.pdf")
+
+    @pytest.mark.asyncio
+    async def test_storage_failure_is_not_fatal(self, mock_storage, mock_llm, sample_resume_text):
+        mock_storage.upload_file.side_effect = Exception("storage down")
+        with patch("services.resume_pipeline.extract_text_isolated", return_value=sample_resume_text):
+            async with ResumeUploadPipeline(b"pdf", "cv.pdf", "u1") as pipeline:
+                processed = await pipeline.run()
+        assert processed.object_key is None
+        assert processed.parsed_data["name"] == "Jane"
+        mock_storage.delete_file.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_stored_object_is_reused_and_never_deleted(self, mock_storage, mock_llm, sample_resume_text):
+        with patch("services.resume_pipeline.extract_text_isolated", return_value=sample_resume_text):
+            with pytest.raises(RuntimeError):
+                async with ResumeUploadPipeline(
+                    b"pdf", "cv.pdf", "u1", stored_object_key="resumes/u1/abc.pdf"
+                ) as pipeline:
+                    processed = await pipeline.run()
+                    raise RuntimeError("db write failed")
+        assert processed.object_key == "resumes/u1/abc.pdf"
+        assert processed.content_hash == hashlib.sha256(b"pdf").hexdigest()
+        mock_storage.upload_file.assert_not_awaited()
+        mock_storage.delete_file.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_object_already_in_storage_is_not_deleted(self, mock_storage, mock_llm, sample_resume_text):
+        # Another job for the same file saved it first; this one must not remove it on failure.
+        mock_storage.object_exists.return_value = True
+        with patch("services.resume_pipeline.extract_text_isolated", return_value=sample_resume_text):
+            with pytest.raises(RuntimeError):
+                async with ResumeUploadPipeline(b"pdf", "cv.pdf", "u1") as pipeline:
+                    processed = await pipeline.run()
+                    raise RuntimeError("db write failed")
+        assert processed.object_key == f"resumes/u1/{hashlib.sha256(b'pdf').hexdigest()}.pdf"
+        mock_storage.upload_file.assert_not_awaited()
+        mock_storage.delete_file.assert_not_awaited()
+
+
+class TestDuplicateUploads:
+    @pytest_asyncio.fixture
+    async def user(self, session_factory):
+        async with session_factory() as db:
+            user = User(id="u1", email="jane@example.com", name="Jane")
+            db.add_all([
+                user,
+                Portfolio(
+                    id="p1",
+                    user_id="u1",
+                    slug="jane",
+                    parsed_data={"name": "Jane (edited)"},
+                    resume_object_key="resumes/u1/stored.pdf",
+                    resume_sha256=hashlib.sha256(b"same file").hexdigest(),
+                    resume_tone="professional",
+                ),
+            ])
+            await db.commit()
+            return user
+
+    @pytest.mark.asyncio
+    async def test_identical_upload_returns_the_stored_parse(self, session_factory, user, mock_storage, mock_llm):
+        with patch("services.resume_pipeline.extract_text_isolated") as extract:
+            async with session_factory() as db:
+                response = await process_resume(db, user, b"same file", "cv.pdf", mode="merge")
+        assert response["unchanged"] is True
+        assert response["parsed_data"] == {"name": "Jane (edited)"}
+        extract.assert_not_called()
+        mock_llm[0].assert_not_called()
+        mock_storage.upload_file.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_identical_upload_retries_a_fallback_parse(
+        self, session_factory, user, mock_storage, mock_llm, sample_resume_text
+    ):
+        async with session_factory() as db:
+            portfolio = await db.get(Portfolio, "p1", options=LOAD_CONTENT)
+            portfolio.parsed_data = {"name": "", "skills": []}
+            await db.commit()
+
+        with patch("services.resume_pipeline.extract_text_isolated", return_value=sample_resume_text):
+            async with session_factory() as db:
+                response = await process_resume(db, user, b"same file", "cv.pdf", mode="merge")
+        assert response["unchanged"] is False
+        assert response["ai_fallback"] is False
+        assert response["parsed_data"] == {"name": "Jane", "skills": ["Python"]}
+        mock_llm[0].assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_edit_then_replace_with_the_same_file_restores_its_parse(
+        self, session_factory, user, mock_storage, mock_llm, sample_resume_text
+    ):
+        with patch("services.resume_pipeline.extract_text_isolated", return_value=sample_resume_text) as extract:
+            async with session_factory() as db:
+                await process_resume(db, user, b"new file", "cv.pdf")
+            async with session_factory() as db:
+                portfolio = await db.get(Portfolio, "p1", options=LOAD_CONTENT)
+                portfolio.parsed_data = {"name": "Jane (edited again)", "skills": ["Cobol"]}
+                await db.commit()
+
+            async with session_factory() as db:
+                response = await process_resume(db, user, b"new file", "cv.pdf", mode="replace")
+                portfolio = await db.get(Portfolio, "p1", options=LOAD_CONTENT)
+        assert response["unchanged"] is False
+        assert portfolio.parsed_data == {"name": "Jane", "skills": ["Python"]}
+        assert portfolio.career_graph == {"skills": ["Python"]}
+        # The second upload reused the cached parse: no extraction, LLM or storage calls.
+        assert extract.call_count == 1
+        assert mock_llm[0].call_count == 1
+        assert mock_storage.upload_file.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_new_tone_reparses_but_keeps_the_stored_object(
+        self, session_factory, user, mock_storage, mock_llm, sample_resume_text
+    ):
+        with patch("services.resume_pipeline.extract_text_isolated", return_value=sample_resume_text):
+            async with session_factory() as db:
+                response = await process_resume(db, user, b"same file", "cv.pdf", tone="creative")
+                portfolio = await db.get(Portfolio, "p1", options=LOAD_CONTENT)
+        assert response["unchanged"] is False
+        assert portfolio.parsed_data == {"name": "Jane", "skills": ["Python"]}
+        assert (portfolio.resume_object_key, portfolio.resume_tone) == ("resumes/u1/stored.pdf", "creative")
+        mock_storage.upload_file.assert_not_awaited()
+        mock_storage.delete_file.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_different_file_is_stored_under_its_hash(
+        self, session_factory, user, mock_storage, mock_llm, sample_resume_text
+    ):
+        with patch("services.resume_pipeline.extract_text_isolated", return_value=sample_resume_text):
+            async with session_factory() as db:
+                await process_resume(db, user, b"new file", "cv.pdf")
+                portfolio = await db.get(Portfolio, "p1")
+        new_hash = hashlib.sha256(b"new file").hexdigest()
+        mock_storage.upload_file.assert_awaited_once_with(b"new file", "cv.pdf", "u1", new_hash)
+        assert portfolio.resume_sha256 == new_hash
+        mock_storage.delete_file.assert_awaited_once_with("resumes/u1/stored.pdf")
+
+    @pytest.mark.asyncio
+    async def test_failed_version_snapshot_does_not_lose_the_update(
+        self, session_factory, user, mock_storage, mock_llm, sample_resume_text
+    ):
+        from models.portfolio_version import PortfolioVersion
+
+        async def colliding_record_version(db, portfolio_id, parsed_data):
+            # Two rows with one (portfolio_id, seq), as when concurrent jobs race.
+            db.add_all([
+                PortfolioVersion(portfolio_id=portfolio_id, seq=1, is_snapshot=True, payload=b"x"),
+                PortfolioVersion(portfolio_id=portfolio_id, seq=1, is_snapshot=True, payload=b"y"),
+            ])
+            await db.flush()
+
+        with patch("services.resume_pipeline.record_version", side_effect=colliding_record_version), \
+             patch("services.resume_pipeline.extract_text_isolated", return_value=sample_resume_text):
+            async with session_factory() as db:
+                await process_resume(db, user, b"new file", "cv.pdf")
+            async with session_factory() as db:
+                portfolio = await db.get(Portfolio, "p1", options=LOAD_CONTENT)
+        assert portfolio.parsed_data == {"name": "Jane", "skills": ["Python"]}
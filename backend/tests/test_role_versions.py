@@ -0,0 +1,81 @@
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import select
+
+from models.portfolio import Portfolio
+from models.portfolio_role_version import PortfolioRoleVersion
+from models.user import User
+from routers.dynamic_portfolio import (
+    ActivateVersionRequest,
+    activate_role_version,
+    get_role_version_data,
+    get_role_versions,
+    reset_to_original,
+)
+from services.dynamic_portfolio_service import delete_role_versions, save_role_version
+
+
+def _tailored(title: str, skills: int = 3) -> dict:
+    return {"title": title, "summary": "s", "skills": [f"skill {i}" for i in range(skills)], "experience": [{"role": "r"}]}
+
+
+@pytest_asyncio.fixture
+async def user(session_factory):
+    async with session_factory() as db:
+        user = User(id="u1", email="ada@example.com", name="Ada")
+        db.add_all([user, Portfolio(id="p1", user_id="u1", slug="ada", parsed_data="{}")])
+        await db.commit()
+        await save_role_version(db, "p1", "Founder / Startup", _tailored("Founder"))
+        await db.commit()
+        await save_role_version(db, "p1", "Data Scientist", _tailored("Data Scientist", skills=5))
+        await db.commit()
+        return user
+
+
+@pytest.mark.asyncio
+async def test_listing_returns_metadata_only(session_factory, user):
+    async with session_factory() as db:
+        response = await get_role_versions(db=db, current_user=user)
+    assert response["active_role"] is None
+    assert [v["role"] for v in response["versions"]] == ["Founder / Startup", "Data Scientist"]
+    assert response["versions"][1]["skill_count"] == 5
+    assert all("data" not in v for v in response["versions"])
+
+
+@pytest.mark.asyncio
+async def test_fetch_one_version(session_factory, user):
+    async with session_factory() as db:
+        response = await get_role_version_data("Founder / Startup", db=db, current_user=user)
+        assert response["data"]["title"] == "Founder"
+        with pytest.raises(HTTPException) as exc:
+            await get_role_version_data("Designer", db=db, current_user=user)
+        assert exc.value.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_regenerating_replaces_one_row(session_factory, user):
+    async with session_factory() as db:
+        await save_role_version(db, "p1", "Data Scientist", _tailored("Senior Data Scientist", skills=1))
+        await db.commit()
+        rows = (await db.execute(select(PortfolioRoleVersion.role, PortfolioRoleVersion.title))).all()
+    assert sorted(rows) == [("Data Scientist", "Senior Data Scientist"), ("Founder / Startup", "Founder")]
+
+
+@pytest.mark.asyncio
+async def test_activate_and_reset(session_factory, user):
+    async with session_factory() as db:
+        await activate_role_version(ActivateVersionRequest(role="Data Scientist"), db=db, current_user=user)
+        response = await get_role_versions(db=db, current_user=user)
+        assert response["active_role"] == "Data Scientist"
+        assert [v["is_active"] for v in response["versions"]] == [False, True]
+
+        with pytest.raises(HTTPException):
+            await activate_role_version(ActivateVersionRequest(role="Designer"), db=db, current_user=user)
+
+        await reset_to_original(db=db, current_user=user)
+        assert (await db.execute(select(Portfolio.active_role))).scalar_one() is None
+
+        await delete_role_versions(db, ["p1"])
+        await db.commit()
+        assert (await get_role_versions(db=db, current_user=user))["versions"] == []
@@ -0,0 +1,86 @@
+import hashlib
+
+import pytest
+from botocore.exceptions import ClientError
+from botocore.stub import ANY, Stubber
+
+import services.rustfs_service as rustfs_module
+from services.rustfs_service import DELETE_BATCH_SIZE, RustFSService
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(rustfs_module.settings, "rustfs_access_key", "key")
+    monkeypatch.setattr(rustfs_module.settings, "rustfs_secret_key", "secret")
+    monkeypatch.setattr(rustfs_module.settings, "rustfs_bucket_name", "resumes")
+    service = RustFSService()
+    with Stubber(service.s3_client) as stubber:
+        service.stubber = stubber
+        yield service
+        stubber.assert_no_pending_responses()
+    service.shutdown()
+
+
+def test_client_uses_configured_pool_and_retries(service):
+    config = service.s3_client.meta.config
+    assert config.max_pool_connections == rustfs_module.settings.rustfs_max_connections
+    assert config.retries == {"total_max_attempts": rustfs_module.settings.rustfs_max_attempts, "mode": "standard"}
+
+
+@pytest.mark.asyncio
+async def test_batch_delete_uses_one_request_per_thousand_keys(service):
+    keys = [f"resumes/u1/{i:04d}.pdf" for i in range(DELETE_BATCH_SIZE + 5)]
+    service.stubber.add_response(
+        "delete_objects",
+        {"Errors": [{"Key": keys[3], "Code": "AccessDenied", "Message": "no"}]},
+        {"Bucket": "resumes", "Delete": {"Objects": [{"Key": k} for k in keys[:DELETE_BATCH_SIZE]], "Quiet": True}},
+    )
+    service.stubber.add_response(
+        "delete_objects",
+        {"Errors": [{"Key": keys[-1], "Code": "NoSuchKey", "Message": "gone"}]},
+        {"Bucket": "resumes", "Delete": {"Objects": [{"Key": k} for k in keys[DELETE_BATCH_SIZE:]], "Quiet": True}},
+    )
+    assert await service.delete_files(keys + keys[:10] + [None, ""]) == [keys[3]]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_reports_every_key(service):
+    service.stubber.add_client_error("delete_objects", "InternalError", http_status_code=500)
+    assert await service.delete_files(["b", "a"]) == ["a", "b"]
+    assert await service.delete_files([]) == []
+
+
+@pytest.mark.asyncio
+async def test_bucket_check_is_lazy_and_runs_once(service):
+    service.stubber.add_client_error("head_bucket", "404", http_status_code=404)
+    service.stubber.add_response("create_bucket", {}, {"Bucket": "resumes"})
+    service.stubber.add_response(
+        "put_object",
+        {},
+        {"Bucket": "resumes", "Key": ANY, "Body": b"%PDF", "ContentType": "application/pdf"},
+    )
+    service.stubber.add_response("put_object", {}, {"Bucket": "resumes", "Key": ANY, "Body": b"%PDF", "ContentType": ANY})
+
+    key = await service.upload_file(b"%PDF", "CV.PDF", "u1")
+    assert key == f"resumes/u1/{hashlib.sha256(b'%PDF').hexdigest()}.pdf"
+    # No second head_bucket: the stubber would fail on an unexpected call.
+    await service.upload_file(b"%PDF", "cv.docx", "u1")
+
+
+@pytest.mark.asyncio
+async def test_single_delete_treats_missing_as_deleted(service):
+    service.stubber.add_client_error("delete_object", "NoSuchKey", http_status_code=404)
+    service.stubber.add_client_error("delete_object", "AccessDenied", http_status_code=403)
+    assert await service.delete_file("resumes/u1/a.pdf") is True
+    assert await service.delete_file("resumes/u1/b.pdf") is False
+
+
+@pytest.mark.asyncio
+async def test_object_exists(service):
+    service.stubber.add_response("head_object", {}, {"Bucket": "resumes", "Key": "resumes/u1/a.pdf"})
+    service.stubber.add_client_error("head_object", "404", http_status_code=404)
+    service.stubber.add_client_error("head_object", "403", http_status_code=403)
+    assert await service.object_exists("resumes/u1/a.pdf") is True
+    assert await service.object_exists("resumes/u1/b.pdf") is False
+    with pytest.raises(ClientError):
+        await service.object_exists("resumes/u1/c.pdf")
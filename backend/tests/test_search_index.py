@@ -0,0 +1,239 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from models.portfolio import Portfolio
+from models.portfolio_search import PortfolioSearch
+from models.portfolio_skill import PortfolioSkill
+from models.user import User
+from services.portfolio_service import create_portfolio, update_portfolio
+from services.recruiter_service import search_talent
+from services.search_index import (
+    build_search_entry,
+    canonical_skill,
+    reindex_all,
+    remove_from_index,
+    search_portfolios,
+    search_snapshots,
+    tokenize,
+)
+
+
+def _parsed(title: str, skills: list[str], summary: str = "") -> dict:
+    return {"name": "ignored", "title": title, "summary": summary, "skills": skills, "email": "secret@example.com"}
+
+
+def _career(level: str, industries: list[str], technologies: list[str] = ()) -> dict:
+    return {"career_level": level, "industries": industries, "technologies": list(technologies)}
+
+
+@pytest_asyncio.fixture
+async def indexed(session_factory):
+    async with session_factory() as db:
+        db.add_all([
+            User(id="u1", email="ada@example.com", name="Ada Lovelace"),
+            User(id="u2", email="grace@example.com", name="Grace Hopper"),
+            User(id="u3", email="linus@example.com", name="Linus T"),
+        ])
+        await db.commit()
+        await create_portfolio(
+            db, "u1", _parsed("Backend Engineer", ["Python", "PostgreSQL"], "Python Python APIs"),
+            career_graph=_career("senior", ["Fintech"], ["Postgres", "Docker"]),
+        )
+        await create_portfolio(
+            db, "u2", _parsed("Frontend Engineer", ["TypeScript", "React.js", "Python"]),
+            career_graph=_career("mid", ["Healthcare", "Fintech"]),
+        )
+        await create_portfolio(db, "u3", _parsed("Kernel Hacker", ["C", "Git"]), career_graph=_career("senior", []))
+    return session_factory
+
+
+class TestBuildSearchEntry:
+    def test_tokenize(self):
+        assert tokenize("Node.js & C++, FastAPI") == ["node", "js", "c", "fastapi"]
+        assert tokenize(None) == []
+
+    def test_document_and_card(self):
+        portfolio = Portfolio(
+            id="p1",
+            slug="ada",
+            parsed_data=_parsed("Backend Engineer", ["Python"] * 20),
+            career_graph={"skills": ["Distributed Systems"], "industries": ["Fintech"]},
+        )
+        document, card, facets = build_search_entry(portfolio, User(name="Ada Lovelace"))
+        assert "distributed" in document.split()
+        assert "secret" not in document
+        assert card["name"] == "Ada Lovelace"
+        assert len(card["skills"]) == 15
+        assert card["industries"] == ["Fintech"]
+        assert facets == {("skill", "python"): "Python", ("industry", "fintech"): "Fintech"}
+
+    def test_canonical_skill(self):
+        assert canonical_skill("  React.JS ") == "react"
+        assert canonical_skill("Golang") == "go"
+        assert canonical_skill("Machine   Learning") == "machine learning"
+        assert canonical_skill("C++") == "c++"
+
+
+class TestSearchTalent:
+    @pytest.mark.asyncio
+    async def test_skill_and_role_must_all_match(self, indexed):
+        async with indexed() as db:
+            profiles, _, total, _ = await search_talent(db, skills=["python"], role="engineer")
+            assert total == 2
+            assert {p["name"] for p in profiles} == {"Ada Lovelace", "Grace Hopper"}
+
+            profiles, _, total, _ = await search_talent(db, skills=["python", "react"])
+            assert total == 1
+            assert profiles[0]["name"] == "Grace Hopper"
+
+    @pytest.mark.asyncio
+    async def test_skill_filters_use_canonical_names(self, indexed):
+        async with indexed() as db:
+            profiles, _, total, _ = await search_talent(db, skills=["reactjs"])
+            assert [p["name"] for p in profiles] == ["Grace Hopper"]
+
+            # career_graph.technologies are indexed too; "postgres" folds onto postgresql.
+            _, _, total, _ = await search_talent(db, skills=["postgres", "docker"])
+            assert total == 1
+
+            _, _, total, _ = await search_talent(db, skills=["react", "git"])
+            assert total == 0
+            _, _, total, _ = await search_talent(db, skills=["react", "git"], skills_mode="any")
+            assert total == 2
+
+    @pytest.mark.asyncio
+    async def test_industry_and_career_level_filters(self, indexed):
+        async with indexed() as db:
+            _, _, total, _ = await search_talent(db, industries=["fintech"])
+            assert total == 2
+            profiles, _, total, _ = await search_talent(db, industries=["Fintech"], career_levels=["Senior"])
+            assert [p["name"] for p in profiles] == ["Ada Lovelace"]
+            _, _, total, _ = await search_talent(db, career_levels=["mid", "senior"])
+            assert total == 3
+
+    @pytest.mark.asyncio
+    async def test_facet_counts_cover_all_matches(self, indexed):
+        async with indexed() as db:
+            _, _, total, facets = await search_talent(db, skills=["python"], limit=1)
+        assert total == 2
+        assert facets["skill"][0] == {"value": "python", "label": "Python", "count": 2}
+        assert {"value": "fintech", "label": "Fintech", "count": 2} in facets["industry"]
+        assert {f["value"]: f["count"] for f in facets["career_level"]} == {"mid": 1, "senior": 1}
+
+    @pytest.mark.asyncio
+    async def test_query_matches_name_and_prefixes(self, indexed):
+        async with indexed() as db:
+            profiles, _, total, _ = await search_talent(db, query="hopp")
+            assert total == 1
+            assert profiles[0]["title"] == "Frontend Engineer"
+
+            _, _, total, _ = await search_talent(db, query="nonexistent")
+            assert total == 0
+
+    @pytest.mark.asyncio
+    async def test_ranked_by_relevance(self, indexed):
+        async with indexed() as db:
+            profiles, *_ = await search_talent(db, query="python")
+        assert profiles[0]["name"] == "Ada Lovelace"
+
+    @pytest.mark.asyncio
+    async def test_empty_search_pages_newest_first(self, indexed):
+        async with indexed() as db:
+            profiles, next_key, total, _ = await search_talent(db, limit=2)
+            assert total == 3
+            assert len(profiles) == 2
+            assert profiles[0]["updated_at"] >= profiles[1]["updated_at"]
+            rest, last_key, total, _ = await search_talent(db, limit=2, after=next_key)
+        assert len(rest) == 1
+        assert rest[0]["id"] not in {p["id"] for p in profiles}
+        assert last_key is None
+        assert total is None
+
+    @pytest.mark.asyncio
+    async def test_ranked_search_pages_with_cursor(self, indexed):
+        async with indexed() as db:
+            first, next_key, total, _ = await search_talent(db, query="python", limit=1)
+            second, last_key, _, _ = await search_talent(db, query="python", limit=1, after=next_key)
+        assert total == 2
+        assert [p["name"] for p in first + second] == ["Ada Lovelace", "Grace Hopper"]
+        assert last_key is None
+
+    @pytest.mark.asyncio
+    async def test_ranked_pages_ignore_score_changes_between_pages(self, indexed):
+        async with indexed() as db:
+            first, next_key, _, _ = await search_talent(db, query="python", limit=1)
+            # Grace now outranks Ada; with a score boundary page two would repeat Ada.
+            grace = (await db.execute(select(Portfolio).where(Portfolio.user_id == "u2"))).scalar_one()
+            await update_portfolio(db, grace, {"parsed_data": _parsed("Python Engineer", ["Python"], "Python " * 20)})
+            second, last_key, _, _ = await search_talent(db, query="python", limit=1, after=next_key)
+        assert [p["name"] for p in first + second] == ["Ada Lovelace", "Grace Hopper"]
+        assert last_key is None
+
+    @pytest.mark.asyncio
+    async def test_ranked_pages_drop_hidden_profiles_and_survive_expiry(self, indexed):
+        async with indexed() as db:
+            _, next_key, _, _ = await search_talent(db, query="python", limit=1)
+            grace = (await db.execute(select(Portfolio).where(Portfolio.user_id == "u2"))).scalar_one()
+            await update_portfolio(db, grace, {"visible_to_recruiters": False})
+            second, _, _, _ = await search_talent(db, query="python", limit=1, after=next_key)
+            assert second == []
+
+            search_snapshots.memory.clear()
+            await update_portfolio(db, grace, {"visible_to_recruiters": True})
+            second, _, _, _ = await search_talent(db, query="python", limit=1, after=next_key)
+            assert [p["name"] for p in second] == ["Grace Hopper"]
+
+    @pytest.mark.asyncio
+    async def test_cursor_must_match_the_search(self, indexed):
+        async with indexed() as db:
+            _, ranked_key, _, _ = await search_talent(db, query="python", limit=1)
+            _, newest_key, _, _ = await search_talent(db, limit=1)
+            with pytest.raises(ValueError):
+                await search_portfolios(db, [], 1, after=ranked_key)
+            with pytest.raises(ValueError):
+                await search_portfolios(db, ["python"], 1, after=newest_key)
+
+    @pytest.mark.asyncio
+    async def test_ranked_cursor_rejects_changed_filters(self, indexed):
+        async with indexed() as db:
+            _, next_key, _, _ = await search_talent(db, query="python", limit=1)
+            with pytest.raises(ValueError):
+                await search_talent(db, query="python", industries=["fintech"], limit=1, after=next_key)
+            with pytest.raises(ValueError):
+                await search_talent(db, query="python engineer", limit=1, after=next_key)
+            search_snapshots.memory.clear()
+            with pytest.raises(ValueError):
+                await search_talent(db, query="python", skills=["python"], limit=1, after=next_key)
+            second, _, _, _ = await search_talent(db, query="Python", limit=1, after=next_key)
+        assert [p["name"] for p in second] == ["Grace Hopper"]
+
+    @pytest.mark.asyncio
+    async def test_update_portfolio_reindexes(self, indexed):
+        async with indexed() as db:
+            portfolio = (await db.execute(select(Portfolio).where(Portfolio.user_id == "u3"))).scalar_one()
+            await update_portfolio(db, portfolio, {"parsed_data": _parsed("Kernel Hacker", ["Rust"])})
+            profiles, *_ = await search_talent(db, skills=["rust"])
+            assert [p["name"] for p in profiles] == ["Linus T"]
+            _, _, total, _ = await search_talent(db, skills=["git"])
+            assert total == 0
+
+            await update_portfolio(db, portfolio, {"visible_to_recruiters": False})
+            _, _, total, _ = await search_talent(db, skills=["rust"])
+            assert total == 0
+
+    @pytest.mark.asyncio
+    async def test_remove_and_reindex(self, indexed):
+        async with indexed() as db:
+            portfolio_id = (await db.execute(select(Portfolio.id).where(Portfolio.user_id == "u1"))).scalar_one()
+            await remove_from_index(db, [portfolio_id])
+            await db.commit()
+            assert (await db.execute(select(PortfolioSkill).where(PortfolioSkill.portfolio_id == portfolio_id))).first() is None
+            _, _, total, _ = await search_talent(db, query="ada")
+            assert total == 0
+
+            assert await reindex_all(db, batch_size=2) == 3
+            assert len((await db.execute(select(PortfolioSearch))).all()) == 3
+            assert (await db.execute(select(PortfolioSkill).where(PortfolioSkill.portfolio_id == portfolio_id))).first()
+            _, _, total, _ = await search_talent(db, query="ada")
+            assert total == 1
@@ -0,0 +1,90 @@
+import io
+import zipfile
+
+import pytest
+from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi.testclient import TestClient
+
+from utils.uploads import UploadSizeLimitMiddleware, read_upload, sniff_resume_type
+
+LIMIT = 256 * 1024
+
+
+def _docx_bytes() -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("[Content_Types].xml", "<Types/>")
+        archive.writestr("word/document.xml", "<w:document/>")
+    return buffer.getvalue()
+
+
+def _zip_bytes() -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("notes.txt", "hi")
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize(
+    "data,expected",
+    [
+        (b"%PDF-1.7\n...", "pdf"),
+        (b"\xef\xbb\xbf\n%PDF-1.4", "pdf"),
+        (_docx_bytes(), "docx"),
+        (_zip_bytes(), None),
+        (b"PK\x03\x04 truncated", None),
+        (b"<html>not a resume</html>", None),
+        (b"", None),
+    ],
+)
+def test_sniff_resume_type(data, expected):
+    assert sniff_resume_type(data) == expected
+
+
+@pytest.mark.asyncio
+async def test_read_upload_stops_at_the_cap():
+    data = b"x" * (LIMIT + 1)
+    assert await read_upload(UploadFile(io.BytesIO(data[:LIMIT])), LIMIT) == data[:LIMIT]
+
+    upload = UploadFile(io.BytesIO(data))
+    with pytest.raises(HTTPException) as exc:
+        await read_upload(upload, LIMIT)
+    assert exc.value.status_code == 413
+    # Only one chunk past the cap was read.
+    assert upload.file.tell() <= LIMIT + 64 * 1024
+
+    with pytest.raises(HTTPException):
+        await read_upload(UploadFile(io.BytesIO(b"small"), size=LIMIT + 1), LIMIT)
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(UploadSizeLimitMiddleware, limits={"/upload": LIMIT})
+
+    @app.post("/upload")
+    async def upload(file: UploadFile = File(...)):
+        return {"size": len(await read_upload(file, LIMIT))}
+
+    @app.post("/other")
+    async def other(file: UploadFile = File(...)):
+        return {"size": len(await file.read())}
+
+    return TestClient(app)
+
+
+def test_middleware_rejects_declared_oversized_bodies(client):
+    response = client.post("/upload", files={"file": ("cv.pdf", b"x" * (LIMIT + 1))})
+    assert response.status_code == 413
+    assert client.post("/upload", files={"file": ("cv.pdf", b"x" * 1000)}).json() == {"size": 1000}
+    assert client.post("/other", files={"file": ("cv.pdf", b"x" * (LIMIT + 1))}).status_code == 200
+
+
+def test_middleware_counts_bodies_without_content_length(client):
+    def body():
+        for _ in range(100):
+            yield b"x" * 64 * 1024
+
+    # A generator body is sent chunked, with no Content-Length to check up front.
+    response = client.post("/upload", content=body(), headers={"content-type": "multipart/form-data; boundary=b"})
+    assert response.status_code == 413
@@ -0,0 +1,171 @@
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+from sqlalchemy import event, select, update
+from starlette.requests import Request
+
+from models.user import User
+from routers.admin import toggle_user_active
+from services.user_cache import UserCache, user_cache
+from utils.auth import create_access_token, get_current_user, hash_password, load_user, verify_password
+
+
+def _request(user_id: str) -> Request:
+    token = create_access_token({"sub": user_id})
+    return Request({"type": "http", "headers": [(b"authorization", f"Bearer {token}".encode())]})
+
+
+@pytest_asyncio.fixture
+async def users(session_factory):
+    user_cache.clear()
+    async with session_factory() as db:
+        db.add_all([
+            User(id="u1", email="ada@example.com", name="Ada", hashed_password=hash_password("old-pass")),
+            User(id="admin", email="root@example.com", name="Root", is_admin=True),
+        ])
+        await db.commit()
+    yield
+    user_cache.clear()
+
+
+def _count_selects(db) -> list:
+    statements = []
+    event.listen(
+        db.bind.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement) if statement.startswith("SELECT") else None,
+    )
+    return statements
+
+
+@pytest.mark.asyncio
+async def test_second_request_skips_the_database(session_factory, users):
+    async with session_factory() as db:
+        first = await get_current_user(_request("u1"), db)
+    async with session_factory() as db:
+        selects = _count_selects(db)
+        second = await get_current_user(_request("u1"), db)
+        assert second.name == "Ada" and second.created_at is not None
+        assert second in db
+    assert selects == []
+    assert first is not second
+
+
+@pytest.mark.asyncio
+async def test_cached_user_can_be_modified_and_deleted(session_factory, users):
+    async with session_factory() as db:
+        await load_user(db, "u1")
+    async with session_factory() as db:
+        user = await load_user(db, "u1")
+        user.name = "Ada L."
+        await db.refresh(user, ["hashed_password"])
+        assert verify_password("old-pass", user.hashed_password)
+        await db.commit()
+        assert (await db.execute(select(User.name).where(User.id == "u1"))).scalar_one() == "Ada L."
+
+        await db.delete(await load_user(db, "u1"))
+        await db.commit()
+        assert (await db.execute(select(User).where(User.id == "u1"))).scalar_one_or_none() is None
+
+
+@pytest.mark.asyncio
+async def test_admin_toggle_invalidates(session_factory, users):
+    async with session_factory() as db:
+        await get_current_user(_request("u1"), db)
+        admin = await load_user(db, "admin")
+        await toggle_user_active("u1", db=db, _=admin)
+    async with session_factory() as db:
+        with pytest.raises(HTTPException) as exc:
+            await get_current_user(_request("u1"), db)
+    assert exc.value.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_unrelated_writes_are_served_until_invalidated(session_factory, users):
+    async with session_factory() as db:
+        await load_user(db, "u1")
+        await db.execute(update(User).where(User.id == "u1").values(name="Changed"))
+        await db.commit()
+    async with session_factory() as db:
+        assert (await load_user(db, "u1")).name == "Ada"
+    await user_cache.invalidate("u1")
+    async with session_factory() as db:
+        assert (await load_user(db, "u1")).name == "Changed"
+
+
+class _FakeRedis:
+    """Just enough of redis.asyncio for UserCache; eval runs _SET_IF_CURRENT's logic."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def eval(self, _script, _numkeys, key, generation_key, generation, payload, _ex):
+        if self.data.get(generation_key, "0") != generation:
+            return 0
+        self.data[key] = payload
+        return 1
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis, self.ops = redis, []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def delete(self, key):
+        self.ops.append(lambda: self.redis.data.pop(key, None))
+
+    def incr(self, key):
+        self.ops.append(lambda: self.redis.data.__setitem__(key, str(int(self.redis.data.get(key, "0")) + 1)))
+
+    def expire(self, key, seconds):
+        pass
+
+    async def execute(self):
+        for op in self.ops:
+            op()
+
+
+@pytest.mark.asyncio
+async def test_fill_that_raced_an_invalidation_is_dropped(session_factory, users):
+    cache = UserCache(max_entries=10, ttl=30)
+    async with session_factory() as db:
+        user = (await db.execute(select(User).where(User.id == "u1"))).scalar_one()
+    generation = await cache.generation("u1")
+    await cache.invalidate("u1")
+    await cache.set(user, generation)
+    assert await cache.get("u1") is None
+
+    await cache.set(user, await cache.generation("u1"))
+    assert (await cache.get("u1"))["name"] == "Ada"
+
+
+@pytest.mark.asyncio
+async def test_fill_that_raced_another_workers_invalidation_is_dropped(session_factory, users):
+    redis = _FakeRedis()
+    cache, other_worker = UserCache(10, 30, "redis://fake"), UserCache(10, 30, "redis://fake")
+    cache._client = other_worker._client = redis
+    async with session_factory() as db:
+        user = (await db.execute(select(User).where(User.id == "u1"))).scalar_one()
+    generation = await cache.generation("u1")
+    await other_worker.invalidate("u1")
+    await cache.set(user, generation)
+    assert "user:u1" not in redis.data
+    assert await cache.get("u1") is None
+
+    await cache.set(user, await cache.generation("u1"))
+    assert "user:u1" in redis.data
+    assert (await other_worker.get("u1"))["name"] == "Ada"
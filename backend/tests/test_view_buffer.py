@@ -0,0 +1,91 @@
+import pytest
+import pytest_asyncio
+from unittest.mock import patch
+from sqlalchemy import func, select
+
+from models.page_view import PageView
+from models.page_view_daily import PageViewDaily
+from models.portfolio import Portfolio
+from models.user import User
+from services.view_buffer import ViewBuffer
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def _seed(session_factory):
+    async with session_factory() as db:
+        db.add(User(id="u1", email="jane@example.com", name="Jane"))
+        db.add(Portfolio(id="p1", user_id="u1", slug="jane", view_count=3))
+        await db.commit()
+    with patch("services.view_buffer.AsyncSessionLocal", session_factory):
+        yield
+
+
+def _record(buffer: ViewBuffer, portfolio_id: str = "p1") -> None:
+    buffer.record(portfolio_id, "direct", "Mozilla/5.0", "1.2.3.4", "unknown", 0, "desktop", "Direct")
+
+
+class TestViewBuffer:
+    @pytest.mark.asyncio
+    async def test_flush_batches_rows_and_increments(self, session_factory):
+        buffer = ViewBuffer(flush_interval=60, max_pending=100, max_backlog=100)
+        for _ in range(5):
+            _record(buffer)
+        assert buffer.pending_for("p1") == 5
+
+        assert await buffer.flush() == 5
+        assert buffer.pending == 0
+        assert buffer.pending_for("p1") == 0
+
+        async with session_factory() as db:
+            views = await db.scalar(select(func.count(PageView.id)))
+            view_count = await db.scalar(select(Portfolio.view_count).where(Portfolio.id == "p1"))
+        assert views == 5
+        assert view_count == 8
+
+    @pytest.mark.asyncio
+    async def test_views_for_deleted_portfolio_are_skipped(self, session_factory):
+        buffer = ViewBuffer(flush_interval=60, max_pending=100, max_backlog=100)
+        _record(buffer, "gone")
+        _record(buffer)
+        assert await buffer.flush() == 1
+
+    @pytest.mark.asyncio
+    async def test_backlog_is_capped(self, session_factory):
+        buffer = ViewBuffer(flush_interval=60, max_pending=100, max_backlog=2)
+        for _ in range(4):
+            _record(buffer)
+        assert buffer.pending == 2
+        assert buffer.dropped == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_is_retried(self, session_factory):
+        buffer = ViewBuffer(flush_interval=60, max_pending=100, max_backlog=100)
+        _record(buffer)
+        with patch("services.view_buffer.AsyncSessionLocal", side_effect=RuntimeError("db down")):
+            assert await buffer.flush() == 0
+        assert buffer.pending_for("p1") == 1
+        assert await buffer.flush() == 1
+
+    @pytest.mark.asyncio
+    async def test_stop_flushes_pending_views(self, session_factory):
+        buffer = ViewBuffer(flush_interval=60, max_pending=100, max_backlog=100)
+        await buffer.start()
+        _record(buffer)
+        await buffer.stop()
+        async with session_factory() as db:
+            assert await db.scalar(select(func.count(PageView.id))) == 1
+
+    @pytest.mark.asyncio
+    async def test_flush_updates_daily_rollup(self, session_factory):
+        buffer = ViewBuffer(flush_interval=60, max_pending=100, max_backlog=100)
+        _record(buffer)
+        _record(buffer)
+        await buffer.flush()
+        _record(buffer)
+        await buffer.flush()
+        async with session_factory() as db:
+            rows = (await db.execute(select(PageViewDaily))).scalars().all()
+        assert len(rows) == 1
+        assert rows[0].views == 3
+        assert rows[0].referrer_source == "Direct"
+        assert rows[0].device == "desktop"
@@ -8,6 +8,8 @@ from sqlalchemy import select
 from config import get_settings
 from database import get_db
 from models.user import User
+from services.password_hasher import PasswordHasherBusy, password_hasher
+from services.user_cache import hydrate, user_cache
 
 settings = get_settings()
 
@@ -24,6 +26,27 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password.encode("utf-8"), hashed_password.encode("utf-8"))
 
 
+async def _run_hasher(op: str, fn, *args):
+    try:
+        return await password_hasher.run(op, fn, *args)
+    except PasswordHasherBusy:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many sign-in requests right now. Please try again in a few seconds.",
+            headers={"Retry-After": "2"},
+        )
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password on the bcrypt pool. Raises HTTP 429 when the pool's backlog is full."""
+    return await _run_hasher("hash", hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the bcrypt pool. Raises HTTP 429 when the pool's backlog is full."""
+    return await _run_hasher("verify", verify_password, plain_password, hashed_password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.access_token_expire_minutes))
@@ -59,6 +82,24 @@ def decode_token(token: str, expected_type: Optional[str] = None) -> Optional[st
     return user_id
 
 
+async def load_user(db: AsyncSession, user_id: str) -> Optional[User]:
+    """The user attached to `db`, served from user_cache when possible.
+
+    A cached user can be modified and committed like a queried one, but its
+    hashed_password and refresh_token are not loaded: `await db.refresh(user)`
+    before reading them.
+    """
+    row = await user_cache.get(user_id)
+    if row is not None:
+        return await db.merge(hydrate(row), load=False)
+    generation = await user_cache.generation(user_id)
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+    if user:
+        await user_cache.set(user, generation)
+    return user
+
+
 async def get_current_user(
     request: Request,
     db: AsyncSession = Depends(get_db),
@@ -84,10 +125,8 @@ async def get_current_user(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired session. Please log in again.",
         )
-        
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
-    
+
+    user = await load_user(db, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
     
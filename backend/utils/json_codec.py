@@ -0,0 +1,86 @@
+"""Project-wide JSON codec (orjson).
+
+Use these instead of the stdlib `json` module for anything on a request path:
+response bodies, cached payloads, LLM prompts/replies, JSON columns. orjson
+emits compact UTF-8 and is several times faster on large portfolio documents.
+Beyond what orjson encodes natively, sets become lists and Decimals strings;
+anything else raises TypeError. Call sites that really want the stdlib's
+`default=str` behaviour pass `default=str`.
+"""
+import uuid
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Callable
+
+import orjson
+from fastapi.responses import JSONResponse
+
+# Subclass of json.JSONDecodeError (and ValueError), so existing handlers still catch it.
+JSONDecodeError = orjson.JSONDecodeError
+
+_BASE_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    # orjson encodes datetime and UUID itself; these cover subclasses it passes on.
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, uuid.UUID)):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _with_fallback(default: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def encode(value: Any) -> Any:
+        try:
+            return _default(value)
+        except TypeError:
+            return default(value)
+
+    return encode
+
+
+def dumpb(
+    value: Any,
+    *,
+    indent: bool = False,
+    sort_keys: bool = False,
+    default: Callable[[Any], Any] | None = None,
+) -> bytes:
+    """Encode to UTF-8 bytes; `default` handles values the codec rejects."""
+    option = _BASE_OPTIONS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    encoder = _default if default is None else _with_fallback(default)
+    return orjson.dumps(value, default=encoder, option=option)
+
+
+def dumps(
+    value: Any,
+    *,
+    indent: bool = False,
+    sort_keys: bool = False,
+    default: Callable[[Any], Any] | None = None,
+) -> str:
+    return dumpb(value, indent=indent, sort_keys=sort_keys, default=default).decode()
+
+
+def loads(data: str | bytes | bytearray | memoryview) -> Any:
+    return orjson.loads(data)
+
+
+def clone(value: Any) -> Any:
+    """Deep copy of a JSON-compatible value; an orjson round trip beats copy.deepcopy."""
+    return orjson.loads(orjson.dumps(value, default=_default, option=_BASE_OPTIONS))
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson."""
+
+    def render(self, content: Any) -> bytes:
+        return dumpb(content)
+
@@ -0,0 +1,99 @@
+"""Minimal RFC 6902 JSON Patch: diff two JSON documents and apply the result.
+
+Only add/remove/replace are produced. Lists are diffed after trimming the
+common prefix and suffix, so inserting or dropping an entry (a new job at
+the top of `experience`) is one op rather than a rewrite of every element.
+"""
+from typing import Any
+
+from utils.json_codec import clone
+
+
+def _escape(token: Any) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _same(a: Any, b: Any) -> bool:
+    # True == 1 in Python but not in JSON.
+    return type(a) is type(b) and a == b
+
+
+def make_patch(source: Any, target: Any, path: str = "") -> list[dict]:
+    """Operations that turn `source` into `target`."""
+    if _same(source, target):
+        return []
+    if isinstance(source, dict) and isinstance(target, dict):
+        ops = [{"op": "remove", "path": f"{path}/{_escape(key)}"} for key in source if key not in target]
+        for key, value in target.items():
+            child = f"{path}/{_escape(key)}"
+            if key in source:
+                ops.extend(make_patch(source[key], value, child))
+            else:
+                ops.append({"op": "add", "path": child, "value": value})
+        return ops
+    if isinstance(source, list) and isinstance(target, list):
+        prefix = 0
+        while prefix < min(len(source), len(target)) and _same(source[prefix], target[prefix]):
+            prefix += 1
+        suffix = 0
+        while (
+            suffix < min(len(source), len(target)) - prefix
+            and _same(source[-1 - suffix], target[-1 - suffix])
+        ):
+            suffix += 1
+        old = source[prefix:len(source) - suffix]
+        new = target[prefix:len(target) - suffix]
+        ops = []
+        for index in range(min(len(old), len(new))):
+            ops.extend(make_patch(old[index], new[index], f"{path}/{prefix + index}"))
+        for index in range(len(old) - 1, len(new) - 1, -1):
+            ops.append({"op": "remove", "path": f"{path}/{prefix + index}"})
+        for index in range(len(old), len(new)):
+            ops.append({"op": "add", "path": f"{path}/{prefix + index}", "value": new[index]})
+        return ops
+    return [{"op": "replace", "path": path, "value": target}]
+
+
+def apply_patch(document: Any, ops: list[dict]) -> Any:
+    """Return a patched copy of `document`. Raises ValueError for ops that don't fit it."""
+    document = clone(document)
+    for op in ops:
+        kind, path = op.get("op"), op.get("path", "")
+        if path == "":
+            if kind not in ("add", "replace"):
+                raise ValueError(f"Cannot {kind} the document root")
+            document = clone(op["value"])
+            continue
+        *parents, last = [_unescape(token) for token in path.split("/")[1:]]
+        try:
+            container = document
+            for token in parents:
+                container = container[int(token) if isinstance(container, list) else token]
+            if isinstance(container, list):
+                index = len(container) if last == "-" else int(last)
+                if kind == "add":
+                    if index > len(container):
+                        raise IndexError(index)
+                    container.insert(index, clone(op["value"]))
+                elif kind == "remove":
+                    del container[index]
+                elif kind == "replace":
+                    container[index] = clone(op["value"])
+                else:
+                    raise ValueError(f"Unsupported op {kind!r}")
+            else:
+                if kind in ("add", "replace"):
+                    if kind == "replace" and last not in container:
+                        raise KeyError(last)
+                    container[last] = clone(op["value"])
+                elif kind == "remove":
+                    del container[last]
+                else:
+                    raise ValueError(f"Unsupported op {kind!r}")
+        except (KeyError, IndexError, TypeError) as exc:
+            raise ValueError(f"Patch path {path!r} does not match the document") from exc
+    return document
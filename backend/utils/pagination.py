@@ -0,0 +1,54 @@
+import base64
+from datetime import datetime
+from typing import Any, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import literal, tuple_
+from sqlalchemy.sql.elements import ColumnElement
+
+from utils.json_codec import dumps, loads
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and set(value) == {"dt"}:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(key: Sequence[Any] | None) -> str | None:
+    """Opaque, URL-safe cursor for the sort key of the last row on a page."""
+    if key is None:
+        return None
+    raw = dumps([_encode_value(value) for value in key])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None, size: int) -> tuple | None:
+    """Inverse of encode_cursor. Raises 400 for cursors this endpoint didn't issue."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = loads(raw)
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError(cursor)
+        return tuple(_decode_value(value) for value in values)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def after_key(columns: Sequence[ColumnElement], key: Sequence[Any]) -> ColumnElement:
+    """WHERE clause for rows after `key` when every column is sorted descending."""
+    return tuple_(*columns) < tuple_(*(literal(value, column.type) for column, value in zip(columns, key)))
+
+
+def split_page(rows: Sequence, limit: int, key_of) -> tuple[list, tuple | None]:
+    """Trim a `limit + 1` fetch to one page; returns (rows, key of the last row if more exist)."""
+    page = list(rows[:limit])
+    return page, (tuple(key_of(page[-1])) if len(rows) > limit else None)
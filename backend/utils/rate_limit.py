@@ -1,103 +1,216 @@
 from __future__ import annotations
 
-from collections import defaultdict, deque
+import math
+from collections import OrderedDict
+from dataclasses import dataclass
 from threading import Lock
 from time import time
 
-from fastapi import HTTPException, status
+from fastapi import HTTPException, Request, status
 from loguru import logger
 
 from config import get_settings
 
 
-class InMemoryRateLimiter:
-    """Small in-memory rate limiter for single-process deployments."""
+@dataclass(frozen=True)
+class RateLimit:
+    """`limit` requests per `window_seconds`, refilled continuously (GCRA)."""
+
+    limit: int
+    window_seconds: int
+    message: str
+
+    @property
+    def interval(self) -> float:
+        return self.window_seconds / self.limit
+
+
+# Defaults per route. Override the numbers with the `rate_limits` setting,
+# e.g. "auth_login=20/60,resume_upload=10/300".
+RATE_LIMITS: dict[str, RateLimit] = {
+    "auth_register": RateLimit(5, 60, "Too many registration attempts. Please wait a minute."),
+    "auth_google": RateLimit(20, 60, "Too many Google sign-in attempts. Please try again shortly."),
+    "auth_login": RateLimit(10, 60, "Too many login attempts. Please wait a minute."),
+    "auth_resend_verification": RateLimit(
+        3, 300, "Too many verification email requests. Please try again in a few minutes."
+    ),
+    "auth_forgot_password": RateLimit(5, 300, "Too many password reset requests. Please try again later."),
+    "auth_reset_password": RateLimit(10, 300, "Too many password reset attempts. Please try again shortly."),
+    "portfolio_regenerate": RateLimit(20, 300, "Too many AI regenerate requests. Please wait a few minutes."),
+    "resume_upload": RateLimit(6, 300, "Too many upload attempts. Please wait a few minutes and try again."),
+}
+
+
+def _parse_overrides(raw: str) -> dict[str, tuple[int, int]]:
+    """Parse "route=limit/window,route=limit/window", ignoring malformed entries."""
+    overrides: dict[str, tuple[int, int]] = {}
+    for item in (raw or "").split(","):
+        route, sep, value = item.partition("=")
+        if not sep or not route.strip():
+            continue
+        try:
+            limit, window = value.split("/")
+            overrides[route.strip()] = (max(1, int(limit)), max(1, int(window)))
+        except ValueError:
+            logger.warning(f"Ignoring invalid rate limit entry: {item!r}")
+    return overrides
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float  # seconds until the bucket is full again
+    retry_after: float  # seconds until the next request is allowed (0 if allowed)
+
+    def headers(self) -> dict[str, str]:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(math.ceil(self.reset_after)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
+def _result(rule: RateLimit, allowed: bool, retry_after: float, backlog: float) -> RateLimitResult:
+    """`backlog` is how far the key's theoretical arrival time is ahead of now."""
+    remaining = max(0, math.floor((rule.window_seconds - backlog) / rule.interval + 1e-9))
+    return RateLimitResult(allowed, rule.limit, remaining, max(0.0, backlog), retry_after)
 
-    def __init__(self) -> None:
-        self._hits: dict[str, deque[float]] = defaultdict(deque)
-        self._lock = Lock()
 
-    def enforce(self, key: str, limit: int, window_seconds: int, message: str) -> None:
-        now = time()
-        cutoff = now - window_seconds
+class InMemoryRateLimiter:
+    """GCRA in process memory, for single-process deployments and as the Redis fallback.
+
+    Stores one float per key. The table is an LRU capped at `max_keys`, and
+    keys whose bucket has refilled are swept every `sweep_every` calls, so
+    a stream of one-off IPs cannot grow it without bound.
+    """
+
+    def __init__(self, max_keys: int = 100_000, sweep_every: int = 1000) -> None:
+        self.max_keys = max(1, max_keys)
+        self.sweep_every = max(1, sweep_every)
+        self._tat: OrderedDict[str, float] = OrderedDict()
+        self._calls = 0
+        self._lock = Lock()
 
+    def hit(self, key: str, rule: RateLimit, now: float | None = None) -> RateLimitResult:
+        now = time() if now is None else now
         with self._lock:
-            bucket = self._hits[key]
-            while bucket and bucket[0] < cutoff:
-                bucket.popleft()
-
-            if len(bucket) >= limit:
-                raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=message)
-
-            bucket.append(now)
+            self._calls += 1
+            if self._calls % self.sweep_every == 0:
+                self._sweep(now)
+
+            tat = max(self._tat.get(key, now), now)
+            new_tat = tat + rule.interval
+            allow_at = new_tat - rule.window_seconds
+            if now < allow_at:
+                self._tat.move_to_end(key)
+                return _result(rule, False, allow_at - now, tat - now)
+
+            self._tat[key] = new_tat
+            self._tat.move_to_end(key)
+            while len(self._tat) > self.max_keys:
+                self._tat.popitem(last=False)
+            return _result(rule, True, 0.0, new_tat - now)
+
+    def _sweep(self, now: float) -> None:
+        # A key whose TAT has passed behaves exactly like an unseen key.
+        for key in [key for key, tat in self._tat.items() if tat <= now]:
+            del self._tat[key]
+
+    def __len__(self) -> int:
+        return len(self._tat)
+
+
+# KEYS[1] = bucket key; ARGV = interval, window (seconds).
+# Returns {allowed, retry_after, backlog}; floats are returned as strings
+# because Redis truncates Lua numbers to integers.
+_GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local interval = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then tat = now end
+local new_tat = tat + interval
+local allow_at = new_tat - window
+if now < allow_at then
+  return {0, tostring(allow_at - now), tostring(tat - now)}
+end
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, '0', tostring(new_tat - now)}
+"""
 
 
 class RedisRateLimiter:
-    """Redis-backed sliding-window counter (best-effort) for multi-instance deployments."""
+    """GCRA in Redis for multi-instance deployments.
+
+    One key per bucket, holding one number, updated by one Lua script call.
+    The script uses Redis' clock, so app servers with skewed clocks still agree.
+    """
 
     def __init__(self, redis_url: str) -> None:
         self._redis_url = redis_url
         self._client = None
+        self._script = None
 
-    async def _get_client(self):
-        if self._client is not None:
-            return self._client
-        try:
+    def _get_script(self):
+        if self._script is None:
             import redis.asyncio as redis  # type: ignore
 
             self._client = redis.from_url(self._redis_url, decode_responses=True)
-            return self._client
-        except Exception as e:
-            logger.warning(f"Redis rate limiter disabled (init failed): {e}")
-            self._client = None
-            return None
-
-    async def enforce(self, key: str, limit: int, window_seconds: int, message: str) -> None:
-        client = await self._get_client()
-        if client is None:
-            # If Redis is unavailable, caller should fall back to in-memory limiter.
-            raise RuntimeError("redis_unavailable")
-
-        # Sliding window with ZSET of timestamps.
-        now = time()
-        cutoff = now - window_seconds
-        zkey = f"rl:{key}"
+            self._script = self._client.register_script(_GCRA_SCRIPT)
+        return self._script
 
-        try:
-            async with client.pipeline(transaction=True) as pipe:
-                pipe.zremrangebyscore(zkey, 0, cutoff)
-                pipe.zadd(zkey, {str(now): now})
-                pipe.zcard(zkey)
-                pipe.expire(zkey, window_seconds + 10)
-                _, _, count, _ = await pipe.execute()
-
-            if int(count) > limit:
-                raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail=message)
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.warning(f"Redis rate limiter error; falling back to in-memory: {e}")
-            raise RuntimeError("redis_error")
+    async def hit(self, key: str, rule: RateLimit) -> RateLimitResult:
+        allowed, retry_after, backlog = await self._get_script()(
+            keys=[f"rl:{key}"], args=[rule.interval, rule.window_seconds]
+        )
+        return _result(rule, bool(int(allowed)), float(retry_after), float(backlog))
 
 
 class RateLimiter:
-    """Unified limiter with Redis (optional) + in-memory fallback."""
+    """Per-route limits, enforced in Redis when configured, else (or on Redis errors) in memory."""
 
     def __init__(self) -> None:
         self._settings = get_settings()
-        self._mem = InMemoryRateLimiter()
+        self._mem = InMemoryRateLimiter(max_keys=self._settings.rate_limit_memory_max_keys)
         self._redis = RedisRateLimiter(self._settings.redis_url) if self._settings.redis_url else None
-
-    async def enforce(self, key: str, limit: int, window_seconds: int, message: str) -> None:
+        self.rules = dict(RATE_LIMITS)
+        for route, (limit, window) in _parse_overrides(self._settings.rate_limits).items():
+            if route not in self.rules:
+                logger.warning(f"Ignoring rate limit override for unknown route {route!r}")
+                continue
+            self.rules[route] = RateLimit(limit, window, self.rules[route].message)
+
+    async def check(self, key: str, rule: RateLimit) -> RateLimitResult:
         if self._redis is not None:
             try:
-                await self._redis.enforce(key, limit, window_seconds, message)
-                return
-            except RuntimeError:
-                # fall back
-                pass
-
-        self._mem.enforce(key, limit, window_seconds, message)
+                return await self._redis.hit(key, rule)
+            except Exception as e:
+                logger.warning(f"Redis rate limiter error; falling back to in-memory: {e}")
+        return self._mem.hit(key, rule)
+
+    async def enforce(self, request: Request, route: str, identity: str = "") -> RateLimitResult:
+        """Count one request for `route` from this client (and `identity`, e.g. an email or user id).
+
+        Raises 429 with Retry-After once the limit is reached. The X-RateLimit-*
+        headers are stored on `request.state` for the response middleware.
+        """
+        rule = self.rules[route]
+        ip = request.client.host if request.client else "unknown"
+        result = await self.check(f"{route}:{ip}:{identity}".lower(), rule)
+        request.state.rate_limit_headers = result.headers()
+        if not result.allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=rule.message,
+                headers=result.headers(),
+            )
+        return result
 
 
 rate_limiter = RateLimiter()
@@ -0,0 +1,93 @@
+import io
+import zipfile
+
+from fastapi import HTTPException, UploadFile
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CHUNK_SIZE = 64 * 1024
+# Room for multipart boundaries and the small form fields sent with a file.
+FORM_OVERHEAD_BYTES = 64 * 1024
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"File size exceeds {max_bytes // (1024 * 1024)}MB limit",
+    )
+
+
+class UploadSizeLimitMiddleware:
+    """Cap request bodies on upload routes before the multipart parser stores them.
+
+    Requests that declare a larger Content-Length get 413 right away. Requests
+    that don't are counted as they stream in and aborted with 413 as soon as
+    they pass the cap, so an oversized body is never read to the end.
+    """
+
+    def __init__(self, app: ASGIApp, limits: dict[str, int]) -> None:
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limit = self.limits.get(scope.get("path", "")) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope.get("headers", []):
+            if name == b"content-length" and value.isdigit() and int(value) > limit:
+                await send({
+                    "type": "http.response.start",
+                    "status": 413,
+                    "headers": [(b"content-type", b"application/json"), (b"connection", b"close")],
+                })
+                await send({"type": "http.response.body", "body": b'{"detail":"Request body too large"}'})
+                return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # FastAPI re-raises HTTPExceptions from body parsing, so this becomes a 413 response.
+                    raise HTTPException(
+                        status_code=413,
+                        detail="Request body too large",
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+async def read_upload(file: UploadFile, max_bytes: int) -> bytes:
+    """Read an upload in chunks, raising 413 as soon as it passes `max_bytes`.
+
+    Peak memory is bounded by the cap however large the client's file is.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise _too_large(max_bytes)
+    buffer = bytearray()
+    while chunk := await file.read(CHUNK_SIZE):
+        if len(buffer) + len(chunk) > max_bytes:
+            raise _too_large(max_bytes)
+        buffer += chunk
+    return bytes(buffer)
+
+
+def sniff_resume_type(data: bytes) -> str | None:
+    """"pdf" or "docx" judged from the file's contents, or None for anything else."""
+    # PDF readers accept a header anywhere in the first KiB.
+    if b"%PDF-" in data[:1024]:
+        return "pdf"
+    if data[:4] == b"PK\x03\x04":
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                names = set(archive.namelist())
+        except zipfile.BadZipFile:
+            return None
+        if "[Content_Types].xml" in names and "word/document.xml" in names:
+            return "docx"
+    return None
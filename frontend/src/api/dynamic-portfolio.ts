@@ -1,5 +1,14 @@
 import apiClient from './client'
 
+export interface RoleVersionSummary {
+    role: string
+    title: string | null
+    skill_count: number
+    experience_count: number
+    updated_at: string | null
+    is_active: boolean
+}
+
 export interface RoleVersion {
     role: string
     data: {
@@ -31,7 +40,10 @@ export const dynamicPortfolioApi = {
         apiClient.get<{ suggested_roles: string[] }>('/portfolio/dynamic/suggested-roles'),
 
     getVersions: () =>
-        apiClient.get<{ versions: RoleVersion[]; active_role: string | null }>('/portfolio/dynamic/versions'),
+        apiClient.get<{ versions: RoleVersionSummary[]; active_role: string | null }>('/portfolio/dynamic/versions'),
+
+    getVersion: (role: string) =>
+        apiClient.get<RoleVersion>(`/portfolio/dynamic/versions/${encodeURIComponent(role)}`),
 
     generate: (target_role: string) =>
         apiClient.post<{ role: string; data: RoleVersion['data']; message: string }>(
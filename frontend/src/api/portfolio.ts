@@ -1,5 +1,11 @@
 import apiClient from './client'
 
+export interface PortfolioVersion {
+    version: number
+    saved_at: string | null
+    stored_bytes: number
+}
+
 export const portfolioApi = {
     getMyPortfolio: () => apiClient.get('/portfolio/me'),
     updateMyPortfolio: (data: object) => apiClient.put('/portfolio/me', data),
@@ -14,5 +20,7 @@ export const portfolioApi = {
     updateSlug: (slug: string) => apiClient.patch('/portfolio/me/slug', { slug }),
     askCopilot: (slug: string, question: string) =>
         apiClient.post(`/portfolio/public/${slug}/ask`, { question }),
+    listVersions: () => apiClient.get<{ versions: PortfolioVersion[] }>('/portfolio/me/versions'),
+    restoreVersion: (version: number) => apiClient.post(`/portfolio/me/versions/${version}/restore`),
 }
 
@@ -17,21 +17,44 @@ export interface TalentProfile {
     updated_at: string
 }
 
+export interface FacetCount {
+    value: string
+    label: string
+    count: number
+}
+
 export interface SearchResult {
     profiles: TalentProfile[]
-    total: number
+    total: number | null
     limit: number
-    offset: number
+    next_cursor: string | null
+    facets: {
+        skill: FacetCount[]
+        industry: FacetCount[]
+        career_level: FacetCount[]
+    }
 }
 
 export const recruiterApi = {
-    search: (params: { query?: string; skills?: string; role?: string; limit?: number; offset?: number }) => {
+    search: (params: {
+        query?: string
+        skills?: string
+        skillsMode?: 'all' | 'any'
+        role?: string
+        industry?: string
+        careerLevel?: string
+        limit?: number
+        cursor?: string
+    }) => {
         const searchParams = new URLSearchParams()
         if (params.query) searchParams.set('query', params.query)
         if (params.skills) searchParams.set('skills', params.skills)
+        if (params.skillsMode) searchParams.set('skills_mode', params.skillsMode)
         if (params.role) searchParams.set('role', params.role)
+        if (params.industry) searchParams.set('industry', params.industry)
+        if (params.careerLevel) searchParams.set('career_level', params.careerLevel)
         if (params.limit) searchParams.set('limit', String(params.limit))
-        if (params.offset) searchParams.set('offset', String(params.offset))
+        if (params.cursor) searchParams.set('cursor', params.cursor)
         return apiClient.get<SearchResult>(`/recruiter/search?${searchParams.toString()}`)
     },
 
@@ -1,5 +1,27 @@
 import apiClient from './client'
 
+const JOB_POLL_INTERVAL_MS = 1500
+const JOB_TIMEOUT_MS = 5 * 60 * 1000
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms))
+
+// Polls a background resume job until it finishes. Resolves with the same shape
+// the synchronous upload endpoint used to return, so callers keep using `r.data`.
+async function waitForJob(jobId: string) {
+    const deadline = Date.now() + JOB_TIMEOUT_MS
+    while (Date.now() < deadline) {
+        const { data: job } = await apiClient.get(`/resume/jobs/${jobId}`)
+        if (job.status === 'succeeded') {
+            return { data: job.result }
+        }
+        if (job.status === 'failed') {
+            throw { response: { data: { detail: job.error || 'Upload failed. Please try again.' } } }
+        }
+        await sleep(JOB_POLL_INTERVAL_MS)
+    }
+    throw { response: { data: { detail: 'Processing is taking longer than expected. Please check back shortly.' } } }
+}
+
 export const resumeApi = {
     upload: (file: File, tone: string = 'professional', mode: string = 'replace') => {
         if (/\.doc$/i.test(file.name)) {
@@ -23,9 +45,13 @@ export const resumeApi = {
         formData.append('file', file, filename)
         formData.append('tone', tone)
         formData.append('mode', mode)
-        return apiClient.post('/resume/upload', formData, {
-            // Let the browser attach the multipart boundary automatically.
-            timeout: 120000, // 120s — allows for slow cold starts and AI processing
-        })
+        return apiClient
+            .post('/resume/upload', formData, {
+                // Let the browser attach the multipart boundary automatically.
+                timeout: 120000, // 120s — allows for slow cold starts on the upload itself
+            })
+            .then(r => waitForJob(r.data.job_id))
     },
+
+    getJob: (jobId: string) => apiClient.get(`/resume/jobs/${jobId}`),
 }
@@ -1,5 +1,5 @@
 import { useState } from 'react'
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
+import { useQuery, useInfiniteQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import apiClient from '@/api/client'
 import toast from 'react-hot-toast'
 import {
@@ -45,15 +45,26 @@ export default function AdminPage() {
         queryFn: () => apiClient.get('/admin/stats').then(r => r.data),
     })
 
-    const { data: users, isLoading: usersLoading } = useQuery({
+    const usersQuery = useInfiniteQuery({
         queryKey: ['admin-users', search],
-        queryFn: () => apiClient.get(`/admin/users?search=${search}`).then(r => r.data),
+        queryFn: ({ pageParam }) => apiClient.get('/admin/users', {
+            params: { search, cursor: pageParam || undefined },
+        }).then(r => r.data),
+        initialPageParam: '',
+        getNextPageParam: (lastPage: { next_cursor: string | null }) => lastPage.next_cursor,
     })
+    const users = usersQuery.data?.pages.flatMap((page: any) => page.users)
+    const usersLoading = usersQuery.isLoading
 
-    const { data: portfolios } = useQuery({
+    const portfoliosQuery = useInfiniteQuery({
         queryKey: ['admin-portfolios'],
-        queryFn: () => apiClient.get('/admin/portfolios').then(r => r.data),
+        queryFn: ({ pageParam }) => apiClient.get('/admin/portfolios', {
+            params: { cursor: pageParam || undefined },
+        }).then(r => r.data),
+        initialPageParam: '',
+        getNextPageParam: (lastPage: { next_cursor: string | null }) => lastPage.next_cursor,
     })
+    const portfolios = portfoliosQuery.data?.pages.flatMap((page: any) => page.portfolios)
 
     const { data: logs } = useQuery({
         queryKey: ['admin-logs'],
@@ -274,7 +285,7 @@ export default function AdminPage() {
                 <div className="card">
                     <div className="flex flex-col sm:flex-row sm:items-center sm:justify-between gap-3 mb-4">
                         <h2 className="font-semibold text-gray-900 dark:text-white flex items-center gap-2">
-                            <Users className="w-4 h-4" /> Users ({users?.length || 0})
+                            <Users className="w-4 h-4" /> Users ({users?.length || 0}{usersQuery.hasNextPage ? '+' : ''})
                             {selectedUsers.length > 0 && <span className="text-xs text-brand-500 font-bold ml-2">{selectedUsers.length} selected</span>}
                         </h2>
                         <div className="flex items-center gap-2">
@@ -390,13 +401,25 @@ export default function AdminPage() {
                             </tbody>
                         </table>
                     </div>
+                    {usersQuery.hasNextPage && (
+                        <div className="flex justify-center pt-4">
+                            <button
+                                onClick={() => usersQuery.fetchNextPage()}
+                                disabled={usersQuery.isFetchingNextPage}
+                                className="btn-secondary text-xs py-1.5 px-4 flex items-center gap-2"
+                            >
+                                {usersQuery.isFetchingNextPage && <Loader2 className="w-3.5 h-3.5 animate-spin" />}
+                                Load more
+                            </button>
+                        </div>
+                    )}
                 </div>
             )}
 
             {activeTab === 'portfolios' && (
                 <div className="card">
                     <h2 className="font-semibold text-gray-900 dark:text-white mb-4 flex items-center gap-2">
-                        <Globe className="w-4 h-4" /> Portfolios ({portfolios?.length || 0})
+                        <Globe className="w-4 h-4" /> Portfolios ({portfolios?.length || 0}{portfoliosQuery.hasNextPage ? '+' : ''})
                     </h2>
                     <div className="overflow-x-auto -mx-5 border-t border-gray-100 dark:border-gray-800">
                         <table className="w-full text-sm">
@@ -460,6 +483,18 @@ export default function AdminPage() {
                             </tbody>
                         </table>
                     </div>
+                    {portfoliosQuery.hasNextPage && (
+                        <div className="flex justify-center pt-4">
+                            <button
+                                onClick={() => portfoliosQuery.fetchNextPage()}
+                                disabled={portfoliosQuery.isFetchingNextPage}
+                                className="btn-secondary text-xs py-1.5 px-4 flex items-center gap-2"
+                            >
+                                {portfoliosQuery.isFetchingNextPage && <Loader2 className="w-3.5 h-3.5 animate-spin" />}
+                                Load more
+                            </button>
+                        </div>
+                    )}
                 </div>
             )}
 
@@ -25,7 +25,7 @@ export default function DashboardPage() {
             setPortfolio({
                 portfolioId: data.id,
                 slug: data.slug,
-                parsedData: JSON.parse(data.parsed_data || '{}'),
+                parsedData: data.parsed_data || {},
                 theme: data.theme,
                 templateId: data.template_id || 'standard',
                 mode: data.mode || 'light',
@@ -53,7 +53,7 @@ export default function DashboardPage() {
         }
     }
 
-    const pd = hasPortfolio ? JSON.parse(data.parsed_data || '{}') : null
+    const pd = hasPortfolio ? data.parsed_data || {} : null
     const isConfigured =
         !!data?.template_id &&
         !!data?.mode &&
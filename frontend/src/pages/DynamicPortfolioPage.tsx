@@ -1,6 +1,6 @@
 import { useState } from 'react'
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
-import { dynamicPortfolioApi, RoleVersion } from '@/api/dynamic-portfolio'
+import { dynamicPortfolioApi } from '@/api/dynamic-portfolio'
 import { Loader2, Layers, Check, RefreshCw, Eye, FileText, Star, RotateCcw } from 'lucide-react'
 import toast from 'react-hot-toast'
 import PageTransition from '@/components/PageTransition'
@@ -8,7 +8,7 @@ import PageTransition from '@/components/PageTransition'
 export default function DynamicPortfolioPage() {
     const queryClient = useQueryClient()
     const [customRole, setCustomRole] = useState('')
-    const [viewing, setViewing] = useState<RoleVersion | null>(null)
+    const [viewing, setViewing] = useState<string | null>(null)
 
     const { data: rolesData } = useQuery({
         queryKey: ['suggested-roles'],
@@ -20,6 +20,12 @@ export default function DynamicPortfolioPage() {
         queryFn: () => dynamicPortfolioApi.getVersions().then(r => r.data),
     })
 
+    const { data: viewingVersion, isLoading: isLoadingPreview } = useQuery({
+        queryKey: ['role-version', viewing],
+        queryFn: () => dynamicPortfolioApi.getVersion(viewing as string).then(r => r.data),
+        enabled: !!viewing,
+    })
+
     const versions = versionsData?.versions || []
     const activeRole = versionsData?.active_role
     const suggestedRoles = rolesData?.suggested_roles || []
@@ -28,6 +34,7 @@ export default function DynamicPortfolioPage() {
         mutationFn: (role: string) => dynamicPortfolioApi.generate(role),
         onSuccess: () => {
             queryClient.invalidateQueries({ queryKey: ['role-versions'] })
+            queryClient.invalidateQueries({ queryKey: ['role-version'] })
             toast.success('Role version generated')
         },
         onError: () => toast.error('Generation failed'),
@@ -158,16 +165,16 @@ export default function DynamicPortfolioPage() {
                                             )}
                                         </div>
                                         <p className="text-xs text-gray-500 dark:text-gray-400 mt-0.5 truncate">
-                                            {v.data.title} &middot; {v.data.skills.length} skills &middot; {v.data.experience.length} roles
+                                            {v.title} &middot; {v.skill_count} skills &middot; {v.experience_count} roles
                                         </p>
                                     </div>
                                 </div>
                                 <div className="flex items-center gap-2 flex-shrink-0">
                                     <button
-                                        onClick={() => setViewing(viewing?.role === v.role ? null : v)}
+                                        onClick={() => setViewing(viewing === v.role ? null : v.role)}
                                         className="btn-secondary px-3 py-1.5 text-xs"
                                     >
-                                        <Eye className="w-3.5 h-3.5" /> {viewing?.role === v.role ? 'Hide' : 'Preview'}
+                                        <Eye className="w-3.5 h-3.5" /> {viewing === v.role ? 'Hide' : 'Preview'}
                                     </button>
                                     {!v.is_active && (
                                         <button
@@ -181,27 +188,32 @@ export default function DynamicPortfolioPage() {
                             </div>
 
                             {/* Expanded preview */}
-                            {viewing?.role === v.role && (
+                            {viewing === v.role && isLoadingPreview && (
+                                <div className="mt-4 pt-4 border-t border-gray-200 dark:border-white/10 flex justify-center">
+                                    <Loader2 className="w-5 h-5 animate-spin text-brand-500" />
+                                </div>
+                            )}
+                            {viewing === v.role && viewingVersion?.role === v.role && (
                                 <div className="mt-4 pt-4 border-t border-gray-200 dark:border-white/10 space-y-4 text-sm max-h-96 overflow-y-auto">
                                     <div>
                                         <p className="text-[10px] font-bold uppercase tracking-wider text-gray-400 mb-1">Title</p>
-                                        <p className="text-gray-900 dark:text-white font-semibold">{v.data.title}</p>
+                                        <p className="text-gray-900 dark:text-white font-semibold">{viewingVersion.data.title}</p>
                                     </div>
                                     <div>
                                         <p className="text-[10px] font-bold uppercase tracking-wider text-gray-400 mb-1">Summary</p>
-                                        <p className="text-gray-700 dark:text-gray-300">{v.data.summary}</p>
+                                        <p className="text-gray-700 dark:text-gray-300">{viewingVersion.data.summary}</p>
                                     </div>
                                     <div>
                                         <p className="text-[10px] font-bold uppercase tracking-wider text-gray-400 mb-1">Skills</p>
                                         <div className="flex flex-wrap gap-1.5">
-                                            {v.data.skills.map((s, i) => (
+                                            {viewingVersion.data.skills.map((s, i) => (
                                                 <span key={i} className="px-2 py-0.5 rounded bg-gray-100 dark:bg-white/5 text-[11px] text-gray-600 dark:text-gray-400">{s}</span>
                                             ))}
                                         </div>
                                     </div>
                                     <div>
                                         <p className="text-[10px] font-bold uppercase tracking-wider text-gray-400 mb-1">Tailoring Notes</p>
-                                        <p className="text-gray-500 dark:text-gray-400 italic">{v.data.tailoring_notes}</p>
+                                        <p className="text-gray-500 dark:text-gray-400 italic">{viewingVersion.data.tailoring_notes}</p>
                                     </div>
                                 </div>
                             )}
@@ -60,7 +60,7 @@ export default function EditorPage() {
     useEffect(() => {
         if (portfolioData && !initializedRef.current) {
             initializedRef.current = true
-            const pd = JSON.parse(portfolioData.parsed_data || '{}')
+            const pd = portfolioData.parsed_data || {}
             setParsedData(pd)
             setLocalData(pd)
             setPortfolio({
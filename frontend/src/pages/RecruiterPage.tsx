@@ -1,5 +1,5 @@
 import { useState } from 'react'
-import { useQuery } from '@tanstack/react-query'
+import { useInfiniteQuery } from '@tanstack/react-query'
 import { recruiterApi, TalentProfile } from '@/api/recruiter'
 import { Loader2, Search, MapPin, Star, Briefcase, Layers, ExternalLink, UserCheck } from 'lucide-react'
 import PageTransition from '@/components/PageTransition'
@@ -10,18 +10,21 @@ export default function RecruiterPage() {
     const [skillsInput, setSkillsInput] = useState('')
     const [roleInput, setRoleInput] = useState('')
 
-    const { data, isLoading, isError } = useQuery({
+    const { data, isLoading, isError, hasNextPage, fetchNextPage, isFetchingNextPage } = useInfiniteQuery({
         queryKey: ['talent-search', query, skillsInput, roleInput],
-        queryFn: () => recruiterApi.search({
+        queryFn: ({ pageParam }) => recruiterApi.search({
             query: query || undefined,
             skills: skillsInput || undefined,
             role: roleInput || undefined,
             limit: 20,
+            cursor: pageParam || undefined,
         }).then(r => r.data),
+        initialPageParam: '',
+        getNextPageParam: lastPage => lastPage.next_cursor,
     })
 
-    const profiles = data?.profiles || []
-    const total = data?.total || 0
+    const profiles = data?.pages.flatMap(page => page.profiles) || []
+    const total = data?.pages[0]?.total || 0
 
     return (
         <PageTransition className="max-w-6xl mx-auto pb-24">
@@ -102,6 +105,19 @@ export default function RecruiterPage() {
                     <TalentCard key={profile.id} profile={profile} />
                 ))}
             </div>
+
+            {hasNextPage && (
+                <div className="flex justify-center mt-8">
+                    <button
+                        onClick={() => fetchNextPage()}
+                        disabled={isFetchingNextPage}
+                        className="btn-secondary px-4 py-2 text-sm flex items-center gap-2"
+                    >
+                        {isFetchingNextPage && <Loader2 className="w-4 h-4 animate-spin" />}
+                        Load more
+                    </button>
+                </div>
+            )}
         </PageTransition>
     )
 }